@@ -10,21 +10,23 @@ __all__ = [
     "validators",
 ]
 
+import array
 import dataclasses
 import enum as builtin_enum
 import json
 import math
+import operator
 import struct
 import sys
 import warnings
 from abc import ABC
 from base64 import b64decode, b64encode
-from collections.abc import Callable, Generator, Iterable, Mapping
+from collections.abc import AsyncIterator, Callable, Generator, Iterable, Iterator, Mapping, Sequence
 from copy import deepcopy
 from enum import IntEnum
-from io import BytesIO
-from itertools import count
-from typing import TYPE_CHECKING, Any, ClassVar, get_type_hints
+from functools import partial
+from itertools import chain, count
+from typing import TYPE_CHECKING, Any, ClassVar, TypeGuard, get_type_hints
 
 from typing_extensions import Self
 
@@ -46,6 +48,10 @@ from .enum_ import Enum as Enum
 from .utils import classproperty, staticproperty
 
 if TYPE_CHECKING:
+    from asyncio import StreamReader, StreamWriter
+    from mmap import mmap
+
+    import numpy
     from _typeshed import SupportsRead, SupportsWrite
 
 # Proto 3 data types
@@ -131,6 +137,35 @@ WIRE_LEN_DELIM_TYPES = [TYPE_STRING, TYPE_BYTES, TYPE_MESSAGE, TYPE_MAP]
 # Indicator of message delimitation in streams
 SIZE_DELIMITED = -1
 
+# Size of the chunks read and written by `Message.iter_delimited` and `Message.write_delimited`
+_DELIMITED_CHUNK_SIZE = 64 * 1024
+
+# Size of the write buffer of a `StreamWriter` from which `Message.write_delimited_async` waits for it to be flushed
+_DELIMITED_HIGH_WATER_MARK = 256 * 1024
+
+# Number of combinations of parsing options for which the field decoders of a message class are kept. The least
+# recently used ones are dropped, as the selected fields (see the `fields` option of `Message.parse`) can be different
+# each time.
+_FIELD_DECODERS_CACHE_SIZE = 32
+
+# Used to set the attributes of messages while they are decoded, which also works for frozen messages (see
+# `FrozenMessage`)
+_set_attribute = object.__setattr__
+_delete_attribute = object.__delattr__
+_get_attribute = object.__getattribute__
+
+
+def _is_assigned(obj: Any, name: str) -> bool:
+    """
+    Whether an attribute is set on the object, stored in its `__dict__` or in a slot, without calling `__getattr__` if
+    it isn't (see `Message.__getattr__`).
+    """
+    try:
+        _get_attribute(obj, name)
+    except AttributeError:
+        return False
+    return True
+
 
 # Special protobuf json doubles
 INFINITY = "Infinity"
@@ -208,7 +243,7 @@ def field(
 ) -> Any:  # Return type is Any to pass type checking
     """Creates a dataclass field with attached protobuf metadata."""
     if repeated:
-        default_factory = list
+        default_factory = default_factory or list
 
     elif optional or group:
         default_factory = type(None)
@@ -253,8 +288,95 @@ def _pack_fmt(proto_type: str) -> str:
     }[proto_type]
 
 
+# Precompiled packers for the fixed-size types
+_STRUCT_BY_TYPE = {proto_type: struct.Struct(_pack_fmt(proto_type)) for proto_type in FIXED_TYPES}
+
+# NumPy data types used for the repeated numerical fields, with the `RepeatedFormat.NUMPY` format. Fixed-size types are
+# little-endian on the wire.
+_NUMPY_DTYPE_BY_TYPE = {
+    TYPE_BOOL: "?",
+    TYPE_INT32: "i4",
+    TYPE_INT64: "i8",
+    TYPE_UINT32: "u4",
+    TYPE_UINT64: "u8",
+    TYPE_SINT32: "i4",
+    TYPE_SINT64: "i8",
+    TYPE_FLOAT: "<f4",
+    TYPE_DOUBLE: "<f8",
+    TYPE_FIXED32: "<u4",
+    TYPE_SFIXED32: "<i4",
+    TYPE_FIXED64: "<u8",
+    TYPE_SFIXED64: "<i8",
+}
+
+
+# `array.array` type codes used for the repeated numerical fields, with the `RepeatedFormat.ARRAY` format. Booleans are
+# stored as bytes, equal to 0 or 1.
+_ARRAY_TYPECODE_BY_TYPE = {
+    TYPE_BOOL: "B",
+    TYPE_INT32: "i",
+    TYPE_INT64: "q",
+    TYPE_UINT32: "I",
+    TYPE_UINT64: "Q",
+    TYPE_SINT32: "i",
+    TYPE_SINT64: "q",
+    TYPE_FLOAT: "f",
+    TYPE_DOUBLE: "d",
+    TYPE_FIXED32: "I",
+    TYPE_SFIXED32: "i",
+    TYPE_FIXED64: "Q",
+    TYPE_SFIXED64: "q",
+}
+
+
+def _is_ndarray(value: Any) -> TypeGuard[numpy.ndarray]:
+    """Checks if the value is a NumPy array, without importing NumPy."""
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _is_array(value: Any) -> bool:
+    """Checks if the value is an `array.array` or a NumPy array."""
+    return isinstance(value, array.array) or _is_ndarray(value)
+
+
+def _scalar_values(values: Any) -> Any:
+    """
+    Returns the values of a repeated scalar field, converting `array.array` and NumPy arrays to lists of Python
+    objects.
+    """
+    if _is_array(values):
+        return values.tolist()
+    return values
+
+
+def _is_empty(value: Any) -> bool:
+    # `not value` doesn't work with NumPy arrays
+    return not len(value)
+
+
+# Wire type used by each proto type when it is not packed
+_WIRE_TYPE_BY_PROTO_TYPE = {
+    **{proto_type: WIRE_VARINT for proto_type in WIRE_VARINT_TYPES},
+    **{proto_type: WIRE_FIXED_32 for proto_type in WIRE_FIXED_32_TYPES},
+    **{proto_type: WIRE_FIXED_64 for proto_type in WIRE_FIXED_64_TYPES},
+    **{proto_type: WIRE_LEN_DELIM for proto_type in WIRE_LEN_DELIM_TYPES},
+}
+
+# Encoded form of all the single-byte varints
+_SINGLE_BYTE_VARINTS = [bytes((i,)) for i in range(0x80)]
+
+
 def dump_varint(value: int, stream: SupportsWrite[bytes]) -> None:
     """Encodes a single varint and dumps it into the provided stream."""
+    stream.write(encode_varint(value))
+
+
+def encode_varint(value: int) -> bytes:
+    """Encodes a single varint value for serialization."""
+    if 0 <= value < 0x80:
+        return _SINGLE_BYTE_VARINTS[value]
+
     if value < -(1 << 63):
         raise ValueError(
             "Negative value is not representable as a 64-bit integer - unable to encode a varint within 10 bytes."
@@ -262,78 +384,470 @@ def dump_varint(value: int, stream: SupportsWrite[bytes]) -> None:
     elif value < 0:
         value += 1 << 64
 
-    bits = value & 0x7F
-    value >>= 7
-    while value:
-        stream.write((0x80 | bits).to_bytes(1, "little"))
-        bits = value & 0x7F
+    output = bytearray()
+    while value > 0x7F:
+        output.append(0x80 | (value & 0x7F))
         value >>= 7
-    stream.write(bits.to_bytes(1, "little"))
+    output.append(value)
+    return bytes(output)
 
 
-def encode_varint(value: int) -> bytes:
-    """Encodes a single varint value for serialization."""
-    with BytesIO() as stream:
-        dump_varint(value, stream)
-        return stream.getvalue()
-
-
-def _preprocess_single(proto_type: str, unwrap: Callable[[], type] | None, value: Any) -> bytes:
-    """Adjusts values before serialization."""
-    if proto_type in (
-        TYPE_ENUM,
-        TYPE_BOOL,
-        TYPE_INT32,
-        TYPE_INT64,
-        TYPE_UINT32,
-        TYPE_UINT64,
-    ):
-        return encode_varint(value)
-    elif proto_type in (TYPE_SINT32, TYPE_SINT64):
-        # Handle zig-zag encoding.
-        return encode_varint(value << 1 if value >= 0 else (value << 1) ^ (~0))
-    elif proto_type in FIXED_TYPES:
-        return struct.pack(_pack_fmt(proto_type), value)
-    elif proto_type == TYPE_STRING:
-        return value.encode("utf-8")
-    elif proto_type == TYPE_MESSAGE:
-        if unwrap is not None:
-            value = unwrap().from_wrapped(value)
+def _encode_zigzag(value: int) -> bytes:
+    return encode_varint(value << 1 if value >= 0 else (value << 1) ^ (~0))
 
-        return bytes(value)
 
-    return value
+_encode_float = _STRUCT_BY_TYPE[TYPE_FLOAT].pack
+_encode_double = _STRUCT_BY_TYPE[TYPE_DOUBLE].pack
+_encode_fixed32 = _STRUCT_BY_TYPE[TYPE_FIXED32].pack
+_encode_sfixed32 = _STRUCT_BY_TYPE[TYPE_SFIXED32].pack
+_encode_fixed64 = _STRUCT_BY_TYPE[TYPE_FIXED64].pack
+_encode_sfixed64 = _STRUCT_BY_TYPE[TYPE_SFIXED64].pack
 
 
-def _serialize_single(
-    field_number: int,
-    proto_type: str,
-    value: Any,
-    *,
-    unwrap: Callable[[], type] | None = None,
-) -> bytes:
-    """Serializes a single field and value."""
-    value = _preprocess_single(proto_type, unwrap, value)
+def _encode_string(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return encode_varint(len(encoded)) + encoded
+
+
+def _encode_bytes(value: bytes) -> bytes:
+    return encode_varint(len(value)) + value
+
+
+def _encode_bytes_into(buf: bytearray, value: bytes | bytearray | memoryview) -> None:
+    """Writes a length-prefixed bytes value at the end of the buffer, without an intermediate copy."""
+    buf += encode_varint(len(value))
+    buf += value
+
+
+class _EncodeBuffer(bytearray):
+    """
+    Buffer in which messages are encoded.
+
+    One byte is reserved for the length prefix of each length-delimited value (see `_reserve_length`). When a value
+    needs a longer prefix, the missing bytes are not inserted in the buffer right away, which would move everything
+    written since the start of the value (at each nesting level for nested messages). They are kept in `insertions`,
+    and inserted all at once by `_finish_buffer`.
+
+    The encoders are typed with `bytearray`, but are always given an `_EncodeBuffer`.
+    """
+
+    # Positions where bytes must be inserted, with these bytes. Class attributes are used as initial values, as
+    # defining `__init__` would slow down the creation of the buffers.
+    insertions: list[tuple[int, bytes]] | None = None
+    # Total size of the bytes to insert
+    inserted_size: int = 0
+
+
+def _reserve_length(buf: bytearray) -> tuple[int, int]:
+    """
+    Reserves one byte for the length prefix of a length-delimited value about to be written at the end of the
+    buffer. Returns the position where the value starts and the state of the buffer, to give to `_patch_length` once
+    the value is written.
+    """
+    buf.append(0)
+    return len(buf), buf.inserted_size  # type: ignore
+
+
+def _patch_length(buf: bytearray, mark: tuple[int, int]) -> None:
+    """
+    Writes the length prefix of the value written at the end of the buffer since the position given by
+    `_reserve_length`. The size of the value includes the bytes that will be inserted in it.
+    """
+    start, inserted_size = mark
+    size = len(buf) - start + buf.inserted_size - inserted_size  # type: ignore
+    if size < 0x80:
+        buf[start - 1] = size
+        return
+
+    prefix = encode_varint(size)
+    buf[start - 1] = prefix[0]
+    if buf.insertions is None:  # type: ignore
+        buf.insertions = []  # type: ignore
+    buf.insertions.append((start, prefix[1:]))  # type: ignore
+    buf.inserted_size += len(prefix) - 1  # type: ignore
+
+
+def _finish_buffer(buf: _EncodeBuffer) -> bytes | bytearray:
+    """Returns the encoded data of the buffer, with the bytes waiting to be inserted."""
+    if buf.insertions is None:
+        return buf
+
+    # The values are finished (and their prefixes patched) after the values they contain
+    buf.insertions.sort()
+
+    view = memoryview(buf)
+    pieces: list[bytes | memoryview] = []
+    pos = 0
+    for insert_pos, data in buf.insertions:
+        pieces.append(view[pos:insert_pos])
+        pieces.append(data)
+        pos = insert_pos
+    pieces.append(view[pos:])
+
+    data = b"".join(pieces)
+    view.release()
+    return data
+
+
+def _encode_message_into(buf: bytearray, value: Message) -> None:
+    """Writes a length-prefixed message at the end of the buffer."""
+    if value._serialized_cache is not None:
+        data = bytes(value)
+        buf += encode_varint(len(data))
+        buf += data
+        return
+
+    start = _reserve_length(buf)
+    value._encode_into(buf)
+    _patch_length(buf, start)
+
+
+def _encode_delimited(messages: Iterable[Message], chunk_size: int) -> Iterator[tuple[bytes | bytearray, int]]:
+    """
+    Encodes size-delimited messages into chunks of at least `chunk_size` bytes (except the last one), and yields them
+    with their number of messages. A new buffer is used for each chunk, so that the streams can keep a reference to the
+    chunks they are given.
+    """
+    buf = _EncodeBuffer()
+    count = 0
+    for message in messages:
+        _encode_message_into(buf, message)
+        count += 1
+        if len(buf) >= chunk_size:
+            yield _finish_buffer(buf), count
+            buf = _EncodeBuffer()
+            count = 0
+
+    if buf:
+        yield _finish_buffer(buf), count
+
+
+def _read_at_least(stream: SupportsRead[bytes], minimum: int, size: int) -> bytes:
+    """
+    Reads up to `size` bytes from the stream, reading again until at least `minimum` bytes are read or the end of the
+    stream is reached (streams can return less than requested). The parts are joined once at the end.
+    """
+    chunk = stream.read(size)
+    if len(chunk) >= minimum or not chunk:
+        return chunk
+
+    chunks = [chunk]
+    total = len(chunk)
+    while total < minimum:
+        chunk = stream.read(size - total)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+    return b"".join(chunks)
+
+
+def _check_delimited_end(data: bytes) -> None:
+    """Checks that the data left at the end of a stream of size-delimited messages is empty."""
+    if not data:
+        return
+
+    size, pos = decode_varint(data, 0)  # Raises EOFError if the size prefix is incomplete
+    raise ValueError(
+        f"Expected message of size {size}, but was only able to read {len(data) - pos} bytes - the stream may have"
+        " ended too soon, or the expected size may have been incorrect."
+    )
+
+
+# Functions encoding a single scalar value without its tag. The code generated with the `specialized_codecs` compiler
+# option refers to these functions directly.
+_ENCODER_BY_TYPE: dict[str, Callable[[Any], bytes]] = {
+    TYPE_ENUM: encode_varint,
+    TYPE_BOOL: encode_varint,
+    TYPE_INT32: encode_varint,
+    TYPE_INT64: encode_varint,
+    TYPE_UINT32: encode_varint,
+    TYPE_UINT64: encode_varint,
+    TYPE_SINT32: _encode_zigzag,
+    TYPE_SINT64: _encode_zigzag,
+    TYPE_FLOAT: _encode_float,
+    TYPE_DOUBLE: _encode_double,
+    TYPE_FIXED32: _encode_fixed32,
+    TYPE_SFIXED32: _encode_sfixed32,
+    TYPE_FIXED64: _encode_fixed64,
+    TYPE_SFIXED64: _encode_sfixed64,
+    TYPE_STRING: _encode_string,
+    TYPE_BYTES: _encode_bytes,
+}
+
+
+def _encode_packed_varints(values: Any) -> bytes:
+    """Encodes a non-empty sequence of varints, as found in the payload of packed fields."""
+    values = _scalar_values(values)
+    if min(values) >= 0 and max(values) < 0x80:
+        # Only single-byte varints, which is common for small values.
+        return bytes(values)
 
     output = bytearray()
-    if proto_type in WIRE_VARINT_TYPES:
-        key = encode_varint(field_number << 3)
-        output += key + value
-    elif proto_type in WIRE_FIXED_32_TYPES:
-        key = encode_varint((field_number << 3) | 5)
-        output += key + value
-    elif proto_type in WIRE_FIXED_64_TYPES:
-        key = encode_varint((field_number << 3) | 1)
-        output += key + value
-    elif proto_type in WIRE_LEN_DELIM_TYPES:
-        key = encode_varint((field_number << 3) | 2)
-        output += key + encode_varint(len(value)) + value
-    else:
-        raise NotImplementedError(proto_type)
+    append = output.append
+    for value in values:
+        if value < 0:
+            if value < -(1 << 63):
+                raise ValueError(
+                    "Negative value is not representable as a 64-bit integer - unable to encode a varint within 10 "
+                    "bytes."
+                )
+            value += 1 << 64
+
+        while value > 0x7F:
+            append(0x80 | (value & 0x7F))
+            value >>= 7
+        append(value)
 
     return bytes(output)
 
 
+def _packed_encoder(proto_type: str) -> Callable[[Any], bytes]:
+    """
+    Returns a function encoding the payload of a packed field (without its tag and length) from a non-empty sequence
+    of values.
+    """
+    if proto_type in FIXED_TYPES:
+        fmt = _pack_fmt(proto_type)
+        dtype = _NUMPY_DTYPE_BY_TYPE[proto_type]
+        typecode = _ARRAY_TYPECODE_BY_TYPE[proto_type]
+
+        def encode_packed_fixed(values: Any) -> bytes:
+            if isinstance(values, array.array) and values.typecode == typecode and sys.byteorder == "little":
+                return values.tobytes()
+            if _is_ndarray(values):
+                return values.astype(dtype, copy=False).tobytes()
+            return struct.pack(f"{fmt[0]}{len(values)}{fmt[1]}", *values)
+
+        return encode_packed_fixed
+
+    if proto_type in (TYPE_SINT32, TYPE_SINT64):
+        return lambda values: _encode_packed_varints([(value << 1) ^ (value >> 63) for value in _scalar_values(values)])
+
+    return _encode_packed_varints
+
+
+def _value_encoder(proto_type: str, unwrap: Callable[[], type] | None = None) -> Callable[[bytearray, Any], None]:
+    """
+    Returns a function writing a single value of the given type at the end of a buffer, without its tag.
+    Length-delimited values are prefixed with their length.
+    """
+    if proto_type == TYPE_MESSAGE:
+        if unwrap is None:
+            return _encode_message_into
+
+        def encode_wrapped(buf: bytearray, value: Any) -> None:
+            _encode_message_into(buf, unwrap().from_wrapped(value))
+
+        return encode_wrapped
+
+    if proto_type == TYPE_BYTES:
+        return _encode_bytes_into
+
+    try:
+        encode = _ENCODER_BY_TYPE[proto_type]
+    except KeyError:
+        raise NotImplementedError(proto_type) from None
+
+    def encode_scalar(buf: bytearray, value: Any) -> None:
+        buf += encode(value)
+
+    return encode_scalar
+
+
+def _field_encoder(meta: FieldMetadata) -> Callable[[bytearray, Any], None]:
+    """
+    Returns a function writing the value of a field, including the tag(s), at the end of a buffer. The function is
+    only called with values that need to be serialized (i.e. non-default values).
+    """
+    if meta.repeated and meta.proto_type in PACKED_TYPES:
+        # Packed lists look like a length-delimited field.
+        packed_tag = encode_varint((meta.number << 3) | WIRE_LEN_DELIM)
+        encode_values = _packed_encoder(meta.proto_type)
+
+        def encode_packed(buf: bytearray, value: Any) -> None:
+            payload = encode_values(value)
+            buf += packed_tag
+            buf += encode_varint(len(payload))
+            buf += payload
+
+        return encode_packed
+
+    tag = encode_varint((meta.number << 3) | _WIRE_TYPE_BY_PROTO_TYPE[meta.proto_type])
+
+    if meta.repeated and meta.proto_type == TYPE_MESSAGE:
+        encode_message = _value_encoder(meta.proto_type, meta.unwrap)
+
+        def encode_repeated_messages(buf: bytearray, value: Any) -> None:
+            for item in value:
+                buf += tag
+                encode_message(buf, item)
+
+        return encode_repeated_messages
+
+    if meta.repeated:
+        encode_item = _ENCODER_BY_TYPE[meta.proto_type]
+
+        def encode_repeated(buf: bytearray, value: Any) -> None:
+            buf += b"".join([tag + encode_item(item) for item in value])
+
+        return encode_repeated
+
+    if meta.map_meta:
+        key_meta, value_meta = meta.map_meta
+        key_tag = encode_varint((1 << 3) | _WIRE_TYPE_BY_PROTO_TYPE[key_meta.proto_type])
+        value_tag = encode_varint((2 << 3) | _WIRE_TYPE_BY_PROTO_TYPE[value_meta.proto_type])
+        encode_key = _ENCODER_BY_TYPE[key_meta.proto_type]
+        encode_value = _value_encoder(value_meta.proto_type, value_meta.unwrap)
+
+        def encode_map(buf: bytearray, value: Any) -> None:
+            for k, v in value.items():
+                buf += tag
+                start = _reserve_length(buf)
+                buf += key_tag
+                buf += encode_key(k)
+                buf += value_tag
+                encode_value(buf, v)
+                _patch_length(buf, start)
+
+        return encode_map
+
+    if meta.proto_type == TYPE_MESSAGE:
+        encode_message = _value_encoder(meta.proto_type, meta.unwrap)
+
+        def encode_single_message(buf: bytearray, value: Any) -> None:
+            buf += tag
+            encode_message(buf, value)
+
+        return encode_single_message
+
+    encode_value = _ENCODER_BY_TYPE[meta.proto_type]
+
+    def encode_single(buf: bytearray, value: Any) -> None:
+        buf += tag
+        buf += encode_value(value)
+
+    return encode_single
+
+
+def _varint_size(value: int) -> int:
+    """Returns the size of the encoded form of a varint value."""
+    if 0 <= value < 0x80:
+        return 1
+
+    if value < 0:
+        if value < -(1 << 63):
+            raise ValueError(
+                "Negative value is not representable as a 64-bit integer - unable to encode a varint within 10 bytes."
+            )
+        return 10
+
+    return (value.bit_length() + 6) // 7
+
+
+def _zigzag_size(value: int) -> int:
+    return _varint_size(value << 1 if value >= 0 else (value << 1) ^ (~0))
+
+
+def _string_size(value: str) -> int:
+    size = len(value) if value.isascii() else len(value.encode("utf-8"))
+    return _varint_size(size) + size
+
+
+def _bytes_size(value: bytes) -> int:
+    return _varint_size(len(value)) + len(value)
+
+
+def _message_size(value: Message) -> int:
+    size = value.byte_size()
+    return _varint_size(size) + size
+
+
+# Functions returning the size of a single encoded scalar value, without its tag. They must match `_ENCODER_BY_TYPE`.
+_SIZER_BY_TYPE: dict[str, Callable[[Any], int]] = {
+    TYPE_ENUM: _varint_size,
+    TYPE_BOOL: _varint_size,
+    TYPE_INT32: _varint_size,
+    TYPE_INT64: _varint_size,
+    TYPE_UINT32: _varint_size,
+    TYPE_UINT64: _varint_size,
+    TYPE_SINT32: _zigzag_size,
+    TYPE_SINT64: _zigzag_size,
+    **{proto_type: (lambda value, size=_STRUCT_BY_TYPE[proto_type].size: size) for proto_type in FIXED_TYPES},
+    TYPE_STRING: _string_size,
+    TYPE_BYTES: _bytes_size,
+}
+
+
+def _value_sizer(proto_type: str, unwrap: Callable[[], type] | None = None) -> Callable[[Any], int]:
+    """
+    Returns a function computing the size of a single encoded value of the given type, without its tag. The size of
+    length-delimited values includes their length prefix.
+    """
+    if proto_type == TYPE_MESSAGE:
+        if unwrap is None:
+            return _message_size
+
+        def wrapped_size(value: Any) -> int:
+            return _message_size(unwrap().from_wrapped(value))
+
+        return wrapped_size
+
+    try:
+        return _SIZER_BY_TYPE[proto_type]
+    except KeyError:
+        raise NotImplementedError(proto_type) from None
+
+
+def _field_sizer(meta: FieldMetadata) -> Callable[[Any], int]:
+    """
+    Returns a function computing the size of the encoded value of a field, including the tag(s), without encoding it.
+    It mirrors `_field_encoder`, and is only called with values that need to be serialized.
+    """
+    if meta.repeated and meta.proto_type in PACKED_TYPES:
+        packed_tag_size = _varint_size((meta.number << 3) | WIRE_LEN_DELIM)
+        item_size = _SIZER_BY_TYPE[meta.proto_type]
+        fixed_size = _STRUCT_BY_TYPE[meta.proto_type].size if meta.proto_type in FIXED_TYPES else 0
+
+        def packed_size(value: Any) -> int:
+            payload_size = len(value) * fixed_size if fixed_size else sum(map(item_size, _scalar_values(value)))
+            return packed_tag_size + _varint_size(payload_size) + payload_size
+
+        return packed_size
+
+    tag_size = _varint_size((meta.number << 3) | _WIRE_TYPE_BY_PROTO_TYPE[meta.proto_type])
+
+    if meta.repeated:
+        item_size = _value_sizer(meta.proto_type, meta.unwrap)
+
+        def repeated_size(value: Any) -> int:
+            return tag_size * len(value) + sum(map(item_size, value))
+
+        return repeated_size
+
+    if meta.map_meta:
+        key_meta, value_meta = meta.map_meta
+        key_size = _SIZER_BY_TYPE[key_meta.proto_type]
+        value_size = _value_sizer(value_meta.proto_type, value_meta.unwrap)
+
+        def map_size(value: Any) -> int:
+            size = 0
+            for k, v in value.items():
+                # The tags of the key and of the value of an entry always fit in one byte
+                entry_size = 2 + key_size(k) + value_size(v)
+                size += tag_size + _varint_size(entry_size) + entry_size
+            return size
+
+        return map_size
+
+    value_size = _value_sizer(meta.proto_type, meta.unwrap)
+
+    def single_size(value: Any) -> int:
+        return tag_size + value_size(value)
+
+    return single_size
+
+
 def _parse_float(value: Any) -> float:
     """Parse the given value to a float
 
@@ -399,15 +913,30 @@ def load_varint(stream: SupportsRead[bytes]) -> tuple[int, bytes]:
     raise ValueError("Too many bytes when decoding varint.")
 
 
-def decode_varint(buffer: bytes, pos: int) -> tuple[int, int]:
+def decode_varint(buffer: bytes | bytearray | memoryview | mmap, pos: int) -> tuple[int, int]:
     """
     Decode a single varint value from a byte buffer. Returns the value and the
     new position in the buffer.
     """
-    with BytesIO(buffer) as stream:
-        stream.seek(pos)
-        value, raw = load_varint(stream)
-    return value, pos + len(raw)
+    try:
+        b = buffer[pos]
+        if b < 0x80:
+            return b, pos + 1
+
+        result = b & 0x7F
+        shift = 7
+        pos += 1
+        while shift < 64:
+            b = buffer[pos]
+            pos += 1
+            result |= (b & 0x7F) << shift
+            if not (b & 0x80):
+                return result, pos
+            shift += 7
+    except IndexError:
+        raise EOFError("Buffer ended unexpectedly while attempting to decode varint.") from None
+
+    raise ValueError("Too many bytes when decoding varint.")
 
 
 @dataclasses.dataclass(frozen=True)
@@ -469,172 +998,1420 @@ def parse_fields(value: bytes) -> Generator[ParsedField, None, None]:
         yield ParsedField(number=number, wire_type=wire_type, value=decoded, raw=value[start:i])
 
 
-class ProtoClassMetadata:
-    __slots__ = (
-        "oneof_field_by_group",
-        "default_gen",
-        "cls_by_field",
-        "field_name_by_number",
-        "meta_by_field_name",
-        "sorted_field_names",
+def _truncated_message_error(pos: int, end: int) -> ValueError:
+    return ValueError(
+        f"The last field of the message ends at byte {pos}, after the end of the message at byte {end} - "
+        "the message may have been truncated."
     )
 
-    oneof_field_by_group: dict[str, set[dataclasses.Field]]
-    field_name_by_number: dict[int, str]
-    meta_by_field_name: dict[str, FieldMetadata]
-    sorted_field_names: tuple[str, ...]
-    default_gen: dict[str, Callable[[], Any]]
-    cls_by_field: dict[str, type]
 
-    def __init__(self, cls: type[Message]):
-        by_group: dict[str, set] = {}
-        by_field_name = {}
-        by_field_number = {}
+def _skip_field(buffer: bytes, pos: int, wire_type: int) -> int:
+    """Returns the position of the end of a field value, given the position of its start."""
+    if wire_type == WIRE_VARINT:
+        return decode_varint(buffer, pos)[1]
+    if wire_type == WIRE_FIXED_64:
+        return pos + 8
+    if wire_type == WIRE_LEN_DELIM:
+        length, pos = decode_varint(buffer, pos)
+        return pos + length
+    if wire_type == WIRE_FIXED_32:
+        return pos + 4
 
-        assert dataclasses.is_dataclass(cls)
-        fields = dataclasses.fields(cls)
-        for field in fields:
-            meta = FieldMetadata.get(field)
+    raise ValueError(f"Unsupported wire type: {wire_type}")
 
-            if meta.group:
-                by_group.setdefault(meta.group, set()).add(field)
 
-            by_field_name[field.name] = meta
-            by_field_number[meta.number] = field.name
+def _decode_int32(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    return ((value & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000, pos
 
-        self.oneof_field_by_group = by_group
-        self.field_name_by_number = by_field_number
-        self.meta_by_field_name = by_field_name
-        self.sorted_field_names = tuple(by_field_number[number] for number in sorted(by_field_number))
 
-        self.default_gen = {}
-        for field in fields:
-            assert field.default_factory is not dataclasses.MISSING
-            self.default_gen[field.name] = field.default_factory
+def _decode_int64(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    return ((value & 0xFFFFFFFFFFFFFFFF) ^ 0x8000000000000000) - 0x8000000000000000, pos
 
-        self.cls_by_field = self._get_cls_by_field(cls, fields)
 
-    @staticmethod
-    def _get_cls_by_field(cls: type[Message], fields: Iterable[dataclasses.Field]) -> dict[str, type]:  # type: ignore[reportSelfClsParameterName]
-        field_cls = {}
+def _decode_uint32(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    return value & 0xFFFFFFFF, pos
 
-        for field_ in fields:
-            meta = FieldMetadata.get(field_)
-            if meta.proto_type == TYPE_MAP:
-                assert meta.map_meta
-                kt = cls._cls_for(field_, index=0)
-                vt = cls._cls_for(field_, index=1)
 
-                if meta.map_meta[1].proto_type == TYPE_ENUM:
-                    value_field = field(2, meta.map_meta[1].proto_type, default_factory=lambda: vt(0))
-                else:
-                    value_field = field(2, meta.map_meta[1].proto_type, unwrap=meta.map_meta[1].unwrap)
+def _decode_uint64(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    return value & 0xFFFFFFFFFFFFFFFF, pos
 
-                field_cls[field_.name] = dataclasses.make_dataclass(
-                    "Entry",
-                    [
-                        ("key", kt, field(1, meta.map_meta[0].proto_type)),
-                        ("value", vt, value_field),
-                    ],
-                    bases=(Message,),
-                )
-                field_cls[f"{field_.name}.value"] = vt
-            else:
-                field_cls[field_.name] = cls._cls_for(field_)
 
-        return field_cls
+def _decode_sint32(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    value &= 0xFFFFFFFF
+    return (value >> 1) ^ (-(value & 1)), pos
 
 
-class OutputFormat(IntEnum):
-    """
-    Chosen output format for the `Message.to_dict` method.
-    """
+def _decode_sint64(buffer: bytes, pos: int) -> tuple[int, int]:
+    value, pos = decode_varint(buffer, pos)
+    value &= 0xFFFFFFFFFFFFFFFF
+    return (value >> 1) ^ (-(value & 1)), pos
 
-    PYTHON = 1
-    PROTO_JSON = 2
 
+def _decode_bool(buffer: bytes, pos: int) -> tuple[bool, int]:
+    value, pos = decode_varint(buffer, pos)
+    return value > 0, pos
 
-def _value_to_dict(
-    value: Any,
-    proto_type: str,
-    field_type: type,
-    unwrapped_type: Callable[[], type] | None,
-    output_format: OutputFormat,
-    casing: Casing,
-    include_default_values: bool,
-) -> tuple[Any, bool]:
-    """
-    Convert a single item to a Python dictionnary. This function is called on each element of a
-    list, set, etc by `Message.to_dict`.
 
-    Returns:
-        A tuple (dict, is_default_value)
-    """
-    kwargs = {  # For recursive calls
-        "output_format": output_format,
-        "casing": casing,
-        "include_default_values": include_default_values,
-    }
+def _decode_string(buffer: bytes, pos: int) -> tuple[str, int]:
+    length, pos = decode_varint(buffer, pos)
+    return str(buffer[pos : pos + length], "utf-8"), pos + length
 
-    if proto_type == TYPE_MESSAGE:
-        if unwrapped_type is not None and output_format == OutputFormat.PYTHON:
-            return value, False
 
-        if unwrapped_type is not None:
-            value = unwrapped_type().from_wrapped(value)
+def _decode_bytes(buffer: bytes, pos: int) -> tuple[bytes, int]:
+    length, pos = decode_varint(buffer, pos)
+    return bytes(buffer[pos : pos + length]), pos + length
 
-        return value.to_dict(**kwargs), False
 
-    if output_format == OutputFormat.PYTHON:
-        return value, not bool(value)
+def _decode_bytes_view(buffer: bytes, pos: int) -> tuple[memoryview, int]:
+    """Decodes a bytes value as a view of the buffer, when parsing with the `zero_copy` option."""
+    length, pos = decode_varint(buffer, pos)
+    return memoryview(buffer)[pos : pos + length], pos + length
 
-    # PROTO_JSON
-    if proto_type in INT_64_TYPES:
-        return str(value), not bool(value)
-    if proto_type == TYPE_BYTES:
-        return b64encode(value).decode("utf8"), not bool(value)
-    if proto_type == TYPE_ENUM:
-        enum_value = field_type(value)
 
-        # If we don't know the definition of this variant, we fall back to the value.
-        if not enum_value.name:
-            return enum_value.value, not bool(value)
+def _fixed_decoder(proto_type: str) -> Callable[[bytes, int], tuple[Any, int]]:
+    unpack_from = _STRUCT_BY_TYPE[proto_type].unpack_from
+    size = _STRUCT_BY_TYPE[proto_type].size
 
-        return enum_value.proto_name or enum_value.name, not bool(value)
-    if proto_type in (TYPE_FLOAT, TYPE_DOUBLE):
-        return _dump_float(value), not bool(value)
-    return value, not bool(value)
+    def decode_fixed(buffer: bytes, pos: int) -> tuple[Any, int]:
+        return unpack_from(buffer, pos)[0], pos + size
 
+    return decode_fixed
 
-def _value_from_dict(value: Any, meta: FieldMetadata, field_type: type, ignore_unknown_fields: bool) -> Any:
-    if meta.proto_type == TYPE_MESSAGE:
-        msg_cls = meta.unwrap() if meta.unwrap else field_type
 
-        msg = msg_cls.from_dict(value, ignore_unknown_fields=ignore_unknown_fields)
+_decode_float = _fixed_decoder(TYPE_FLOAT)
+_decode_double = _fixed_decoder(TYPE_DOUBLE)
+_decode_fixed32 = _fixed_decoder(TYPE_FIXED32)
+_decode_sfixed32 = _fixed_decoder(TYPE_SFIXED32)
+_decode_fixed64 = _fixed_decoder(TYPE_FIXED64)
+_decode_sfixed64 = _fixed_decoder(TYPE_SFIXED64)
 
-        if meta.unwrap:
-            return msg.to_wrapped()
-        return msg
+# Functions decoding a single scalar value given the position of its start (just after the tag). They return the
+# decoded value and the position of the end of the value. Enum values are decoded as `int64`. The code generated with
+# the `specialized_codecs` compiler option refers to these functions directly.
+_DECODER_BY_TYPE: dict[str, Callable[[bytes, int], tuple[Any, int]]] = {
+    TYPE_ENUM: _decode_int64,
+    TYPE_BOOL: _decode_bool,
+    TYPE_INT32: _decode_int32,
+    TYPE_INT64: _decode_int64,
+    TYPE_UINT32: _decode_uint32,
+    TYPE_UINT64: _decode_uint64,
+    TYPE_SINT32: _decode_sint32,
+    TYPE_SINT64: _decode_sint64,
+    TYPE_FLOAT: _decode_float,
+    TYPE_DOUBLE: _decode_double,
+    TYPE_FIXED32: _decode_fixed32,
+    TYPE_SFIXED32: _decode_sfixed32,
+    TYPE_FIXED64: _decode_fixed64,
+    TYPE_SFIXED64: _decode_sfixed64,
+    TYPE_STRING: _decode_string,
+    TYPE_BYTES: _decode_bytes,
+}
 
-    if meta.proto_type == TYPE_ENUM:
-        if isinstance(value, str):
-            if (int_value := field_type.betterproto_renamed_proto_names_to_value().get(value)) is not None:
-                return field_type(int_value)
-            return field_type.from_string(value)
-        if isinstance(value, int):
-            return field_type(value)
-        if isinstance(value, Enum):
-            return value
-        raise ValueError("Enum value must be a string or an Enum instance")
 
-    if meta.proto_type in ALL_INT_TYPES:
-        return int(value)
+def _decode_packed_varints(buffer: bytes, pos: int, end: int) -> list[int]:
+    """
+    Decodes all the varints located between `pos` and `end` in the buffer, in a single pass. The values are returned
+    as unsigned integers, without being truncated or converted to the type of the field.
+    """
+    chunk = bytes(buffer[pos:end])
+    if chunk.isascii():
+        # Only single-byte varints, which is common for small values.
+        return list(chunk)
 
-    if meta.proto_type == TYPE_BYTES:
-        return b64decode(value)
+    values: list[int] = []
+    append = values.append
+    i = 0
+    n = len(chunk)
+    try:
+        while i < n:
+            b = chunk[i]
+            i += 1
+            if b < 0x80:
+                append(b)
+                continue
+
+            result = b & 0x7F
+            shift = 7
+            while True:
+                b = chunk[i]
+                i += 1
+                result |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+                if shift > 63:
+                    raise ValueError("Too many bytes when decoding varint.")
+            append(result)
+    except IndexError:
+        raise ValueError("Invalid packed field: the last varint is truncated.") from None
+
+    return values
+
+
+def _packed_decoder(proto_type: str, field_cls: type | None = None) -> Callable[[bytes, int, int], list[Any]]:
+    """
+    Returns a function decoding all the values of a packed field located between `pos` and `end` in a buffer. Fixed-size
+    values are unpacked at once, and varints are decoded in a single pass before being converted in bulk.
+    """
+    if proto_type in FIXED_TYPES:
+        fmt = _pack_fmt(proto_type)
+        size = _STRUCT_BY_TYPE[proto_type].size
+
+        def decode_packed_fixed(buffer: bytes, pos: int, end: int) -> list[Any]:
+            count, remainder = divmod(end - pos, size)
+            if remainder:
+                raise ValueError(f"Invalid packed field: its length is not a multiple of {size}.")
+            return list(struct.unpack_from(f"{fmt[0]}{count}{fmt[1]}", buffer, pos))
+
+        return decode_packed_fixed
+
+    if proto_type == TYPE_BOOL:
+        return lambda buffer, pos, end: [value > 0 for value in _decode_packed_varints(buffer, pos, end)]
+
+    if proto_type in (TYPE_UINT32, TYPE_UINT64):
+        mask = 0xFFFFFFFF if proto_type == TYPE_UINT32 else 0xFFFFFFFFFFFFFFFF
+
+        def decode_packed_unsigned(buffer: bytes, pos: int, end: int) -> list[int]:
+            values = _decode_packed_varints(buffer, pos, end)
+            if values and max(values) > mask:
+                values = [value & mask for value in values]
+            return values
+
+        return decode_packed_unsigned
+
+    if proto_type in (TYPE_SINT32, TYPE_SINT64):
+        mask = 0xFFFFFFFF if proto_type == TYPE_SINT32 else 0xFFFFFFFFFFFFFFFF
+
+        def decode_packed_zigzag(buffer: bytes, pos: int, end: int) -> list[int]:
+            values = _decode_packed_varints(buffer, pos, end)
+            if values and max(values) > mask:
+                values = [value & mask for value in values]
+            return [(value >> 1) ^ (-(value & 1)) for value in values]
+
+        return decode_packed_zigzag
+
+    # int32, int64 and enums: negative values are encoded as 64-bit two's complement integers.
+    mask = 0xFFFFFFFF if proto_type == TYPE_INT32 else 0xFFFFFFFFFFFFFFFF
+    sign = (mask >> 1) + 1
+    enum_cls = field_cls if proto_type == TYPE_ENUM else None
+
+    def decode_packed_signed(buffer: bytes, pos: int, end: int) -> list[Any]:
+        values = _decode_packed_varints(buffer, pos, end)
+        if values and max(values) >= sign:
+            values = [((value & mask) ^ sign) - sign for value in values]
+        if enum_cls is not None:
+            return list(map(enum_cls, values))
+        return values
+
+    return decode_packed_signed
+
+
+def _numpy_packed_decoder(proto_type: str) -> Callable[[bytes, int, int], Any]:
+    """
+    Returns a function decoding all the values of a packed field located between `pos` and `end` in a buffer into a
+    NumPy array. Fixed-size values are read directly from the buffer.
+    """
+    import numpy
+
+    dtype = numpy.dtype(_NUMPY_DTYPE_BY_TYPE[proto_type])
+
+    if proto_type in FIXED_TYPES:
+        native_dtype = dtype.newbyteorder("=")
+
+        def decode_packed_fixed(buffer: bytes, pos: int, end: int) -> Any:
+            count, remainder = divmod(end - pos, dtype.itemsize)
+            if remainder:
+                raise ValueError(f"Invalid packed field: its length is not a multiple of {dtype.itemsize}.")
+            return numpy.frombuffer(buffer, dtype, count, pos).astype(native_dtype)
+
+        return decode_packed_fixed
+
+    decode_values = _packed_decoder(proto_type)
+    return lambda buffer, pos, end: numpy.array(decode_values(buffer, pos, end), dtype)
+
+
+def _array_packed_decoder(proto_type: str) -> Callable[[bytes, int, int], array.array]:
+    """
+    Returns a function decoding all the values of a packed field located between `pos` and `end` in a buffer into an
+    `array.array`. Fixed-size values are copied directly from the buffer.
+    """
+    typecode = _ARRAY_TYPECODE_BY_TYPE[proto_type]
+
+    if proto_type in FIXED_TYPES:
+        size = _STRUCT_BY_TYPE[proto_type].size
+
+        def decode_packed_fixed(buffer: bytes, pos: int, end: int) -> array.array:
+            if (end - pos) % size:
+                raise ValueError(f"Invalid packed field: its length is not a multiple of {size}.")
+
+            values = array.array(typecode)
+            values.frombytes(memoryview(buffer)[pos:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            return values
+
+        return decode_packed_fixed
+
+    decode_values = _packed_decoder(proto_type)
+    return lambda buffer, pos, end: array.array(typecode, decode_values(buffer, pos, end))
+
+
+class _ArrayPieces(list):
+    """
+    Parts of a repeated numerical field decoded into a NumPy array, when the field is encoded in several parts (for
+    example, with the unpacked encoding). The parts are arrays, or lists of the values decoded one by one. They are
+    concatenated once the message is decoded, by `_join_array_pieces`.
+    """
+
+    __slots__ = ("dtype",)
+
+    def __init__(self, dtype: Any) -> None:
+        super().__init__()
+        self.dtype = dtype
+
+
+def _join_array_pieces(message: Message) -> None:
+    """Concatenates the parts of the repeated numerical fields of a message decoded into NumPy arrays."""
+    for name in message._betterproto.numerical_repeated_field_names:
+        value = _get_attribute(message, name)
+        if type(value) is _ArrayPieces:
+            import numpy
+
+            array = numpy.concatenate([numpy.asarray(piece, value.dtype) for piece in value])
+            _set_attribute(message, name, array)
+
+
+def _array_field_decoders(
+    field_name: str, meta: FieldMetadata, repeated_format: RepeatedFormat
+) -> dict[int, Callable[[Message, bytes, int], int]]:
+    """
+    Returns the functions decoding a repeated numerical field into an `array.array` or a NumPy array (see
+    `_field_decoders`). The packed encoding is decoded with the packed decoder.
+    """
+    decode_value = _DECODER_BY_TYPE[meta.proto_type]
+
+    if repeated_format == RepeatedFormat.NUMPY:
+        import numpy
+
+        decode_values = _numpy_packed_decoder(meta.proto_type)
+        dtype = numpy.dtype(_NUMPY_DTYPE_BY_TYPE[meta.proto_type]).newbyteorder("=")
+
+        def get_pieces(message: Message) -> _ArrayPieces:
+            current = getattr(message, field_name)
+            if type(current) is _ArrayPieces:
+                return current
+
+            pieces = _ArrayPieces(dtype)
+            if len(current):
+                pieces.append(current)
+            _set_attribute(message, field_name, pieces)
+            return pieces
+
+        def extend(message: Message, values: Any) -> None:
+            # Concatenating the arrays each time would copy the values already decoded
+            current = getattr(message, field_name)
+            if type(current) is _ArrayPieces or len(current):
+                get_pieces(message).append(values)
+            else:
+                _set_attribute(message, field_name, values)
+
+        def decode_repeated(message: Message, buffer: bytes, pos: int) -> int:
+            value, pos = decode_value(buffer, pos)
+            pieces = get_pieces(message)
+            if pieces and type(pieces[-1]) is list:
+                pieces[-1].append(value)
+            else:
+                pieces.append([value])
+            return pos
+
+    else:
+        decode_values = _array_packed_decoder(meta.proto_type)
+
+        def extend(message: Message, values: Any) -> None:
+            current = getattr(message, field_name)
+            if len(current):
+                current.extend(values)
+            else:
+                _set_attribute(message, field_name, values)
+
+        def decode_repeated(message: Message, buffer: bytes, pos: int) -> int:
+            _, end = decode_value(buffer, pos)
+            extend(message, decode_values(buffer, pos, end))
+            return end
+
+    def decode_packed(message: Message, buffer: bytes, pos: int) -> int:
+        length, pos = decode_varint(buffer, pos)
+        end = pos + length
+        if end > len(buffer):
+            raise _truncated_message_error(end, len(buffer))
+
+        extend(message, decode_values(buffer, pos, end))
+        return end
+
+    return {
+        (meta.number << 3) | _WIRE_TYPE_BY_PROTO_TYPE[meta.proto_type]: decode_repeated,
+        (meta.number << 3) | WIRE_LEN_DELIM: decode_packed,
+    }
+
+
+def _value_decoder(
+    proto_type: str,
+    field_cls: type | None = None,
+    unwrap: Callable[[], type] | None = None,
+    options: _ParseOptions | None = None,
+) -> Callable[[bytes, int], tuple[Any, int]]:
+    """
+    Returns a function decoding a single value of the given type from a buffer, given the position of its start (just
+    after the tag). The function returns the decoded value and the position of the end of the value. The parsing
+    options are given to the nested messages.
+    """
+    if proto_type == TYPE_ENUM:
+        assert field_cls is not None
+        enum_cls = field_cls
+
+        def decode_enum(buffer: bytes, pos: int) -> tuple[Any, int]:
+            value, pos = _decode_int64(buffer, pos)
+            return enum_cls(value), pos
+
+        return decode_enum
+
+    if proto_type in (TYPE_MESSAGE, TYPE_MAP):
+        assert field_cls is not None
+        msg_cls = field_cls
+        new_message = msg_cls if _construct_with_init(msg_cls) else msg_cls._construct
+
+        def decode_message(buffer: bytes, pos: int) -> tuple[Any, int]:
+            length, pos = decode_varint(buffer, pos)
+            end = pos + length
+            if end > len(buffer):
+                raise _truncated_message_error(end, len(buffer))
+
+            if unwrap is None:
+                message = new_message()
+                message._load_buffer(buffer, pos, end, options)
+                return message, end
+
+            message = unwrap()()
+            message._load_buffer(buffer, pos, end, options)
+            return message.to_wrapped(), end
+
+        return decode_message
+
+    if proto_type == TYPE_BYTES and options is not None and options.zero_copy:
+        return _decode_bytes_view
+
+    return _DECODER_BY_TYPE[proto_type]
+
+
+class _LazyField:
+    """
+    Raw encoded values of a message field that is decoded on first access, when parsing with the `lazy` option. The
+    ranges are the positions of the length prefix and of the end of each value in the buffer.
+    """
+
+    __slots__ = ("buffer", "tag", "options", "ranges")
+
+    def __init__(self, buffer: bytes, tag: bytes, options: _ParseOptions) -> None:
+        self.buffer = buffer
+        self.tag = tag
+        self.options = options
+        self.ranges: list[tuple[int, int]] = []
+
+    def decode(self, msg_cls: type[Message]) -> list[Message]:
+        messages = []
+        for pos, end in self.ranges:
+            _, start = decode_varint(self.buffer, pos)
+            message = msg_cls._construct()
+            message._load_buffer(self.buffer, start, end, self.options)
+            messages.append(message)
+        return messages
+
+    def encode_into(self, buf: bytearray) -> None:
+        """Writes the values back as they were in the parsed data, including their tags."""
+        data = memoryview(self.buffer)
+        for pos, end in self.ranges:
+            buf += self.tag
+            buf += data[pos:end]
+
+    def byte_size(self) -> int:
+        return sum(len(self.tag) + end - pos for pos, end in self.ranges)
+
+
+def _lazy_field_decoder(
+    field_name: str, meta: FieldMetadata, options: _ParseOptions, presence_bit: int = 0
+) -> Callable[[Message, bytes, int], int]:
+    """
+    Returns a function recording the position of a message field value in the buffer, without decoding it. The field
+    is removed from the attributes of the message, so that it is decoded by `Message.__getattr__` on first access.
+    `presence_bit` is set in the presence bitmap of the message, if it isn't 0 (see `PresenceTrackingMessage`).
+    """
+    tag = encode_varint((meta.number << 3) | WIRE_LEN_DELIM)
+
+    def decode_lazy(message: Message, buffer: bytes, pos: int) -> int:
+        length, start = decode_varint(buffer, pos)
+        end = start + length
+        if end > len(buffer):
+            raise _truncated_message_error(end, len(buffer))
+
+        lazy_fields = message._lazy_fields
+        if lazy_fields is None:
+            lazy_fields = {}
+            _set_attribute(message, "_lazy_fields", lazy_fields)
+
+        lazy_field = lazy_fields.get(field_name)
+        if lazy_field is None or lazy_field.buffer is not buffer:
+            lazy_field = lazy_fields[field_name] = _LazyField(buffer, tag, options)
+            if _is_assigned(message, field_name):
+                _delete_attribute(message, field_name)
+
+        if not meta.repeated:
+            # The last value of a non-repeated field wins
+            lazy_field.ranges.clear()
+        lazy_field.ranges.append((pos, end))
+
+        if presence_bit:
+            _set_attribute(message, "_presence", message._presence | presence_bit)
+        return end
+
+    return decode_lazy
+
+
+def _field_decoders(
+    field_name: str,
+    meta: FieldMetadata,
+    field_cls: type,
+    options: _ParseOptions | None = None,
+    presence_bit: int = 0,
+) -> dict[int, Callable[[Message, bytes, int], int]]:
+    """
+    Returns the functions decoding a field value from a buffer into a message, indexed by the tag they handle. Each
+    function returns the position of the end of the value. The decoders of non-repeated fields also set `presence_bit`
+    in the presence bitmap of the message, if it isn't 0 (see `PresenceTrackingMessage`).
+    """
+    if meta.repeated and options is not None:
+        if options.repeated_format == RepeatedFormat.NUMPY and meta.proto_type in _NUMPY_DTYPE_BY_TYPE:
+            return _array_field_decoders(field_name, meta, options.repeated_format)
+        if options.repeated_format == RepeatedFormat.ARRAY and meta.proto_type in _ARRAY_TYPECODE_BY_TYPE:
+            return _array_field_decoders(field_name, meta, options.repeated_format)
+
+    decode_value = _value_decoder(meta.proto_type, field_cls, meta.unwrap, options)
+    tag = (meta.number << 3) | _WIRE_TYPE_BY_PROTO_TYPE[meta.proto_type]
+
+    if (
+        options is not None
+        and options.lazy
+        and options.fields is None
+        and meta.proto_type == TYPE_MESSAGE
+        and meta.unwrap is None
+    ):
+        return {tag: _lazy_field_decoder(field_name, meta, options, presence_bit)}
+
+    if meta.proto_type == TYPE_MAP:
+
+        def decode_map_entry(message: Message, buffer: bytes, pos: int) -> int:
+            # Value represents a single key/value pair entry in the map.
+            entry, pos = decode_value(buffer, pos)
+            getattr(message, field_name)[entry.key] = entry.value
+            return pos
+
+        return {tag: decode_map_entry}
+
+    if meta.repeated:
+
+        def decode_repeated(message: Message, buffer: bytes, pos: int) -> int:
+            value, pos = decode_value(buffer, pos)
+            getattr(message, field_name).append(value)
+            return pos
+
+        if meta.proto_type not in PACKED_TYPES:
+            return {tag: decode_repeated}
+
+        decode_values = _packed_decoder(meta.proto_type, field_cls)
+
+        def decode_packed(message: Message, buffer: bytes, pos: int) -> int:
+            length, pos = decode_varint(buffer, pos)
+            end = pos + length
+            if end > len(buffer):
+                raise _truncated_message_error(end, len(buffer))
+
+            getattr(message, field_name).extend(decode_values(buffer, pos, end))
+            return end
+
+        # Parsers must accept both the packed and the unpacked encodings of repeated scalar fields
+        return {tag: decode_repeated, (meta.number << 3) | WIRE_LEN_DELIM: decode_packed}
+
+    if presence_bit:
+
+        def decode_tracked(message: Message, buffer: bytes, pos: int) -> int:
+            value, pos = decode_value(buffer, pos)
+            _set_attribute(message, field_name, value)
+            _set_attribute(message, "_presence", message._presence | presence_bit)
+            return pos
+
+        return {tag: decode_tracked}
+
+    def decode_single(message: Message, buffer: bytes, pos: int) -> int:
+        value, pos = decode_value(buffer, pos)
+        _set_attribute(message, field_name, value)
+        return pos
+
+    return {tag: decode_single}
+
+
+def _construct_with_init(cls: type[Message]) -> bool:
+    """
+    Whether the messages of a class are created with their `__init__` method rather than by `Message._construct`.
+
+    This is the case of the pydantic dataclasses, which validate the values, and of the dataclasses with slots, which
+    have no `__dict__` to fill.
+    """
+    return (pydantic is not None and pydantic.dataclasses.is_pydantic_dataclass(cls)) or not any(
+        "__dict__" in vars(base) for base in cls.__mro__
+    )
+
+
+def _cls_from_type_hint(type_hint: type, index: int = 0) -> type:
+    """Get the class of the values of a field from its type hint (e.g. `Foo` for `list[Foo]` or `Foo | None`)."""
+    if hasattr(type_hint, "__args__") and index >= 0 and type_hint.__args__ is not None:
+        return type_hint.__args__[index]
+    return type_hint
 
-    if meta.proto_type in (TYPE_FLOAT, TYPE_DOUBLE):
-        return _parse_float(value)
+
+class _SerializedCache:
+    """
+    Binary encoded form of a message with the serialization cache enabled, and snapshot of the field values when it was
+    encoded. The data is valid as long as the message is unchanged since the snapshot was taken.
+
+    When the size of the message is computed without encoding it (see `Message.byte_size`), only the size is kept.
+    """
+
+    __slots__ = ("data", "size", "snapshot")
+
+    def __init__(self) -> None:
+        self.data: bytes | None = None
+        self.size: int | None = None
+        self.snapshot: tuple[Any, ...] = ()
+
+    def get(self, message: Message) -> bytes | None:
+        """Returns the encoded message, or `None` if it was never encoded or if it was modified since."""
+        data = self.data
+        if data is not None and message._betterproto.snapshotter.unchanged_since(message, self.snapshot):
+            return data
+        return None
+
+    def get_size(self, message: Message) -> int | None:
+        """Returns the size of the encoded message, or `None` if it is unknown or if the message was modified since."""
+        size = len(self.data) if self.data is not None else self.size
+        if size is not None and message._betterproto.snapshotter.unchanged_since(message, self.snapshot):
+            return size
+        return None
+
+    def update(self, message: Message, data: bytes) -> None:
+        self.snapshot = message._betterproto.snapshotter.take(message)
+        self.data = data
+        self.size = None
+
+    def update_size(self, message: Message, size: int) -> None:
+        self.snapshot = message._betterproto.snapshotter.take(message)
+        self.data = None
+        self.size = size
+
+
+class _FrozenSerializedCache(_SerializedCache):
+    """
+    Serialization cache of a frozen message (see `FrozenMessage`). The fields of the message can't be reassigned, so
+    the encoded form stays valid without checking the values. The hash of the message is kept as well.
+    """
+
+    __slots__ = ("hash",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.hash: int | None = None
+
+    def get(self, message: Message) -> bytes | None:
+        return self.data
+
+    def get_size(self, message: Message) -> int | None:
+        return len(self.data) if self.data is not None else self.size
+
+    def update(self, message: Message, data: bytes) -> None:
+        self.data = data
+
+    def update_size(self, message: Message, size: int) -> None:
+        self.size = size
+
+
+class _BufferSnapshot:
+    """Content of a mutable buffer (`bytearray`, writable `memoryview` or array) when a snapshot was taken."""
+
+    __slots__ = ("value", "data")
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.data = memoryview(value).tobytes()
+
+    def unchanged(self) -> bool:
+        return memoryview(self.value).tobytes() == self.data
+
+
+def _is_mutable_buffer(value: Any) -> bool:
+    if type(value) is bytes or value is None:
+        return False
+    # Views of immutable data are created by the `zero_copy` option of `Message.parse`
+    return not (type(value) is memoryview and value.readonly and type(value.obj) is bytes)
+
+
+def _tuple_getter(names: list[str]) -> Callable[[Any], tuple[Any, ...]]:
+    """Returns a function getting the given attributes of an object, as a tuple."""
+    if not names:
+        return lambda _: ()
+    if len(names) == 1:
+        get = operator.attrgetter(names[0])
+        return lambda obj: (get(obj),)
+    return operator.attrgetter(*names)
+
+
+def _sequences(lists: tuple[Any, ...], plain: bool) -> Iterable[Any]:
+    """
+    Returns the values of repeated fields that are lists or tuples, whose items are compared one by one. The other ones
+    are arrays, compared by content, and message fields that were not decoded yet (see the `lazy` option of `parse`).
+    """
+    if plain:
+        return lists
+    return [value for value in lists if type(value) is list or type(value) is tuple]
+
+
+class _Snapshotter:
+    """
+    Takes snapshots of the field values of the messages of a class, used by the serialization cache, and checks if a
+    message is unchanged since a snapshot was taken.
+
+    All the values (including the items of the repeated fields and maps) are compared in bulk by identity, which is
+    enough for immutable values. The nested messages are then checked recursively, and the mutable buffers
+    (`bytearray`, arrays, ...) are compared by content.
+    """
+
+    __slots__ = (
+        "single_names",
+        "list_names",
+        "map_names",
+        "get_singles",
+        "get_lists",
+        "get_maps",
+        "message_singles",
+        "message_lists",
+        "message_maps",
+        "bytes_singles",
+        "bytes_lists",
+        "bytes_maps",
+    )
+
+    def __init__(self, meta_by_field_name: dict[str, FieldMetadata]) -> None:
+        self.single_names: list[str] = []
+        self.list_names: list[str] = []
+        self.map_names: list[str] = []
+
+        # Indices of the fields containing messages or bytes values, in each group of fields
+        self.message_singles: list[int] = []
+        self.message_lists: list[int] = []
+        self.message_maps: list[int] = []
+        self.bytes_singles: list[int] = []
+        self.bytes_lists: list[int] = []
+        self.bytes_maps: list[int] = []
+
+        for field_name, meta in meta_by_field_name.items():
+            if meta.map_meta is not None:
+                names, messages, buffers, value_meta = (
+                    self.map_names,
+                    self.message_maps,
+                    self.bytes_maps,
+                    meta.map_meta[1],
+                )
+            elif meta.repeated:
+                names, messages, buffers, value_meta = self.list_names, self.message_lists, self.bytes_lists, meta
+            else:
+                names, messages, buffers, value_meta = self.single_names, self.message_singles, self.bytes_singles, meta
+
+            if value_meta.proto_type == TYPE_MESSAGE and value_meta.unwrap is None:
+                messages.append(len(names))
+            elif value_meta.proto_type == TYPE_BYTES:
+                buffers.append(len(names))
+            names.append(field_name)
+
+        self.get_singles = _tuple_getter(self.single_names)
+        self.get_lists = _tuple_getter(self.list_names)
+        self.get_maps = _tuple_getter(self.map_names)
+
+    def _values(self, message: Message) -> tuple[tuple[Any, ...], tuple[Any, ...]]:
+        """
+        Returns the values of the non-map fields of the message: the non-repeated ones, then the repeated ones. The
+        message fields that were not decoded yet are returned as they are, without decoding them.
+        """
+        if message._lazy_fields is None:
+            return self.get_singles(message), self.get_lists(message)
+
+        def get(field_name: str) -> Any:
+            lazy_field = message._raw_lazy_field(field_name)
+            return lazy_field if lazy_field is not None else getattr(message, field_name)
+
+        return tuple(map(get, self.single_names)), tuple(map(get, self.list_names))
+
+    def take(self, message: Message) -> tuple[Any, ...]:
+        """
+        Returns a snapshot of the field values of the message: the unknown fields, the values of the non-repeated
+        fields, the snapshots of the repeated fields and of the maps (`None` if the message doesn't have such fields),
+        the snapshots of the mutable buffers, and the nested messages with their own snapshots.
+        """
+        singles, lists = self._values(message)
+        maps = self.get_maps(message)
+
+        lists_snapshot = None
+        if lists:
+            plain = all(type(value) is list or type(value) is tuple for value in lists)
+            sequences = _sequences(lists, plain)
+            lists_snapshot = (lists, plain, tuple(map(len, sequences)), tuple(chain.from_iterable(sequences)))
+
+        maps_snapshot = None
+        if maps:
+            maps_snapshot = (
+                maps,
+                tuple(map(len, maps)),
+                tuple(chain.from_iterable(maps)),
+                tuple(chain.from_iterable(map(dict.values, maps))),
+            )
+
+        messages: list[Message] = []
+        for index in self.message_singles:
+            value = singles[index]
+            if value is not None and type(value) is not _LazyField:
+                messages.append(value)
+        for index in self.message_lists:
+            if type(value := lists[index]) is list or type(value) is tuple:
+                messages.extend(value)
+        for index in self.message_maps:
+            messages.extend(maps[index].values())
+
+        buffers: list[_BufferSnapshot] = []
+        for index in self.bytes_singles:
+            if _is_mutable_buffer(value := singles[index]):
+                buffers.append(_BufferSnapshot(value))
+        for index in self.bytes_lists:
+            buffers.extend(_BufferSnapshot(value) for value in lists[index] if _is_mutable_buffer(value))
+        for index in self.bytes_maps:
+            buffers.extend(_BufferSnapshot(value) for value in maps[index].values() if _is_mutable_buffer(value))
+        if lists_snapshot is not None and not lists_snapshot[1]:
+            buffers.extend(_BufferSnapshot(value) for value in lists if _is_array(value))
+
+        return (
+            message._unknown_fields,
+            singles,
+            lists_snapshot,
+            maps_snapshot,
+            tuple(buffers),
+            tuple(
+                (msg._betterproto.snapshotter.unchanged_since, msg, msg._betterproto.snapshotter.take(msg))
+                for msg in messages
+            ),
+        )
+
+    def unchanged_since(self, message: Message, snapshot: tuple[Any, ...]) -> bool:
+        unknown_fields, singles, lists_snapshot, maps_snapshot, buffers, messages = snapshot
+
+        if message._unknown_fields is not unknown_fields:
+            return False
+
+        if message._lazy_fields is None:
+            current_singles, current_lists = self.get_singles(message), self.get_lists(message)
+        else:
+            current_singles, current_lists = self._values(message)
+
+        if not all(map(operator.is_, current_singles, singles)):
+            return False
+
+        if lists_snapshot is not None:
+            lists, plain, lengths, items = lists_snapshot
+            if not all(map(operator.is_, current_lists, lists)):
+                return False
+
+            # The containers are the same objects, their content must be the same as well
+            sequences = _sequences(lists, plain)
+            if tuple(map(len, sequences)) != lengths or not all(
+                map(operator.is_, chain.from_iterable(sequences), items)
+            ):
+                return False
+
+        if maps_snapshot is not None:
+            maps, lengths, keys, values = maps_snapshot
+            if not all(map(operator.is_, self.get_maps(message), maps)) or tuple(map(len, maps)) != lengths:
+                return False
+            if not (
+                all(map(operator.is_, chain.from_iterable(maps), keys))
+                and all(map(operator.is_, chain.from_iterable(map(dict.values, maps)), values))
+            ):
+                return False
+
+        if buffers and not all(map(_BufferSnapshot.unchanged, buffers)):
+            return False
+
+        for unchanged_since, msg, msg_snapshot in messages:
+            if not unchanged_since(msg, msg_snapshot):
+                return False
+        return True
+
+
+# Types for which the default value is the only falsy value
+_FALSY_DEFAULT_TYPES = frozenset(ALL_INT_TYPES + [TYPE_BOOL, TYPE_FLOAT, TYPE_DOUBLE, TYPE_STRING, TYPE_BYTES])
+
+
+def _is_default_predicate(meta: FieldMetadata, default: Any) -> Callable[[Any], bool]:
+    """
+    Returns a function checking if a value of a field is its default value. `default` is the precomputed default of
+    the field, ignored for repeated and map fields.
+    """
+    if meta.repeated and meta.proto_type in _NUMPY_DTYPE_BY_TYPE:
+        return _is_empty
+    if meta.repeated or meta.proto_type == TYPE_MAP:
+        return operator.not_
+    if default is None:
+        return partial(operator.is_, None)
+    if meta.proto_type in _FALSY_DEFAULT_TYPES:
+        return operator.not_
+    return partial(operator.eq, default)
+
+
+class ProtoClassMetadata:
+    __slots__ = (
+        "oneof_field_by_group",
+        "default_gen",
+        "immutable_defaults",
+        "is_default_by_field",
+        "cls_by_field",
+        "field_name_by_number",
+        "meta_by_field_name",
+        "sorted_field_names",
+        "repeated_field_names",
+        "numerical_repeated_field_names",
+        "field_encoders",
+        "field_sizers",
+        "snapshotter",
+        "tracks_presence",
+        "presence_bit_by_field",
+        "container_presence",
+        "presence_fields",
+        "default_values",
+        "mutable_default_gen",
+        "construct_with_init",
+        "field_decoders",
+        "field_decoders_by_options",
+        "to_dict_plans",
+        "field_name_by_dict_key",
+    )
+
+    oneof_field_by_group: dict[str, set[dataclasses.Field]]
+    field_name_by_number: dict[int, str]
+    meta_by_field_name: dict[str, FieldMetadata]
+    sorted_field_names: tuple[str, ...]
+    repeated_field_names: tuple[str, ...]
+    numerical_repeated_field_names: tuple[str, ...]
+    default_gen: dict[str, Callable[[], Any]]
+    immutable_defaults: dict[str, Any]
+    is_default_by_field: dict[str, Callable[[Any], bool]]
+    cls_by_field: dict[str, type]
+    field_encoders: dict[str, Callable[[bytearray, Any], None]]
+    field_sizers: dict[str, Callable[[Any], int]]
+    snapshotter: _Snapshotter
+    tracks_presence: bool
+    presence_bit_by_field: dict[str, int]
+    container_presence: int
+    presence_fields: tuple[
+        tuple[str, Callable[[bytearray, Any], None], Callable[[Any], int], Callable[[Any], bool]], ...
+    ]
+    default_values: dict[str, Any]
+    mutable_default_gen: tuple[tuple[str, Callable[[], Any]], ...]
+    construct_with_init: bool
+    field_decoders: dict[int, Callable[[Message, bytes, int], int]]
+    field_decoders_by_options: dict[_ParseOptions, dict[int, Callable[[Message, bytes, int], int]]]
+    to_dict_plans: dict[tuple[OutputFormat, Casing], tuple[Callable[[Message, dict[str, Any], bool], None], ...]]
+    field_name_by_dict_key: dict[str, str]
+
+    def __init__(self, cls: type[Message]):
+        by_group: dict[str, set] = {}
+        by_field_name = {}
+        by_field_number = {}
+
+        assert dataclasses.is_dataclass(cls)
+        fields = dataclasses.fields(cls)
+        for field in fields:
+            meta = FieldMetadata.get(field)
+
+            if meta.group:
+                by_group.setdefault(meta.group, set()).add(field)
+
+            by_field_name[field.name] = meta
+            by_field_number[meta.number] = field.name
+
+        self.oneof_field_by_group = by_group
+        self.field_name_by_number = by_field_number
+        self.meta_by_field_name = by_field_name
+        self.sorted_field_names = tuple(by_field_number[number] for number in sorted(by_field_number))
+        self.repeated_field_names = tuple(name for name, meta in by_field_name.items() if meta.repeated)
+        self.numerical_repeated_field_names = tuple(
+            name for name in self.repeated_field_names if by_field_name[name].proto_type in _NUMPY_DTYPE_BY_TYPE
+        )
+        self.field_encoders = {name: _field_encoder(meta) for name, meta in by_field_name.items()}
+        self.field_sizers = {name: _field_sizer(meta) for name, meta in by_field_name.items()}
+        self.snapshotter = _Snapshotter(by_field_name)
+
+        self.default_gen = {}
+        self.immutable_defaults = {}
+        self.is_default_by_field = {}
+        with warnings.catch_warnings():
+            # ignore warnings when initialising deprecated field defaults
+            warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+            for field in fields:
+                assert field.default_factory is not dataclasses.MISSING
+                meta = by_field_name[field.name]
+                self.default_gen[field.name] = field.default_factory
+
+                # Mutable defaults (lists and dicts) must be created again each time they are needed
+                default = None
+                if not (meta.repeated or meta.proto_type == TYPE_MAP):
+                    default = self.immutable_defaults[field.name] = field.default_factory()
+
+                self.is_default_by_field[field.name] = _is_default_predicate(meta, default)
+
+        self.cls_by_field = self._get_cls_by_field(cls, fields, cls._type_hints())
+
+        # Used by `Message._construct` to create messages without calling `__init__`, by filling their `__dict__`. The
+        # mutable defaults are placeholders in `default_values`, replaced by a new value for each message.
+        self.default_values = {name: self.immutable_defaults.get(name) for name in by_field_name}
+        self.mutable_default_gen = tuple(
+            (name, self.default_gen[name]) for name in by_field_name if name not in self.immutable_defaults
+        )
+        self.construct_with_init = _construct_with_init(cls)
+
+        # Bits of the presence bitmap of the fields, in the order of the fields (see `PresenceTrackingMessage`). The
+        # repeated fields and the maps can be modified in place, so they are always checked.
+        self.tracks_presence = issubclass(cls, PresenceTrackingMessage)
+        self.presence_bit_by_field = {name: 1 << index for index, name in enumerate(by_field_name)}
+        self.container_presence = 0
+        for name, meta in by_field_name.items():
+            if meta.repeated or meta.proto_type == TYPE_MAP:
+                self.container_presence |= self.presence_bit_by_field[name]
+        self.presence_fields = tuple(
+            (name, self.field_encoders[name], self.field_sizers[name], self.is_default_by_field[name])
+            for name in by_field_name
+        )
+
+        self.field_decoders = {}
+        for field_name, meta in by_field_name.items():
+            self.field_decoders.update(
+                _field_decoders(field_name, meta, self.cls_by_field[field_name], None, self.presence_bit(field_name))
+            )
+        self.field_decoders_by_options = {}
+
+        self.to_dict_plans = {}
+
+        # Accepted spellings of the keys in `from_dict`: the python name, the (JSON) camel case name and the snake case
+        # name. Other spellings are resolved with `safe_snake_case` each time. They are not added to the table, which
+        # would grow without bound with keys coming from untrusted data.
+        self.field_name_by_dict_key = {}
+        for field_name in by_field_name:
+            for key in (field_name, camel_case(field_name).rstrip("_"), snake_case(field_name).rstrip("_")):
+                if safe_snake_case(key) == field_name:
+                    self.field_name_by_dict_key[key] = field_name
+
+    def presence_bit(self, field_name: str) -> int:
+        """Returns the bit of a field set by the decoders, or 0 if the class doesn't track the fields presence."""
+        if not self.tracks_presence:
+            return 0
+        return self.presence_bit_by_field[field_name]
+
+    def check_field_paths(self, paths: Iterable[str], prefix: str = "") -> None:
+        """
+        Raises a `ValueError` if one of the paths of fields to decode (see `_ParseOptions.fields`) doesn't exist,
+        including in the nested messages. `prefix` is the path of the message, used in the error messages.
+        """
+        subpaths_by_field: dict[str, list[str]] = {}
+        for path in paths:
+            field_name, _, subpath = path.partition(".")
+            meta = self.meta_by_field_name.get(field_name)
+            if meta is None:
+                raise ValueError(f"Unknown field '{prefix}{field_name}'")
+            if subpath:
+                if meta.proto_type != TYPE_MESSAGE:
+                    raise ValueError(f"Cannot select the path '{subpath}' in field '{prefix}{field_name}'")
+                subpaths_by_field.setdefault(field_name, []).append(subpath)
+
+        for field_name, subpaths in subpaths_by_field.items():
+            unwrap = self.meta_by_field_name[field_name].unwrap
+            field_cls = unwrap() if unwrap is not None else self.cls_by_field[field_name]
+            field_cls._betterproto.check_field_paths(subpaths, f"{prefix}{field_name}.")
+
+    def field_name_for_dict_key(self, key: str) -> str:
+        """
+        Returns the name of the field corresponding to a key of a dict given to `from_dict`. Raises a `KeyError` if
+        the key doesn't match any field.
+        """
+        try:
+            return self.field_name_by_dict_key[key]
+        except KeyError:
+            field_name = safe_snake_case(key)
+            if field_name not in self.meta_by_field_name:
+                raise KeyError(field_name) from None
+            return field_name
+
+    def field_decoders_for(self, options: _ParseOptions | None) -> dict[int, Callable[[Message, bytes, int], int]]:
+        """
+        Returns the field decoders (see `field_decoders`) applying the given parsing options. The decoders are built
+        the first time they are needed for each combination of options, and kept for the last
+        `_FIELD_DECODERS_CACHE_SIZE` combinations used.
+        """
+        if options is None:
+            return self.field_decoders
+
+        cache = self.field_decoders_by_options
+        decoders = cache.pop(options, None)
+        if decoders is not None:
+            # Moved to the end, the most recently used
+            cache[options] = decoders
+            return decoders
+
+        decoders = {}
+        for field_name, meta in self.meta_by_field_name.items():
+            if options.selects(field_name):
+                field_options = options.for_field(field_name)
+                decoders.update(
+                    _field_decoders(
+                        field_name, meta, self.cls_by_field[field_name], field_options, self.presence_bit(field_name)
+                    )
+                )
+
+        if len(cache) >= _FIELD_DECODERS_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[options] = decoders
+        return decoders
+
+    def to_dict_plan(
+        self, output_format: OutputFormat, casing: Casing
+    ) -> tuple[Callable[[Message, dict[str, Any], bool], None], ...]:
+        """
+        Returns the steps converting a message to a dict for the given options, one per field. The steps are built
+        the first time they are needed for each combination of options.
+        """
+        try:
+            return self.to_dict_plans[(output_format, casing)]
+        except KeyError:
+            plan = tuple(
+                _field_to_dict_step(field_name, meta, self.cls_by_field, output_format, casing)
+                for field_name, meta in self.meta_by_field_name.items()
+            )
+            self.to_dict_plans[(output_format, casing)] = plan
+            return plan
+
+    @staticmethod
+    def _get_cls_by_field(
+        cls: type[Message],  # type: ignore[reportSelfClsParameterName]
+        fields: Iterable[dataclasses.Field],
+        type_hints: dict[str, type],
+    ) -> dict[str, type]:
+        """
+        Resolve the class of the values of each field from the type hints. For maps, the class of the map entries is
+        created, and the classes of the keys and values are stored under `<field_name>.key` and `<field_name>.value`.
+        """
+        field_cls = {}
+
+        for field_ in fields:
+            meta = FieldMetadata.get(field_)
+            if meta.proto_type == TYPE_MAP:
+                assert meta.map_meta
+                kt = _cls_from_type_hint(type_hints[field_.name], index=0)
+                vt = _cls_from_type_hint(type_hints[field_.name], index=1)
+
+                if meta.map_meta[1].proto_type == TYPE_ENUM:
+                    value_field = field(2, meta.map_meta[1].proto_type, default_factory=lambda: vt(0))
+                else:
+                    value_field = field(2, meta.map_meta[1].proto_type, unwrap=meta.map_meta[1].unwrap)
+
+                field_cls[field_.name] = dataclasses.make_dataclass(
+                    "Entry",
+                    [
+                        ("key", kt, field(1, meta.map_meta[0].proto_type)),
+                        ("value", vt, value_field),
+                    ],
+                    bases=(Message,),
+                )
+                field_cls[f"{field_.name}.key"] = kt
+                field_cls[f"{field_.name}.value"] = vt
+            else:
+                field_cls[field_.name] = _cls_from_type_hint(type_hints[field_.name])
+
+        return field_cls
+
+
+class OutputFormat(IntEnum):
+    """
+    Chosen output format for the `Message.to_dict` method.
+    """
+
+    PYTHON = 1
+    PROTO_JSON = 2
+
+
+class RepeatedFormat(IntEnum):
+    """
+    Chosen representation of the repeated numerical fields (booleans, integers and floating point numbers) decoded by
+    the `Message.parse` and `Message.load` methods.
+    """
+
+    LIST = 1
+    """Python lists."""
+
+    NUMPY = 2
+    """NumPy arrays. Fixed-size values (floats, doubles and fixedXX types) are copied directly from the data."""
+
+    ARRAY = 3
+    """
+    `array.array` objects, which don't depend on NumPy. Booleans are stored as bytes, whose items are 0 or 1.
+    Fixed-size values are copied directly from the data.
+    """
+
+
+class Compression(IntEnum):
+    """
+    Compression of the streams of delimited messages written by the `Message.write_delimited` method.
+    """
+
+    ZLIB = 1
+    """zlib, from the standard library."""
+
+    GZIP = 2
+    """gzip, from the standard library."""
+
+    ZSTD = 3
+    """Zstandard, which requires the `zstandard` package."""
+
+
+@dataclasses.dataclass(frozen=True)
+class _ParseOptions:
+    """Options of `Message.parse` and `Message.load`, applied to the nested messages as well."""
+
+    repeated_format: RepeatedFormat = RepeatedFormat.LIST
+    lazy: bool = False
+    zero_copy: bool = False
+
+    fields: frozenset[str] | None = None
+    """The paths of the fields to decode, relative to the message. `None` if all the fields are decoded."""
+
+    keep_skipped: bool = False
+    """Whether the fields that are not decoded are kept as unknown fields."""
+
+    @staticmethod
+    def get(
+        repeated_format: RepeatedFormat,
+        lazy: bool,
+        zero_copy: bool,
+        fields: Iterable[str] | None,
+        keep_skipped: bool,
+        message_type: type[Message] | None = None,
+    ) -> _ParseOptions | None:
+        """
+        Returns the options to use, or `None` if they are the default ones. The paths of `fields` are checked against
+        `message_type`, if given.
+        """
+        if fields is None:
+            if repeated_format == RepeatedFormat.LIST and not lazy and not zero_copy:
+                return None
+            return _ParseOptions(repeated_format, lazy, zero_copy)
+
+        if isinstance(fields, str):
+            raise TypeError("`fields` must be an iterable of field paths, not a string")
+
+        fields = frozenset(fields)
+        if message_type is not None:
+            message_type._betterproto.check_field_paths(fields)
+        return _ParseOptions(repeated_format, lazy, zero_copy, fields, keep_skipped)
+
+    def selects(self, field_name: str) -> bool:
+        """Returns whether the field, or a part of it, is decoded."""
+        if self.fields is None or field_name in self.fields:
+            return True
+        prefix = field_name + "."
+        return any(path.startswith(prefix) for path in self.fields)
+
+    def for_field(self, field_name: str) -> _ParseOptions | None:
+        """Returns the options to use for the values of a field that is decoded."""
+        if self.fields is None:
+            return self
+
+        prefix = field_name + "."
+        if field_name in self.fields:
+            fields = None
+        else:
+            fields = [path[len(prefix) :] for path in self.fields if path.startswith(prefix)]
+        return _ParseOptions.get(self.repeated_format, self.lazy, self.zero_copy, fields, self.keep_skipped)
+
+
+def _keep_value(value: Any, include_default_values: bool) -> Any:
+    return value
+
+
+def _value_to_dict_converter(
+    proto_type: str,
+    field_type: type,
+    unwrapped_type: Callable[[], type] | None,
+    output_format: OutputFormat,
+    casing: Casing,
+) -> Callable[[Any, bool], Any]:
+    """
+    Returns a function converting a single item to its dict representation. The function takes the item and the
+    `include_default_values` option of `Message.to_dict`, needed for recursive calls.
+    """
+    if proto_type == TYPE_MESSAGE:
+        if unwrapped_type is not None and output_format == OutputFormat.PYTHON:
+            return _keep_value
+
+        def convert_message(value: Any, include_default_values: bool) -> Any:
+            if unwrapped_type is not None:
+                value = unwrapped_type().from_wrapped(value)
+
+            return value.to_dict(
+                output_format=output_format, casing=casing, include_default_values=include_default_values
+            )
+
+        return convert_message
+
+    if output_format == OutputFormat.PYTHON:
+        return _keep_value
+
+    # PROTO_JSON
+    if proto_type in INT_64_TYPES:
+        return lambda value, _: str(value)
+    if proto_type == TYPE_BYTES:
+        return lambda value, _: b64encode(value).decode("utf8")
+    if proto_type == TYPE_ENUM:
+
+        def convert_enum(value: Any, include_default_values: bool) -> Any:
+            enum_value = field_type(value)
+
+            # If we don't know the definition of this variant, we fall back to the value.
+            if not enum_value.name:
+                return enum_value.value
+
+            return enum_value.proto_name or enum_value.name
+
+        return convert_enum
+    if proto_type in (TYPE_FLOAT, TYPE_DOUBLE):
+        return lambda value, _: _dump_float(value)
+    return _keep_value
+
+
+def _field_to_dict_step(
+    field_name: str,
+    meta: FieldMetadata,
+    cls_by_field: dict[str, type],
+    output_format: OutputFormat,
+    casing: Casing,
+) -> Callable[[Message, dict[str, Any], bool], None]:
+    """
+    Returns a function adding the dict representation of a field of a message to the output of `Message.to_dict`, if
+    needed. The function takes the message, the output dict and the `include_default_values` option.
+    """
+    cased_name = casing(field_name).rstrip("_")
+
+    if meta.repeated:
+        convert = _value_to_dict_converter(
+            meta.proto_type, cls_by_field[field_name], meta.unwrap, output_format, casing
+        )
+
+        get_items: Callable[[Message], Any] = operator.attrgetter(field_name)
+        if meta.proto_type == TYPE_BOOL:
+            # The items of `array.array` booleans are integers
+            get_values = get_items
+            get_items = lambda message: [bool(item) for item in _scalar_values(get_values(message))]
+        elif meta.proto_type in _NUMPY_DTYPE_BY_TYPE:
+            get_values = get_items
+            get_items = lambda message: _scalar_values(get_values(message))
+
+        def repeated_to_dict(message: Message, output: dict[str, Any], include_default_values: bool) -> None:
+            value = [convert(item, include_default_values) for item in get_items(message)]
+            if value or include_default_values:
+                output[cased_name] = value
+
+        return repeated_to_dict
+
+    if meta.proto_type == TYPE_MAP:
+        assert meta.map_meta is not None
+        key_meta, value_meta = meta.map_meta
+        convert_key = _value_to_dict_converter(
+            key_meta.proto_type, cls_by_field[f"{field_name}.key"], None, output_format, casing
+        )
+        convert_value = _value_to_dict_converter(
+            value_meta.proto_type, cls_by_field[f"{field_name}.value"], value_meta.unwrap, output_format, casing
+        )
+
+        def map_to_dict(message: Message, output: dict[str, Any], include_default_values: bool) -> None:
+            value = {
+                convert_key(k, include_default_values): convert_value(v, include_default_values)
+                for k, v in getattr(message, field_name).items()
+            }
+            if value or include_default_values:
+                output[cased_name] = value
+
+        return map_to_dict
+
+    convert = _value_to_dict_converter(meta.proto_type, cls_by_field[field_name], meta.unwrap, output_format, casing)
+
+    # Messages and optional values are present as soon as they are not None
+    always_present = bool(meta.optional) or meta.proto_type == TYPE_MESSAGE
+
+    def single_to_dict(message: Message, output: dict[str, Any], include_default_values: bool) -> None:
+        value = getattr(message, field_name)
+        if value is None:
+            if include_default_values:
+                output[cased_name] = None
+        elif always_present or include_default_values or value:
+            output[cased_name] = convert(value, include_default_values)
+
+    return single_to_dict
+
+
+def _value_from_dict(value: Any, meta: FieldMetadata, field_type: type, ignore_unknown_fields: bool) -> Any:
+    if meta.proto_type == TYPE_MESSAGE:
+        msg_cls = meta.unwrap() if meta.unwrap else field_type
+
+        msg = msg_cls.from_dict(value, ignore_unknown_fields=ignore_unknown_fields)
+
+        if meta.unwrap:
+            return msg.to_wrapped()
+        return msg
+
+    if meta.proto_type == TYPE_ENUM:
+        if isinstance(value, str):
+            if (int_value := field_type.betterproto_renamed_proto_names_to_value().get(value)) is not None:
+                return field_type(int_value)
+            return field_type.from_string(value)
+        if isinstance(value, int):
+            return field_type(value)
+        if isinstance(value, Enum):
+            return value
+        raise ValueError("Enum value must be a string or an Enum instance")
+
+    if meta.proto_type in ALL_INT_TYPES:
+        return int(value)
+
+    if meta.proto_type == TYPE_BYTES:
+        return b64decode(value)
+
+    if meta.proto_type in (TYPE_FLOAT, TYPE_DOUBLE):
+        return _parse_float(value)
 
     return value
 
@@ -646,19 +2423,56 @@ class Message(ABC):
     parsers to go between the Python, binary and JSON representations of the message.
     """
 
+    # The attributes of the messages that are not fields are stored in slots, so that messages compiled with the
+    # `slotted_dataclasses` option don't need a `__dict__`
+    __slots__ = ("_unknown_fields", "_lazy_fields", "_serialized_cache")
+
     _unknown_fields: bytes
     _betterproto_meta: ClassVar[ProtoClassMetadata]
 
+    # Message fields that were not decoded yet, when parsing with the `lazy` option
+    _lazy_fields: dict[str, _LazyField] | None
+
+    # Last binary encoded form of the message, when the serialization cache is enabled
+    _serialized_cache: _SerializedCache | None
+
     def __post_init__(self) -> None:
-        self._unknown_fields = b""
+        _set_attribute(self, "_unknown_fields", b"")
+        _set_attribute(self, "_lazy_fields", None)
+        _set_attribute(self, "_serialized_cache", None)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the attribute doesn't exist, which is the case of the fields that are decoded lazily. The
+        # `_lazy_fields` slot itself doesn't exist if `__post_init__` was not called.
+        try:
+            lazy_fields = _get_attribute(self, "_lazy_fields")
+        except AttributeError:
+            lazy_fields = None
+        if lazy_fields is None or name not in lazy_fields:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        messages = lazy_fields.pop(name).decode(self._betterproto.cls_by_field[name])
+        value = messages if self._betterproto.meta_by_field_name[name].repeated else messages[-1]
+        _set_attribute(self, name, value)
+        return value
+
+    def _raw_lazy_field(self, name: str) -> _LazyField | None:
+        """Returns the raw data of a field if it was not decoded (or assigned) since the message was parsed."""
+        lazy_fields = self._lazy_fields
+        if lazy_fields is None or _is_assigned(self, name):
+            return None
+        return lazy_fields.get(name)
 
     def __eq__(self, other) -> bool:
         if type(self) is not type(other):
             return NotImplemented
 
         for field_name in self._betterproto.meta_by_field_name:
-            self_val = self.__getattribute__(field_name)
-            other_val = other.__getattribute__(field_name)
+            self_val = getattr(self, field_name)
+            other_val = getattr(other, field_name)
+
+            if _is_array(self_val) or _is_array(other_val):
+                self_val, other_val = _scalar_values(self_val), _scalar_values(other_val)
 
             if self_val != other_val:
                 # We consider two nan values to be the same for the
@@ -677,34 +2491,74 @@ class Message(ABC):
         return True
 
     def __repr__(self) -> str:
+        is_default_by_field = self._betterproto.is_default_by_field
         parts = [
             f"{field_name}={value!r}"
             for field_name in self._betterproto.sorted_field_names
-            for value in (self.__getattribute__(field_name),)
-            if value != self._get_field_default(field_name)
+            for value in (getattr(self, field_name),)
+            if not is_default_by_field[field_name](value)
         ]
         return f"{self.__class__.__name__}({', '.join(parts)})"
 
     def __bool__(self) -> bool:
         """True if the message has any fields with non-default values."""
-        return any(
-            self.__getattribute__(field_name) != self._get_field_default(field_name)
-            for field_name in self._betterproto.meta_by_field_name
+        return not all(
+            is_default(getattr(self, field_name))
+            for field_name, is_default in self._betterproto.is_default_by_field.items()
         )
 
     def __deepcopy__(self: T, _: Any = {}) -> T:
         kwargs = {}
         for name in self._betterproto.sorted_field_names:
-            value = self.__getattribute__(name)
-            kwargs[name] = deepcopy(value)
-        return self.__class__(**kwargs)  # type: ignore
+            value = getattr(self, name)
+            meta = self._betterproto.meta_by_field_name[name]
+
+            # Bytes values can be views of the parsed data (see the `zero_copy` option of `parse`), which can't be
+            # deep-copied. Converting them to bytes copies them.
+            if meta.map_meta is not None and meta.map_meta[1].proto_type == TYPE_BYTES:
+                kwargs[name] = {key: bytes(item) for key, item in value.items()}
+            elif meta.proto_type == TYPE_BYTES and value is not None:
+                kwargs[name] = [bytes(item) for item in value] if meta.repeated else bytes(value)
+            else:
+                kwargs[name] = deepcopy(value)
+        return self.__class__._construct(kwargs)
 
     def __copy__(self: T, _: Any = {}) -> T:
         kwargs = {}
         for name in self._betterproto.sorted_field_names:
-            value = self.__getattribute__(name)
+            value = getattr(self, name)
             kwargs[name] = value
-        return self.__class__(**kwargs)  # type: ignore
+        return self.__class__._construct(kwargs)
+
+    @classmethod
+    def _construct(cls, fields: dict[str, Any] | None = None) -> Self:
+        """
+        Create a message without calling the `__init__` method generated by `dataclasses`, which is faster for
+        messages with several fields. The values of the given fields are assigned as they are, and the other fields
+        get their default value. `__post_init__` is still called.
+        """
+        try:
+            meta = cls._betterproto_meta
+        except AttributeError:
+            meta = cls._betterproto
+        if meta.construct_with_init:
+            return cls(**fields) if fields else cls()
+
+        message = cls.__new__(cls)
+
+        values = vars(message)
+        values.update(meta.default_values)
+        if fields is None:
+            for name, default_gen in meta.mutable_default_gen:
+                values[name] = default_gen()
+        else:
+            for name, default_gen in meta.mutable_default_gen:
+                if name not in fields:
+                    values[name] = default_gen()
+            values.update(fields)
+
+        message.__post_init__()
+        return message
 
     @classproperty
     def _betterproto(cls: type[Self]) -> ProtoClassMetadata:  # type: ignore
@@ -735,11 +2589,14 @@ class Message(ABC):
         if not self._is_pydantic():
             raise TypeError("Validation is only available for pydantic dataclasses.")
 
-        dict = self.__dict__.copy()
-        del dict["_unknown_fields"]
-        pydantic_core.SchemaValidator(self.__pydantic_core_schema__).validate_python(dict)  # type: ignore
+        # Only the fields are validated, not the other attributes such as `_unknown_fields`, nor the fields that were
+        # not decoded yet (see the `lazy` option of `parse`)
+        values = {
+            name: getattr(self, name) for name in self._betterproto.meta_by_field_name if _is_assigned(self, name)
+        }
+        pydantic_core.SchemaValidator(self.__pydantic_core_schema__).validate_python(values)  # type: ignore
 
-    def dump(self, stream: SupportsWrite[bytes], delimit: bool = False) -> None:
+    def dump(self, stream: SupportsWrite[bytes | bytearray], delimit: bool = False) -> None:
         """
         Dumps the binary encoded Protobuf message to the stream.
 
@@ -751,73 +2608,215 @@ class Message(ABC):
             Whether to prefix the message with a varint declaring its size.
             TODO is it actually needed?
         """
-        b = bytes(self)
+        if self._serialized_cache is not None:
+            buf: bytes | bytearray = bytes(self)
+        else:
+            encode_buf = _EncodeBuffer()
+            self._encode_into(encode_buf)
+            buf = _finish_buffer(encode_buf)
 
         if delimit:
-            dump_varint(len(b), stream)
+            dump_varint(len(buf), stream)
+
+        stream.write(buf)
+
+    @classmethod
+    def write_delimited(
+        cls,
+        stream: SupportsWrite[bytes | bytearray],
+        messages: Iterable[Message],
+        *,
+        chunk_size: int = _DELIMITED_CHUNK_SIZE,
+        compression: Compression | None = None,
+    ) -> None:
+        """
+        Dumps the binary encoded Protobuf messages to the stream, each of them prefixed with a varint declaring its
+        size, as :meth:`dump` does with ``delimit=True``. The messages are encoded together in chunks, and each chunk
+        is written with a single call to ``write``.
+
+        With ``compression``, each chunk is compressed separately as a block, preceded by a header giving its size and
+        its number of messages. The blocks can be located without being decompressed (see
+        :func:`betterproto2.delimited.read_block_index`), and the stream can be read from the start of any block.
+
+        Parameters
+        -----------
+        stream: :class:`BinaryIO`
+            The stream to dump the messages to.
+        messages: Iterable[:class:`Message`]
+            The messages to dump.
+        chunk_size: :class:`int`
+            The size from which the encoded messages are written to the stream.
+        compression: Optional[:class:`Compression`]
+            The compression of the chunks. The chunks are not compressed if ``None`` is given.
+        """
+        if compression is not None:
+            from .delimited import _write_blocks
+
+            _write_blocks(stream, _encode_delimited(messages, chunk_size), compression)
+            return
+
+        for chunk, _ in _encode_delimited(messages, chunk_size):
+            stream.write(chunk)
 
-        stream.write(b)
+    @classmethod
+    async def write_delimited_async(
+        cls,
+        writer: StreamWriter,
+        messages: Iterable[Message],
+        *,
+        chunk_size: int = _DELIMITED_CHUNK_SIZE,
+        high_water_mark: int = _DELIMITED_HIGH_WATER_MARK,
+    ) -> None:
+        """
+        Asynchronous version of :meth:`write_delimited`, writing to an :class:`asyncio.StreamWriter`. The writer is
+        only drained when the size of its write buffer exceeds ``high_water_mark``, instead of after each chunk.
+
+        Parameters
+        -----------
+        writer: :class:`asyncio.StreamWriter`
+            The stream to dump the messages to.
+        messages: Iterable[:class:`Message`]
+            The messages to dump.
+        chunk_size: :class:`int`
+            The size from which the encoded messages are written to the stream.
+        high_water_mark: :class:`int`
+            The size of the write buffer from which the writer is drained.
+        """
+        transport = writer.transport
+        for chunk, _ in _encode_delimited(messages, chunk_size):
+            writer.write(chunk)
+            if transport.get_write_buffer_size() > high_water_mark:
+                await writer.drain()
 
     def __bytes__(self) -> bytes:
         """
         Get the binary encoded Protobuf representation of this message instance.
         """
+        cache = self._serialized_cache
+        if cache is not None and (data := cache.get(self)) is not None:
+            return data
+
+        buf = _EncodeBuffer()
+        self._encode_into(buf)
+        data = bytes(_finish_buffer(buf))
+
+        if cache is not None:
+            cache.update(self, data)
+        return data
+
+    def enable_serialization_cache(self) -> Self:
+        """
+        Keep the binary encoded form of this message instance each time it is serialized, and return it again instead
+        of encoding the message as long as no field (including in nested messages and containers) is modified. This
+        returns the instance itself and is therefore assignable and chainable.
+
+        The cache is checked by comparing the current field values with the ones that were encoded: immutable values
+        are compared by identity, containers, bytes-like values and nested messages by their content. Checking it is
+        much faster than encoding the message, but the encoded form is kept in memory for the whole lifetime of the
+        message.
+
+        Returns
+        --------
+        :class:`Message`
+            The message itself.
+        """
+        if self._serialized_cache is None:
+            _set_attribute(self, "_serialized_cache", self._new_serialized_cache())
+        return self
+
+    def _new_serialized_cache(self) -> _SerializedCache:
+        return _SerializedCache()
+
+    def _encode_into(self, buf: bytearray) -> None:
+        """
+        Write the binary encoded Protobuf representation of this message instance at the end of the buffer. Nested
+        messages are written in the same buffer, their length prefix being patched once they are written.
+        """
         if self._is_pydantic():
             self._validate()
 
-        with BytesIO() as stream:
-            for field_name, meta in self._betterproto.meta_by_field_name.items():
-                value = getattr(self, field_name)
+        is_default_by_field = self._betterproto.is_default_by_field
+        lazy_fields = self._lazy_fields
 
-                if value is None:
-                    # Optional items should be skipped. This is used for the Google
-                    # wrapper types and proto3 field presence/optional fields.
-                    continue
+        for field_name, encode in self._betterproto.field_encoders.items():
+            if lazy_fields is not None and (lazy_field := self._raw_lazy_field(field_name)) is not None:
+                # The field was not accessed since the message was parsed, its data is written back as is.
+                lazy_field.encode_into(buf)
+                continue
 
-                if value == self._get_field_default(field_name):
-                    # Default (zero) values are not serialized.
-                    continue
+            value = getattr(self, field_name)
 
-                if meta.repeated:
-                    if meta.proto_type in PACKED_TYPES:
-                        # Packed lists look like a length-delimited field. First,
-                        # preprocess/encode each value into a buffer and then
-                        # treat it like a field of raw bytes.
-                        buf = bytearray()
-                        for item in value:
-                            buf += _preprocess_single(meta.proto_type, None, item)
-                        stream.write(_serialize_single(meta.number, TYPE_BYTES, buf))
-                    else:
-                        for item in value:
-                            stream.write(
-                                _serialize_single(
-                                    meta.number,
-                                    meta.proto_type,
-                                    item,
-                                    unwrap=meta.unwrap,
-                                )
-                                # if it's an empty message it still needs to be
-                                # represented as an item in the repeated list
-                                or b"\n\x00"
-                            )
-
-                elif meta.map_meta:
-                    for k, v in value.items():
-                        sk = _serialize_single(1, meta.map_meta[0].proto_type, k)
-                        sv = _serialize_single(2, meta.map_meta[1].proto_type, v, unwrap=meta.map_meta[1].unwrap)
-                        stream.write(_serialize_single(meta.number, meta.proto_type, sk + sv))
-                else:
-                    stream.write(
-                        _serialize_single(
-                            meta.number,
-                            meta.proto_type,
-                            value,
-                            unwrap=meta.unwrap,
-                        )
-                    )
+            if value is None:
+                # Optional items should be skipped. This is used for the Google
+                # wrapper types and proto3 field presence/optional fields.
+                continue
+
+            if is_default_by_field[field_name](value):
+                # Default (zero) values are not serialized.
+                continue
+
+            encode(buf, value)
+
+        buf += self._unknown_fields
+
+    def byte_size(self) -> int:
+        """
+        Compute the size of the binary encoded Protobuf representation of this message instance, without serializing
+        it. This is equal to ``len(bytes(self))``.
+
+        If the serialization cache is enabled (see :meth:`enable_serialization_cache`), the size is kept and returned
+        again as long as the message is not modified.
+
+        Returns
+        --------
+        :class:`int`
+            The size in bytes of the binary encoded message.
+        """
+        cache = self._serialized_cache
+        if cache is None:
+            return self._byte_size()
+
+        size = cache.get_size(self)
+        if size is None:
+            size = self._byte_size()
+            cache.update_size(self, size)
+        return size
+
+    def _byte_size(self) -> int:
+        """Compute the size of the binary encoded Protobuf representation of this message instance."""
+        is_default_by_field = self._betterproto.is_default_by_field
+        lazy_fields = self._lazy_fields
+
+        size = len(self._unknown_fields)
+        for field_name, field_size in self._betterproto.field_sizers.items():
+            if lazy_fields is not None and (lazy_field := self._raw_lazy_field(field_name)) is not None:
+                size += lazy_field.byte_size()
+                continue
+
+            value = getattr(self, field_name)
+
+            if value is None or is_default_by_field[field_name](value):
+                continue
 
-            stream.write(self._unknown_fields)
-            return stream.getvalue()
+            size += field_size(value)
+
+        return size
+
+    # For compatibility with other libraries
+    def ByteSize(self) -> int:
+        """
+        Compute the size of the binary encoded Protobuf representation of this message instance.
+
+        .. note::
+            This is a method for compatibility with other libraries,
+            you should really use :meth:`byte_size`.
+
+        Returns
+        --------
+        :class:`int`
+            The size in bytes of the binary encoded message.
+        """
+        return self.byte_size()
 
     # For compatibility with other libraries
     def SerializeToString(self) -> bytes:
@@ -839,76 +2838,89 @@ class Message(ABC):
         # To support pickling
         return (self.__class__.parse, (bytes(self),))
 
-    @classmethod
-    def _type_hint(cls, field_name: str) -> type:
-        return cls._type_hints()[field_name]
-
     @classmethod
     def _type_hints(cls) -> dict[str, type]:
+        """
+        Evaluate the type hints of the class. This is expensive, the resolved classes of the fields are cached in
+        `cls._betterproto.cls_by_field`.
+        """
         module = sys.modules[cls.__module__]
         return get_type_hints(cls, module.__dict__, {})
 
-    @classmethod
-    def _cls_for(cls, field: dataclasses.Field, index: int = 0) -> type:
-        """Get the message class for a field from the type hints."""
-        field_cls = cls._type_hint(field.name)
-        if hasattr(field_cls, "__args__") and index >= 0 and field_cls.__args__ is not None:
-            field_cls = field_cls.__args__[index]
-        return field_cls
-
     def _get_field_default(self, field_name: str) -> Any:
-        with warnings.catch_warnings():
-            # ignore warnings when initialising deprecated field defaults
-            warnings.filterwarnings("ignore", category=DeprecationWarning)
+        try:
+            return self._betterproto.immutable_defaults[field_name]
+        except KeyError:
             return self._betterproto.default_gen[field_name]()
 
-    def _postprocess_single(self, wire_type: int, meta: FieldMetadata, field_name: str, value: Any) -> Any:
-        """Adjusts values after parsing."""
-        if wire_type == WIRE_VARINT:
-            if meta.proto_type in (TYPE_INT32, TYPE_INT64, TYPE_ENUM):
-                bits = 32 if meta.proto_type == TYPE_INT32 else 64
-                value = value & ((1 << bits) - 1)
-                signbit = 1 << (bits - 1)
-                value = int((value ^ signbit) - signbit)
-
-                if meta.proto_type == TYPE_ENUM:
-                    # Convert enum ints to python enum instances
-                    value = self._betterproto.cls_by_field[field_name](value)
-            elif meta.proto_type in (TYPE_UINT32, TYPE_UINT64):
-                bits = 32 if meta.proto_type == TYPE_UINT32 else 64
-                value = value & ((1 << bits) - 1)
-            elif meta.proto_type in (TYPE_SINT32, TYPE_SINT64):
-                bits = 32 if meta.proto_type == TYPE_SINT32 else 64
-                value = value & ((1 << bits) - 1)
-                value = (value >> 1) ^ (-(value & 1))  # Undo zig-zag encoding
-            elif meta.proto_type == TYPE_BOOL:
-                # Booleans use a varint encoding, so convert it to true/false.
-                value = value > 0
-        elif wire_type in (WIRE_FIXED_32, WIRE_FIXED_64):
-            fmt = _pack_fmt(meta.proto_type)
-            value = struct.unpack(fmt, value)[0]
-        elif wire_type == WIRE_LEN_DELIM:
-            if meta.proto_type == TYPE_STRING:
-                value = str(value, "utf-8")
-            elif meta.proto_type == TYPE_MESSAGE:
-                if meta.unwrap:
-                    msg_cls = meta.unwrap()
-                else:
-                    msg_cls = self._betterproto.cls_by_field[field_name]
+    def _load_buffer(self, buffer: bytes, pos: int, end: int, options: _ParseOptions | None = None) -> None:
+        """
+        Load the binary encoded Protobuf message located between `pos` and `end` in the buffer into this message
+        instance.
+        """
+        skip = False
+        if options is None:
+            decoders = self._betterproto.field_decoders
+        else:
+            decoders = self._betterproto.field_decoders_for(options)
+            skip = options.fields is not None and not options.keep_skipped
 
-                value = msg_cls.parse(value)
+        while pos < end:
+            start = pos
 
-                if meta.unwrap:
-                    value = value.to_wrapped()
-            elif meta.proto_type == TYPE_MAP:
-                value = self._betterproto.cls_by_field[field_name].parse(value)
+            tag = buffer[pos]
+            if tag < 0x80:
+                pos += 1
+            else:
+                tag, pos = decode_varint(buffer, pos)
 
-        return value
+            decode = decoders.get(tag)
+            if decode is not None:
+                pos = decode(self, buffer, pos)
+            elif skip:
+                pos = _skip_field(buffer, pos, tag & 0x7)
+            else:
+                pos = self._load_unknown_field(buffer, start, pos, tag)
+
+        if pos > end:
+            raise _truncated_message_error(pos, end)
+
+        if options is not None and options.repeated_format == RepeatedFormat.NUMPY:
+            _join_array_pieces(self)
+
+        if self._is_pydantic():
+            self._validate()
+
+    def _load_field(self, buffer: bytes, start: int, pos: int, tag: int) -> int:
+        """
+        Load a single field into this message instance, given the position of its start and the position just after
+        its tag. Returns the position of the end of the field.
+
+        This is the fallback used by the code generated with the `specialized_codecs` compiler option for the fields
+        that don't have a specialized decoder.
+        """
+        decode = self._betterproto.field_decoders.get(tag)
+        if decode is None:
+            return self._load_unknown_field(buffer, start, pos, tag)
+
+        return decode(self, buffer, pos)
+
+    def _load_unknown_field(self, buffer: bytes, start: int, pos: int, tag: int) -> int:
+        pos = _skip_field(buffer, pos, tag & 0x7)
+        _set_attribute(self, "_unknown_fields", self._unknown_fields + buffer[start:pos])
+        return pos
 
     def load(
         self: T,
         stream: SupportsRead[bytes],
         size: int | None = None,
+        *,
+        repeated_format: RepeatedFormat = RepeatedFormat.LIST,
+        lazy: bool = False,
+        zero_copy: bool = False,
+        fields: Iterable[str] | None = None,
+        keep_skipped: bool = False,
+        serialization_cache: bool = False,
     ) -> T:
         """
         Load the binary encoded Protobuf from a stream into this message instance. This
@@ -922,6 +2934,24 @@ class Message(ABC):
             The size of the message in the stream.
             Reads stream until EOF if ``None`` is given.
             Reads based on a size delimiter prefix varint if SIZE_DELIMITED is given.
+        repeated_format: :class:`RepeatedFormat`
+            The representation of the repeated numerical fields. Default is :attr:`RepeatedFormat.LIST`.
+        lazy: :class:`bool`
+            If ``True``, the message fields (including the nested ones) are only decoded when they are accessed for
+            the first time. Until then, they are serialized back as they were in the data. Default is ``False``.
+        zero_copy: :class:`bool`
+            If ``True``, the bytes fields (including the nested ones) are :class:`memoryview` slices of the data
+            instead of copies. The data must not be modified while the message is in use. Default is ``False``.
+        fields: :class:`Optional[Iterable[str]]`
+            The fields to decode, given by their name. The fields of nested messages are selected with a dotted path,
+            such as ``"user.name"``. The other fields are skipped without being decoded and keep their default value.
+            All the fields are decoded if ``None`` is given.
+        keep_skipped: :class:`bool`
+            If ``True``, the fields skipped because of ``fields`` are kept as unknown fields, so that they are not lost
+            when the message is serialized again. Default is ``False``.
+        serialization_cache: :class:`bool`
+            If ``True``, the serialization cache of the message is enabled (see :meth:`enable_serialization_cache`),
+            and starts with the parsed data. Default is ``False``.
 
         Returns
         --------
@@ -932,79 +2962,38 @@ class Message(ABC):
         if size == SIZE_DELIMITED:
             size, _ = load_varint(stream)
 
-        # Got some data over the wire
-        proto_meta = self._betterproto
-        read = 0
-        for parsed in load_fields(stream):
-            field_name = proto_meta.field_name_by_number.get(parsed.number)
-            if not field_name:
-                self._unknown_fields += parsed.raw
-                continue
-
-            meta = proto_meta.meta_by_field_name[field_name]
-
-            is_packed_repeated = parsed.wire_type == WIRE_LEN_DELIM and meta.proto_type in PACKED_TYPES
-
-            value: Any
-            if is_packed_repeated:
-                # This is a packed repeated field.
-                pos = 0
-                value = []
-                while pos < len(parsed.value):
-                    if meta.proto_type in (TYPE_FLOAT, TYPE_FIXED32, TYPE_SFIXED32):
-                        decoded, pos = parsed.value[pos : pos + 4], pos + 4
-                        wire_type = WIRE_FIXED_32
-                    elif meta.proto_type in (TYPE_DOUBLE, TYPE_FIXED64, TYPE_SFIXED64):
-                        decoded, pos = parsed.value[pos : pos + 8], pos + 8
-                        wire_type = WIRE_FIXED_64
-                    else:
-                        decoded, pos = decode_varint(parsed.value, pos)
-                        wire_type = WIRE_VARINT
-                    decoded = self._postprocess_single(wire_type, meta, field_name, decoded)
-                    value.append(decoded)
-            else:
-                value = self._postprocess_single(parsed.wire_type, meta, field_name, parsed.value)
-
-            current = getattr(self, field_name)
+        options = _ParseOptions.get(repeated_format, lazy, zero_copy, fields, keep_skipped, type(self))
 
-            if meta.proto_type == TYPE_MAP:
-                # Value represents a single key/value pair entry in the map.
-                current[value.key] = value.value
-            elif meta.repeated:
-                if is_packed_repeated:
-                    current.extend(value)
-                else:
-                    current.append(value)
-            else:
-                setattr(self, field_name, value)
-
-            # If we have now loaded the expected length of the message, stop
-            if size is not None:
-                prev = read
-                read += len(parsed.raw)
-                if read == size:
-                    break
-                elif read > size:
-                    raise ValueError(
-                        f"Expected message of size {size}, can only read "
-                        f"either {prev} or {read} bytes - there is no "
-                        "message of the expected size in the stream."
-                    )
+        if size is None:
+            data = stream.read()
+        else:
+            data = stream.read(size)
 
-        if size is not None and read < size:
-            raise ValueError(
-                f"Expected message of size {size}, but was only able to "
-                f"read {read} bytes - the stream may have ended too soon,"
-                " or the expected size may have been incorrect."
-            )
+            if len(data) < size:
+                raise ValueError(
+                    f"Expected message of size {size}, but was only able to "
+                    f"read {len(data)} bytes - the stream may have ended too soon,"
+                    " or the expected size may have been incorrect."
+                )
 
-        if self._is_pydantic():
-            self._validate()
+        self._load_buffer(data, 0, len(data), options)
 
+        if serialization_cache:
+            self._cache_parsed_data(data, options)
         return self
 
     @classmethod
-    def parse(cls, data: bytes) -> Self:
+    def parse(
+        cls,
+        data: bytes,
+        *,
+        repeated_format: RepeatedFormat = RepeatedFormat.LIST,
+        lazy: bool = False,
+        zero_copy: bool = False,
+        fields: Iterable[str] | None = None,
+        keep_skipped: bool = False,
+        serialization_cache: bool = False,
+    ) -> Self:
         """
         Parse the binary encoded Protobuf into this message instance. This
         returns the instance itself and is therefore assignable and chainable.
@@ -1013,14 +3002,204 @@ class Message(ABC):
         -----------
         data: :class:`bytes`
             The data to parse the message from.
+        repeated_format: :class:`RepeatedFormat`
+            The representation of the repeated numerical fields. Default is :attr:`RepeatedFormat.LIST`.
+        lazy: :class:`bool`
+            If ``True``, the message fields (including the nested ones) are only decoded when they are accessed for
+            the first time. Until then, they are serialized back as they were in the data. Default is ``False``.
+        zero_copy: :class:`bool`
+            If ``True``, the bytes fields (including the nested ones) are :class:`memoryview` slices of the data
+            instead of copies. The data must not be modified while the message is in use. Default is ``False``.
+        fields: :class:`Optional[Iterable[str]]`
+            The fields to decode, given by their name. The fields of nested messages are selected with a dotted path,
+            such as ``"user.name"``. The other fields are skipped without being decoded and keep their default value.
+            All the fields are decoded if ``None`` is given.
+        keep_skipped: :class:`bool`
+            If ``True``, the fields skipped because of ``fields`` are kept as unknown fields, so that they are not lost
+            when the message is serialized again. Default is ``False``.
+        serialization_cache: :class:`bool`
+            If ``True``, the serialization cache of the message is enabled (see :meth:`enable_serialization_cache`),
+            and starts with the parsed data. Default is ``False``.
 
         Returns
         --------
         :class:`Message`
             The initialized message.
         """
-        with BytesIO(data) as stream:
-            return cls().load(stream)
+        if zero_copy:
+            if not isinstance(data, (bytes, bytearray)):
+                data = memoryview(data).cast("B")
+        elif not isinstance(data, bytes):
+            data = bytes(data)
+
+        options = _ParseOptions.get(repeated_format, lazy, zero_copy, fields, keep_skipped, cls)
+        message = cls._construct()
+        message._load_buffer(data, 0, len(data), options)
+
+        if serialization_cache:
+            message._cache_parsed_data(data, options)
+        return message
+
+    @classmethod
+    def iter_delimited(
+        cls,
+        stream: SupportsRead[bytes],
+        *,
+        chunk_size: int = _DELIMITED_CHUNK_SIZE,
+        repeated_format: RepeatedFormat = RepeatedFormat.LIST,
+        lazy: bool = False,
+        zero_copy: bool = False,
+        fields: Iterable[str] | None = None,
+        keep_skipped: bool = False,
+        serialization_cache: bool = False,
+        compression: Compression | None = None,
+    ) -> Iterator[Self]:
+        """
+        Parse the size-delimited messages of a stream, as written by :meth:`write_delimited` or by :meth:`dump` with
+        ``delimit=True``, until the end of the stream. The stream is read in large chunks, which are split into
+        messages in memory.
+
+        Parameters
+        -----------
+        stream: :class:`BinaryIO`
+            The stream to load the messages from.
+        chunk_size: :class:`int`
+            The number of bytes read from the stream at once. Larger messages are read in one piece. Compressed streams
+            are read one block at a time instead.
+        repeated_format, lazy, zero_copy, fields, keep_skipped, serialization_cache:
+            The parsing options, as for :meth:`parse`.
+        compression: Optional[:class:`Compression`]
+            The compression used by :meth:`write_delimited` to write the stream, if any.
+
+        Returns
+        --------
+        Iterator[:class:`Message`]
+            The parsed messages.
+        """
+        options = _ParseOptions.get(repeated_format, lazy, zero_copy, fields, keep_skipped, cls)
+
+        if compression is not None:
+            from .delimited import _read_blocks
+
+            for block in _read_blocks(stream, compression):
+                messages, pos, _ = cls._load_delimited(block, options, serialization_cache)
+                # The blocks only contain complete messages
+                _check_delimited_end(block[pos:])
+                yield from messages
+            return
+
+        data = b""
+        needed = 0
+        while True:
+            # The rest of a message is read before parsing again, instead of adding the data to it read by read
+            chunk = _read_at_least(stream, needed, max(chunk_size, needed))
+            if not chunk:
+                _check_delimited_end(data)
+                return
+
+            data = data + chunk if data else bytes(chunk)
+            messages, pos, needed = cls._load_delimited(data, options, serialization_cache)
+            yield from messages
+            data = data[pos:]
+
+    @classmethod
+    async def iter_delimited_async(
+        cls,
+        reader: StreamReader,
+        *,
+        chunk_size: int = _DELIMITED_CHUNK_SIZE,
+        repeated_format: RepeatedFormat = RepeatedFormat.LIST,
+        lazy: bool = False,
+        zero_copy: bool = False,
+        fields: Iterable[str] | None = None,
+        keep_skipped: bool = False,
+        serialization_cache: bool = False,
+    ) -> AsyncIterator[Self]:
+        """
+        Asynchronous version of :meth:`iter_delimited`, reading from an :class:`asyncio.StreamReader` until the end of
+        the stream. Each read returns the data available in the buffer of the reader, up to ``chunk_size`` bytes. When
+        a message is incomplete, the rest of it is awaited at once.
+
+        Parameters
+        -----------
+        reader: :class:`asyncio.StreamReader`
+            The stream to load the messages from.
+        chunk_size: :class:`int`
+            The maximal number of bytes read from the stream at once.
+        repeated_format, lazy, zero_copy, fields, keep_skipped, serialization_cache:
+            The parsing options, as for :meth:`parse`.
+
+        Returns
+        --------
+        AsyncIterator[:class:`Message`]
+            The parsed messages.
+        """
+        from asyncio import IncompleteReadError
+
+        options = _ParseOptions.get(repeated_format, lazy, zero_copy, fields, keep_skipped, cls)
+
+        data = b""
+        needed = 0
+        while True:
+            if needed:
+                # The rest of a message is read before parsing again, instead of adding the data to it read by read
+                try:
+                    chunk = await reader.readexactly(needed)
+                except IncompleteReadError as error:
+                    chunk = error.partial
+            else:
+                chunk = await reader.read(chunk_size)
+            if not chunk:
+                _check_delimited_end(data)
+                return
+
+            data = data + chunk if data else chunk
+            messages, pos, needed = cls._load_delimited(data, options, serialization_cache)
+            for message in messages:
+                yield message
+            data = data[pos:]
+
+    @classmethod
+    def _load_delimited(
+        cls, data: bytes, options: _ParseOptions | None, serialization_cache: bool
+    ) -> tuple[list[Self], int, int]:
+        """
+        Parse the complete size-delimited messages at the start of the data. Returns the messages, the position of the
+        first incomplete message, and the number of bytes missing to complete it (which is only a lower bound when its
+        size prefix is incomplete).
+        """
+        new_message = cls if _construct_with_init(cls) else cls._construct
+        messages = []
+
+        pos = 0
+        size = len(data)
+        while pos < size:
+            try:
+                length, start = decode_varint(data, pos)
+            except EOFError:
+                return messages, pos, 1
+
+            end = start + length
+            if end > size:
+                return messages, pos, end - size
+
+            message = new_message()
+            message._load_buffer(data, start, end, options)
+            if serialization_cache:
+                message._cache_parsed_data(data[start:end], options)
+            messages.append(message)
+            pos = end
+
+        return messages, pos, 0
+
+    def _cache_parsed_data(self, data: bytes | bytearray | memoryview, options: _ParseOptions | None) -> None:
+        """Enable the serialization cache of this message instance, starting with the data it was parsed from."""
+        cache = self._new_serialized_cache()
+        _set_attribute(self, "_serialized_cache", cache)
+
+        # Without `keep_skipped`, the fields that were skipped are in the data but not in the message anymore
+        if options is None or options.fields is None or options.keep_skipped:
+            cache.update(self, data if type(data) is bytes else bytes(data))
 
     # For compatibility with other libraries.
     @classmethod
@@ -1074,53 +3253,9 @@ class Message(ABC):
         if self._is_pydantic():
             self._validate()
 
-        kwargs = {  # For recursive calls
-            "output_format": output_format,
-            "casing": casing,
-            "include_default_values": include_default_values,
-        }
-
         output: dict[str, Any] = {}
-        field_types = self._type_hints()
-
-        for field_name, meta in self._betterproto.meta_by_field_name.items():
-            value = getattr(self, field_name)
-            cased_name = casing(field_name).rstrip("_")  # type: ignore
-
-            if meta.repeated or meta.optional:
-                field_type = field_types[field_name].__args__[0]
-            else:
-                field_type = field_types[field_name]
-
-            if meta.repeated:
-                output_value = [_value_to_dict(v, meta.proto_type, field_type, meta.unwrap, **kwargs)[0] for v in value]
-                if output_value or include_default_values:
-                    output[cased_name] = output_value
-
-            elif meta.proto_type == TYPE_MAP:
-                assert meta.map_meta is not None
-                field_type_k = field_types[field_name].__args__[0]
-                field_type_v = field_types[field_name].__args__[1]
-                output_map = {
-                    _value_to_dict(k, meta.map_meta[0].proto_type, field_type_k, None, **kwargs)[0]: _value_to_dict(
-                        v, meta.map_meta[1].proto_type, field_type_v, meta.map_meta[1].unwrap, **kwargs
-                    )[0]
-                    for k, v in value.items()
-                }
-
-                if output_map or include_default_values:
-                    output[cased_name] = output_map
-
-            else:
-                if value is None:
-                    output_value, is_default = None, True
-                else:
-                    output_value, is_default = _value_to_dict(value, meta.proto_type, field_type, meta.unwrap, **kwargs)
-                    if meta.optional:
-                        is_default = False
-
-                if include_default_values or not is_default:
-                    output[cased_name] = output_value
+        for step in self._betterproto.to_dict_plan(output_format, casing):
+            step(self, output, include_default_values)
 
         return output
 
@@ -1128,9 +3263,8 @@ class Message(ABC):
     def _from_dict_init(cls, mapping: Mapping[str, Any] | Any, *, ignore_unknown_fields: bool) -> Mapping[str, Any]:
         init_kwargs: dict[str, Any] = {}
         for key, value in mapping.items():
-            field_name = safe_snake_case(key)
-
             try:
+                field_name = cls._betterproto.field_name_for_dict_key(key)
                 field_cls = cls._betterproto.cls_by_field[field_name]
                 meta = cls._betterproto.meta_by_field_name[field_name]
             except KeyError:
@@ -1140,7 +3274,7 @@ class Message(ABC):
                 if ignore_unknown_fields:
                     continue
 
-                raise KeyError(f"Unknown field '{field_name}' in message {cls.__name__}.") from None
+                raise KeyError(f"Unknown field '{safe_snake_case(key)}' in message {cls.__name__}.") from None
 
             if value is None:
                 name, module = field_cls.__name__, field_cls.__module__
@@ -1196,7 +3330,64 @@ class Message(ABC):
         if not isinstance(value, Mapping) and hasattr(cls, "from_wrapped"):  # type: ignore
             return cls.from_wrapped(value)  # type: ignore
 
-        return cls(**cls._from_dict_init(value, ignore_unknown_fields=ignore_unknown_fields))  # type: ignore
+        return cls._construct(cls._from_dict_init(value, ignore_unknown_fields=ignore_unknown_fields))  # type: ignore
+
+    @classmethod
+    def from_tuples(cls, rows: Iterable[Sequence[Any]], fields: Sequence[str] | None = None) -> list[Self]:
+        """
+        Create a message from each row of values. The values are assigned as they are to the fields, without
+        conversion.
+
+        Parameters
+        -----------
+        rows: Iterable[Sequence[Any]]
+            The values of the fields of each message.
+        fields: Optional[Sequence[:class:`str`]]
+            The names of the fields corresponding to the values of each row, in the same order. The other fields have
+            their default value. By default, the rows contain the values of all the fields, in the order they are
+            declared in the class (which is the order of the arguments of the constructor).
+
+        Returns
+        --------
+        List[:class:`Message`]
+            The created messages.
+        """
+        meta = cls._betterproto
+        if fields is None:
+            names = tuple(meta.meta_by_field_name)
+        else:
+            names = tuple(fields)
+            for name in names:
+                if name not in meta.meta_by_field_name:
+                    raise ValueError(f"Unknown field '{name}'")
+
+        messages = []
+        if meta.construct_with_init:
+            for row in rows:
+                if len(row) != len(names):
+                    raise ValueError(f"Expected {len(names)} values, got {len(row)}")
+                messages.append(cls(*row) if fields is None else cls(**dict(zip(names, row))))
+            return messages
+
+        # Same as `_construct`, with the work that doesn't depend on the values done once
+        defaults = meta.default_values
+        mutable_default_gen = [
+            (name, default_gen) for name, default_gen in meta.mutable_default_gen if name not in names
+        ]
+        new = cls.__new__
+        for row in rows:
+            if len(row) != len(names):
+                raise ValueError(f"Expected {len(names)} values, got {len(row)}")
+
+            message = new(cls)
+            values = vars(message)
+            values.update(defaults)
+            for name, default_gen in mutable_default_gen:
+                values[name] = default_gen()
+            values.update(zip(names, row))
+            message.__post_init__()
+            messages.append(message)
+        return messages
 
     def to_json(
         self,
@@ -1271,7 +3462,7 @@ class Message(ABC):
         :class:`bool`
             `True` if field has been set, otherwise `False`.
         """
-        return self.__getattribute__(name) != self._get_field_default(name)
+        return not self._betterproto.is_default_by_field[name](getattr(self, name))
 
     @classmethod
     def _validate_field_groups(cls, values):
@@ -1301,6 +3492,200 @@ class Message(ABC):
 Message.__annotations__ = {}  # HACK to avoid typing.get_type_hints breaking :)
 
 
+def _hashable(value: Any) -> Any:
+    """
+    Returns a hashable form of a field value, whose hash is the same for the values that are equal as fields of a
+    message (see `Message.__eq__`).
+    """
+    if isinstance(value, FrozenMessage):
+        return value
+    if isinstance(value, Message):
+        return type(value), tuple(_hashable(getattr(value, name)) for name in value._betterproto.sorted_field_names)
+    if type(value) is dict:
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+    if type(value) is list or type(value) is tuple:
+        return tuple(_hashable(item) for item in value)
+    if _is_array(value):
+        return tuple(_scalar_values(value))
+    if type(value) is bytearray or type(value) is memoryview:
+        return bytes(value)
+    if type(value) is float and math.isnan(value):
+        # NaN values are equal as fields of a message, but the hash of each NaN value is different
+        return "nan"
+    return value
+
+
+class FrozenMessage(Message):
+    """
+    The base class of the messages generated with the `frozen_dataclasses` compiler option. Their fields can't be
+    reassigned, their repeated fields are tuples, and they can be used as dictionary keys or in sets.
+
+    Frozen messages are compared by their field values, like other messages. Their hash and their binary encoded form
+    are computed once and then kept for the whole lifetime of the message. The maps and the instances of non-frozen
+    message classes they contain must therefore not be modified.
+    """
+
+    __slots__ = ()
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._freeze_repeated_fields()
+
+    def __getattr__(self, name: str) -> Any:
+        value = super().__getattr__(name)
+        if type(value) is list:
+            # A repeated field decoded lazily
+            value = tuple(value)
+            _set_attribute(self, name, value)
+        return value
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        cache = self._serialized_cache
+        if cache is None:
+            cache = _FrozenSerializedCache()
+            _set_attribute(self, "_serialized_cache", cache)
+        assert isinstance(cache, _FrozenSerializedCache)
+
+        if cache.hash is None:
+            cache.hash = hash(tuple(_hashable(getattr(self, name)) for name in self._betterproto.sorted_field_names))
+        return cache.hash
+
+    def __bytes__(self) -> bytes:
+        if self._serialized_cache is None:
+            _set_attribute(self, "_serialized_cache", _FrozenSerializedCache())
+        return super().__bytes__()
+
+    def byte_size(self) -> int:
+        if self._serialized_cache is None:
+            _set_attribute(self, "_serialized_cache", _FrozenSerializedCache())
+        return super().byte_size()
+
+    def _new_serialized_cache(self) -> _SerializedCache:
+        return _FrozenSerializedCache()
+
+    def _freeze_repeated_fields(self) -> None:
+        for name in self._betterproto.repeated_field_names:
+            # The fields that were not decoded yet (see the `lazy` option of `parse`) are converted by `__getattr__`
+            if self._raw_lazy_field(name) is None and type(value := getattr(self, name)) is list:
+                _set_attribute(self, name, tuple(value))
+
+    def load(self, *args: Any, **kwargs: Any) -> Self:
+        raise dataclasses.FrozenInstanceError(
+            f"cannot load data into a frozen message, use {type(self).__name__}.parse instead"
+        )
+
+    def _load_buffer(self, buffer: bytes, pos: int, end: int, options: _ParseOptions | None = None) -> None:
+        # Only new messages are loaded. The values of the repeated fields are appended to lists while decoding, and
+        # converted to tuples at the end.
+        for name in self._betterproto.repeated_field_names:
+            if self._raw_lazy_field(name) is None and type(value := getattr(self, name)) is tuple:
+                _set_attribute(self, name, list(value))
+
+        super()._load_buffer(buffer, pos, end, options)
+        self._freeze_repeated_fields()
+
+
+class PresenceTrackingMessage(Message):
+    """
+    The base class of the messages generated with the `presence_tracking` compiler option. They keep a bitmap of the
+    fields that were assigned or decoded, so that checking if a message has non-default values, printing it and
+    encoding it only look at these fields (and at the repeated fields and maps, which can be modified in place)
+    instead of all the fields. This is faster for messages with many fields of which only a few are set, but makes
+    assigning a field slower.
+
+    The bit of a field stays set when its default value is assigned back, until the message is parsed again: such a
+    field is still checked, and skipped because its value is the default one.
+    """
+
+    __slots__ = ("_presence",)
+
+    # Bitmap of the fields that may have a non-default value, see `ProtoClassMetadata.presence_bit_by_field`. It is
+    # `None` while `__init__` assigns the fields, until `__post_init__` computes it.
+    _presence: int | None
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Self:
+        message = super().__new__(cls)
+        _set_attribute(message, "_presence", None)
+        return message
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+
+        presence = 0
+        bit_by_field = self._betterproto.presence_bit_by_field
+        for name, is_default in self._betterproto.is_default_by_field.items():
+            if not is_default(getattr(self, name)):
+                presence |= bit_by_field[name]
+        _set_attribute(self, "_presence", presence)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        _set_attribute(self, name, value)
+
+        presence = self._presence
+        if presence is None:
+            # Called by `__init__`
+            return
+
+        bit = self._betterproto_meta.presence_bit_by_field.get(name)
+        if bit is not None:
+            _set_attribute(self, "_presence", presence | bit)
+
+    def _set_fields(self) -> Iterable[tuple[str, Any, Callable[[bytearray, Any], None], Callable[[Any], int]]]:
+        """
+        Yields the name, the value, the encoder and the sizer of the fields with a non-default value, in the order of
+        the fields.
+        """
+        meta = self._betterproto
+        fields = meta.presence_fields
+        bits = self._presence | meta.container_presence  # type: ignore
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            name, encode, size, is_default = fields[low.bit_length() - 1]
+            value = getattr(self, name)
+            if value is not None and not is_default(value):
+                yield name, value, encode, size
+
+    def __repr__(self) -> str:
+        values = {name: value for name, value, _, _ in self._set_fields()}
+        parts = [f"{name}={values[name]!r}" for name in self._betterproto.sorted_field_names if name in values]
+        return f"{self.__class__.__name__}({', '.join(parts)})"
+
+    def __bool__(self) -> bool:
+        if not self._presence | self._betterproto.container_presence:  # type: ignore
+            return False
+        return any(True for _ in self._set_fields())
+
+    def is_set(self, name: str) -> bool:
+        meta = self._betterproto
+        if not (self._presence | meta.container_presence) & meta.presence_bit_by_field[name]:  # type: ignore
+            return False
+        return super().is_set(name)
+
+    def _encode_into(self, buf: bytearray) -> None:
+        if self._lazy_fields is not None:
+            # The fields that were not decoded yet are only supported by the generic encoding code
+            return super()._encode_into(buf)
+
+        if self._is_pydantic():
+            self._validate()
+
+        for _, value, encode, _ in self._set_fields():
+            encode(buf, value)
+        buf += self._unknown_fields
+
+    def _byte_size(self) -> int:
+        if self._lazy_fields is not None:
+            return super()._byte_size()
+
+        return len(self._unknown_fields) + sum(size(value) for _, value, _, size in self._set_fields())
+
+
 def which_one_of(message: Message, group_name: str) -> tuple[str, Any | None]:
     """
     Return the name and value of a message's one-of field group.
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+__all__ = ["DelimitedFile", "read_block_index"]
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Generic, overload
+
+from . import Compression, RepeatedFormat, _construct_with_init, _ParseOptions, _read_at_least, decode_varint
+from ._types import T
+
+if TYPE_CHECKING:
+    from _typeshed import StrPath, SupportsRead, SupportsWrite
+
+# Header of the blocks of compressed messages, giving the size of the compressed data and the number of messages
+_BLOCK_HEADER = struct.Struct("<II")
+
+_MAX_BLOCK_SIZE = 0xFFFFFFFF
+
+
+class DelimitedFile(Generic[T]):
+    """
+    Random access to the size-delimited messages of a file, as written by :meth:`Message.write_delimited` or by
+    :meth:`Message.dump` with ``delimit=True``.
+
+    The file is memory-mapped, and the offset of each message is found once by reading the size prefixes. The messages
+    are then decoded from the mapped memory when they are accessed, without reading the rest of the file.
+
+    The offsets can be persisted to an index file, so that they don't need to be found again when the file is opened
+    later. The data file is assumed to be append-only: when it has grown since the index file was written, only the
+    new messages are indexed. The index file also keeps a checksum of the first and the last indexed messages, and
+    is ignored if they were modified.
+
+    .. code-block:: python
+
+        with DelimitedFile("capture.bin", Event, index_path="capture.idx") as events:
+            print(len(events))
+            last = events[-1]
+            for event in events.iter_range(1000, 2000):
+                ...
+
+    Parameters
+    -----------
+    path: :class:`str` | :class:`os.PathLike`
+        The path of the file of messages.
+    message_type: type[:class:`Message`]
+        The type of the messages.
+    index_path: Optional[:class:`str` | :class:`os.PathLike`]
+        The path of the index file, created or updated if needed. The offsets are not persisted if ``None`` is given.
+    repeated_format, lazy, zero_copy, fields, keep_skipped, serialization_cache:
+        The parsing options, as for :meth:`Message.parse`.
+    """
+
+    def __init__(
+        self,
+        path: StrPath,
+        message_type: type[T],
+        *,
+        index_path: StrPath | None = None,
+        repeated_format: RepeatedFormat = RepeatedFormat.LIST,
+        lazy: bool = False,
+        zero_copy: bool = False,
+        fields: Iterable[str] | None = None,
+        keep_skipped: bool = False,
+        serialization_cache: bool = False,
+    ) -> None:
+        self.message_type = message_type
+        self._options = _ParseOptions.get(repeated_format, lazy, zero_copy, fields, keep_skipped, message_type)
+        self._serialization_cache = serialization_cache
+        self._new_message = message_type if _construct_with_init(message_type) else message_type._construct
+
+        with open(path, "rb") as f:
+            self._size = os.fstat(f.fileno()).st_size
+            # Empty files can't be mapped
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+
+        self._offsets = array("Q")
+        indexed_size = 0
+        if index_path is not None:
+            indexed_size = self._load_index(index_path)
+
+        if indexed_size < self._size:
+            try:
+                self._index_messages(indexed_size)
+            except BaseException:
+                self.close()
+                raise
+
+            if index_path is not None:
+                self._save_index(index_path)
+
+    def _load_index(self, index_path: StrPath) -> int:
+        """Load the offsets of the index file if it is usable. Returns the size of the data that it covers."""
+        try:
+            with open(index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+
+        # The index file contains the size of the data that was indexed and the checksum of its first and last
+        # messages, followed by the offsets of the messages
+        values = array("Q")
+        values.frombytes(data[: len(data) - len(data) % values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        if len(values) < 2 or values[0] > self._size:
+            return 0
+
+        offsets = values[2:]
+        if self._checksum(offsets, values[0]) != values[1]:
+            return 0
+
+        self._offsets = offsets
+        return values[0]
+
+    def _checksum(self, offsets: array[int], size: int) -> int | None:
+        """
+        Returns the checksum of the first and the last messages, given the offsets of the messages and the size of
+        the data that contains them, or `None` if the offsets are not valid.
+        """
+        if not offsets:
+            return 0 if size == 0 else None
+        if offsets[-1] >= size:
+            return None
+
+        assert self._mmap is not None
+        first_end = offsets[1] if len(offsets) > 1 else size
+        with memoryview(self._mmap) as data:
+            first = zlib.crc32(data[offsets[0] : first_end])
+            last = zlib.crc32(data[offsets[-1] : size])
+        return first << 32 | last
+
+    def _save_index(self, index_path: StrPath) -> None:
+        values = array("Q", [self._size, self._checksum(self._offsets, self._size) or 0])
+        values.extend(self._offsets)
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        # Write a new file then replace the old one, so that the index file is never left incomplete
+        tmp_path = f"{os.fspath(index_path)}.tmp"
+        with open(tmp_path, "wb") as f:
+            values.tofile(f)
+        os.replace(tmp_path, index_path)
+
+    def _index_messages(self, pos: int) -> None:
+        """Find the offsets of the messages starting from the given position."""
+        buffer = self._mmap
+        assert buffer is not None
+
+        size = self._size
+        offsets = self._offsets
+        while pos < size:
+            offsets.append(pos)
+            length, start = decode_varint(buffer, pos)
+            pos = start + length
+
+            if pos > size:
+                raise ValueError(
+                    f"Expected message of size {length}, but was only able to read {size - start} bytes - the file"
+                    " may have been truncated."
+                )
+
+    def _load(self, offset: int) -> T:
+        buffer = self._mmap
+        assert buffer is not None
+
+        length, start = decode_varint(buffer, offset)
+        # Copying the message from the mapped memory allows closing the file while the messages are still in use
+        data = buffer[start : start + length]
+
+        message = self._new_message()
+        message._load_buffer(data, 0, length, self._options)
+        if self._serialization_cache:
+            message._cache_parsed_data(data, self._options)
+        return message
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self._load(offset) for offset in self._offsets[index]]
+        return self._load(self._offsets[index])
+
+    def __iter__(self) -> Iterator[T]:
+        return self.iter_range(0)
+
+    def iter_range(self, start: int, stop: int | None = None) -> Iterator[T]:
+        """
+        Iterate over the messages from index ``start`` (included) to index ``stop`` (excluded, or until the end of the
+        file if ``None`` is given). Negative indices count from the end of the file.
+        """
+        for index in range(*slice(start, stop).indices(len(self))):
+            yield self._load(self._offsets[index])
+
+    def offset(self, index: int) -> int:
+        """Returns the position in the file of the message at the given index (including its size prefix)."""
+        return self._offsets[index]
+
+    def close(self) -> None:
+        """Unmap the file. The messages that were already decoded can still be used."""
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> DelimitedFile[T]:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def _get_codec(
+    compression: Compression,
+) -> tuple[Callable[[bytes | bytearray], bytes], Callable[[bytes], bytes]]:
+    """Returns the functions compressing and decompressing the blocks of delimited messages."""
+    if compression == Compression.ZLIB:
+        return zlib.compress, zlib.decompress
+
+    if compression == Compression.GZIP:
+        import gzip
+
+        return gzip.compress, gzip.decompress
+
+    if compression == Compression.ZSTD:
+        try:
+            import zstandard  # type: ignore
+        except ImportError:
+            raise ImportError(
+                "The zstandard package is required for the Zstandard compression (pip install zstandard)"
+            ) from None
+
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _write_blocks(
+    stream: SupportsWrite[bytes | bytearray], chunks: Iterable[tuple[bytes | bytearray, int]], compression: Compression
+) -> None:
+    """Writes chunks of delimited messages as compressed blocks, given with their number of messages."""
+    compress, _ = _get_codec(compression)
+
+    for chunk, count in chunks:
+        data = compress(chunk)
+        if len(data) > _MAX_BLOCK_SIZE:
+            raise ValueError(
+                f"The compressed block of size {len(data)} is larger than the maximal size of a block (4 GiB) - use a"
+                " smaller chunk_size."
+            )
+        stream.write(_BLOCK_HEADER.pack(len(data), count) + data)
+
+
+def _read_block(stream: SupportsRead[bytes], size: int) -> bytes:
+    data = _read_at_least(stream, size, size)
+    if len(data) < size:
+        raise ValueError(
+            f"Expected block of size {size}, but was only able to read {len(data)} bytes - the stream may have ended"
+            " too soon."
+        )
+    return data
+
+
+def _read_blocks(stream: SupportsRead[bytes], compression: Compression) -> Iterator[bytes]:
+    """Reads the compressed blocks of delimited messages of a stream, and yields them decompressed."""
+    _, decompress = _get_codec(compression)
+
+    while header := stream.read(_BLOCK_HEADER.size):
+        if len(header) < _BLOCK_HEADER.size:
+            header += _read_block(stream, _BLOCK_HEADER.size - len(header))
+
+        size, _ = _BLOCK_HEADER.unpack(header)
+        yield decompress(_read_block(stream, size))
+
+
+def read_block_index(stream: SupportsRead[bytes]) -> list[tuple[int, int]]:
+    """
+    Find the blocks of a stream of delimited messages written by :meth:`Message.write_delimited` with compression,
+    by reading their headers without decompressing them. The stream must be seekable, and is read from its current
+    position.
+
+    The stream can then be read from the start of any block with :meth:`Message.iter_delimited`:
+
+    .. code-block:: python
+
+        index = read_block_index(f)
+        block = bisect.bisect_right(index, n, key=lambda item: item[1]) - 1
+        position, first_message = index[block]
+
+        f.seek(position)
+        messages = Event.iter_delimited(f, compression=Compression.ZSTD)
+        message = next(itertools.islice(messages, n - first_message, None))
+
+    Parameters
+    -----------
+    stream: :class:`BinaryIO`
+        The stream of compressed messages.
+
+    Returns
+    --------
+    List[Tuple[:class:`int`, :class:`int`]]
+        The position of each block in the stream, and the number of messages before it.
+    """
+    index = []
+    count = 0
+    position = stream.tell()  # type: ignore
+
+    while header := stream.read(_BLOCK_HEADER.size):
+        if len(header) < _BLOCK_HEADER.size:
+            raise ValueError("The stream ended unexpectedly while reading a block header.")
+
+        size, block_count = _BLOCK_HEADER.unpack(header)
+        index.append((position, count))
+
+        count += block_count
+        position = stream.seek(size, os.SEEK_CUR)  # type: ignore
+
+    return index
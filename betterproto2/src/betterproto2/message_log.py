@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+__all__ = ["MessageLog"]
+
+import os
+from collections.abc import Iterable, Iterator
+from typing import IO, TYPE_CHECKING, Any, Generic
+
+from . import (
+    TYPE_BOOL,
+    TYPE_BYTES,
+    TYPE_DOUBLE,
+    TYPE_ENUM,
+    TYPE_FLOAT,
+    TYPE_MAP,
+    TYPE_MESSAGE,
+    TYPE_STRING,
+    decode_varint,
+    encode_varint,
+)
+from ._types import T
+
+if TYPE_CHECKING:
+    from _typeshed import StrPath
+
+
+_SEGMENT_SUFFIX = ".log"
+_INDEX_SUFFIX = ".idx"
+
+# Size of the varint prefix read before the message itself, which is enough for any message size
+_MAX_PREFIX_SIZE = 10
+
+
+class MessageLog(Generic[T]):
+    """
+    Append-only storage of messages identified by a key field, where the last message appended with a key replaces
+    the previous ones.
+
+    The messages are written to segment files, delimited as with :meth:`Message.dump` with ``delimit=True``. Each
+    segment has a sidecar index file listing the key and the position of each message, so that opening the log only
+    reads the index files. Saving a modified message only appends it, and the old versions are removed by
+    :meth:`compact`.
+
+    The files are synchronized to the disk (with ``fsync``) every ``sync_every`` messages, when :meth:`sync` is called,
+    and when the log is closed. The messages appended since the last synchronization can be lost if the system crashes.
+
+    .. code-block:: python
+
+        with MessageLog("cache", User, key="id") as users:
+            users.append(User(id=1, name="alice"))
+            users.append(User(id=1, name="bob"))
+            assert users[1].name == "bob"
+
+    Parameters
+    -----------
+    directory: :class:`str` | :class:`os.PathLike`
+        The directory containing the files of the log, created if needed.
+    message_type: type[:class:`Message`]
+        The type of the messages.
+    key: :class:`str`
+        The name of the field identifying the messages. It must be a string, bytes, integer, boolean or enum field.
+    segment_size: :class:`int`
+        The size from which a new segment file is started.
+    sync_every: :class:`int`
+        The number of messages appended between two synchronizations of the files to the disk.
+    """
+
+    def __init__(
+        self,
+        directory: StrPath,
+        message_type: type[T],
+        key: str,
+        *,
+        segment_size: int = 64 * 1024 * 1024,
+        sync_every: int = 1000,
+    ) -> None:
+        meta = message_type._betterproto.meta_by_field_name.get(key)
+        if meta is None:
+            raise ValueError(f"Unknown field '{key}'")
+        if meta.repeated or meta.proto_type in (TYPE_MESSAGE, TYPE_MAP, TYPE_FLOAT, TYPE_DOUBLE):
+            raise ValueError(f"The field '{key}' can't be used as a key")
+
+        self.directory = os.fspath(directory)
+        self.message_type = message_type
+        self.key = key
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+
+        self._key_type = meta.proto_type
+        self._key_cls = message_type._betterproto.cls_by_field[key]
+        # Position of the last message of each key, given by the segment number and the offset in the segment
+        self._positions: dict[Any, tuple[int, int]] = {}
+        self._readers: dict[int, IO[bytes]] = {}
+        # Index entries of the messages appended since the last synchronization
+        self._pending_index = bytearray()
+        self._unsynced = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._segments()
+        for segment in segments:
+            self._load_index(segment)
+
+        self._segment = segments[-1] if segments else 0
+        self._open_segment()
+
+    def _segments(self) -> list[int]:
+        """Returns the numbers of the segment files, in order."""
+        # Other files can be in the directory
+        stems = (name[: -len(_SEGMENT_SUFFIX)] for name in os.listdir(self.directory) if name.endswith(_SEGMENT_SUFFIX))
+        return sorted(int(stem) for stem in stems if stem.isdigit())
+
+    def _path(self, segment: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{segment:08d}{suffix}")
+
+    def _load_index(self, segment: int) -> None:
+        index_path = self._path(segment, _INDEX_SUFFIX)
+        try:
+            with open(index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Each entry of the index is the offset of a message, followed by the length of its key and the key. The last
+        # entry can be incomplete if the log was not closed properly.
+        pos = 0
+        while pos < len(data):
+            try:
+                offset, key_pos = decode_varint(data, pos)
+                length, key_pos = decode_varint(data, key_pos)
+            except EOFError:
+                break
+
+            end = key_pos + length
+            if end > len(data):
+                break
+
+            self._positions[self._decode_key(data[key_pos:end])] = (segment, offset)
+            pos = end
+
+        if pos < len(data):
+            # Remove the incomplete entry, otherwise the next entries would be appended after it and read as part of it
+            with open(index_path, "r+b") as f:
+                f.truncate(pos)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _encode_key(self, value: Any) -> bytes:
+        if value is None:
+            raise ValueError(f"The messages must have a value for the field '{self.key}'")
+        if self._key_type == TYPE_BYTES:
+            return bytes(value)
+        if self._key_type == TYPE_STRING:
+            return value.encode("utf-8")
+        return str(int(value)).encode()
+
+    def _decode_key(self, data: bytes) -> Any:
+        if self._key_type == TYPE_BYTES:
+            return data
+        if self._key_type == TYPE_STRING:
+            return data.decode("utf-8")
+        if self._key_type == TYPE_BOOL:
+            return bool(int(data))
+        if self._key_type == TYPE_ENUM:
+            return self._key_cls(int(data))
+        return int(data)
+
+    def _open_segment(self) -> None:
+        self._file = open(self._path(self._segment, _SEGMENT_SUFFIX), "ab")
+        self._index_file = open(self._path(self._segment, _INDEX_SUFFIX), "ab")
+
+    def _close_segment(self) -> None:
+        self.sync()
+        self._file.close()
+        self._index_file.close()
+
+    def append(self, message: T) -> None:
+        """Append a message to the log, replacing the previous message with the same key."""
+        key = getattr(message, self.key)
+        encoded_key = self._encode_key(key)
+
+        offset = self._file.tell()
+        message.dump(self._file, delimit=True)
+        self._appended(key, encoded_key, offset)
+
+    def _appended(self, key: Any, encoded_key: bytes, offset: int) -> None:
+        """Index the message that was just written at the given offset of the current segment."""
+        self._pending_index += encode_varint(offset)
+        self._pending_index += encode_varint(len(encoded_key))
+        self._pending_index += encoded_key
+        self._positions[key] = (self._segment, offset)
+
+        self._unsynced += 1
+        if self._file.tell() >= self.segment_size:
+            self._close_segment()
+            self._segment += 1
+            self._open_segment()
+        elif self._unsynced >= self.sync_every:
+            self.sync()
+
+    def extend(self, messages: Iterable[T]) -> None:
+        """Append several messages to the log."""
+        for message in messages:
+            self.append(message)
+
+    def sync(self) -> None:
+        """Write the messages appended to the log to the disk."""
+        # The messages are on the disk before their index entries are written, so that the index never refers to
+        # missing data
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._index_file.write(self._pending_index)
+        self._index_file.flush()
+        os.fsync(self._index_file.fileno())
+
+        self._pending_index = bytearray()
+        self._unsynced = 0
+
+    def _read_frame(self, segment: int, offset: int) -> bytes:
+        """Returns the message at the given position, with its size prefix."""
+        if segment == self._segment:
+            self._file.flush()
+
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = self._readers[segment] = open(self._path(segment, _SEGMENT_SUFFIX), "rb")
+
+        reader.seek(offset)
+        data = reader.read(_MAX_PREFIX_SIZE)
+        length, start = decode_varint(data, 0)
+        if len(data) < start + length:
+            data += reader.read(start + length - len(data))
+        return data[: start + length]
+
+    def _read(self, segment: int, offset: int) -> T:
+        data = self._read_frame(segment, offset)
+        _, start = decode_varint(data, 0)
+        return self.message_type.parse(data[start:])
+
+    def get(self, key: Any, default: T | None = None) -> T | None:
+        """Returns the last message appended with the given key, or ``default`` if there is none."""
+        position = self._positions.get(key)
+        if position is None:
+            return default
+        return self._read(*position)
+
+    def __getitem__(self, key: Any) -> T:
+        return self._read(*self._positions[key])
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._positions)
+
+    def keys(self) -> Iterable[Any]:
+        """Returns the keys of the messages."""
+        return self._positions.keys()
+
+    def values(self) -> Iterator[T]:
+        """Iterate over the last message of each key, in the order of the files."""
+        for segment, offset in sorted(self._positions.values()):
+            yield self._read(segment, offset)
+
+    def compact(self) -> None:
+        """
+        Rewrite the log with only the last message of each key, and delete the previous segments.
+
+        The messages are copied to new segments before the previous ones are deleted, so the log stays valid if this
+        is interrupted.
+        """
+        self._close_segment()
+        old_segments = self._segments()
+
+        # The messages are copied without being decoded
+        positions = sorted(self._positions.items(), key=lambda item: item[1])
+        self._segment += 1
+        self._open_segment()
+        for key, (segment, offset) in positions:
+            frame = self._read_frame(segment, offset)
+            new_offset = self._file.tell()
+            self._file.write(frame)
+            self._appended(key, self._encode_key(key), new_offset)
+        self.sync()
+
+        for segment in old_segments:
+            reader = self._readers.pop(segment, None)
+            if reader is not None:
+                reader.close()
+            os.remove(self._path(segment, _SEGMENT_SUFFIX))
+            os.remove(self._path(segment, _INDEX_SUFFIX))
+
+    def close(self) -> None:
+        """Write the messages to the disk and close the files."""
+        self._close_segment()
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    def __enter__(self) -> MessageLog[T]:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,74 @@
+import copy
+
+import pytest
+
+from tests.outputs.conformance.protobuf_test_messages.proto3 import (
+    TestAllTypesProto3,
+    TestAllTypesProto3NestedMessage,
+)
+from tests.outputs.nested.nested import Sibling, Test, TestMsg, TestNested
+from tests.outputs.nested_specialized_slots.nested import Sibling as SlotsSibling, Test as SlotsTest
+from tests.outputs.repeated_frozen.repeated import Test as FrozenRepeatedTest
+
+
+def test_messages_are_constructed_without_init():
+    assert not TestAllTypesProto3._betterproto.construct_with_init
+    assert not Test._betterproto.construct_with_init
+    assert SlotsTest._betterproto.construct_with_init
+
+    assert Test._construct({"msg": TestMsg.THIS}) == Test(msg=TestMsg.THIS)
+
+    message = TestAllTypesProto3._construct()
+    assert message == TestAllTypesProto3()
+    assert message.repeated_int32 == []
+    assert message.repeated_int32 is not TestAllTypesProto3._construct().repeated_int32
+    assert not message.optional_nested_message
+
+    message = TestAllTypesProto3._construct({"optional_int32": 3, "repeated_string": ["a"]})
+    assert message == TestAllTypesProto3(optional_int32=3, repeated_string=["a"])
+
+
+def test_parse_copy_and_from_dict():
+    message = TestAllTypesProto3(
+        optional_int32=1,
+        optional_nested_message=TestAllTypesProto3NestedMessage(a=2),
+        recursive_message=TestAllTypesProto3(optional_string="inner"),
+        repeated_int64=[3, 4],
+    )
+
+    assert TestAllTypesProto3.parse(bytes(message)) == message
+    assert TestAllTypesProto3.from_dict(message.to_dict()) == message
+    assert copy.copy(message) == message
+    assert copy.deepcopy(message) == message
+    assert copy.deepcopy(message).repeated_int64 is not message.repeated_int64
+
+
+def test_from_tuples():
+    messages = Test.from_tuples([(TestNested(count=1), Sibling(foo=2), None, TestMsg.THIS)])
+    assert messages == [Test(nested=TestNested(count=1), sibling=Sibling(foo=2), msg=TestMsg.THIS)]
+
+    messages = TestAllTypesProto3.from_tuples([(1, "a"), (2, "b")], fields=("optional_int32", "optional_string"))
+    assert messages == [
+        TestAllTypesProto3(optional_int32=1, optional_string="a"),
+        TestAllTypesProto3(optional_int32=2, optional_string="b"),
+    ]
+    assert messages[0].repeated_int32 is not messages[1].repeated_int32
+
+    messages = SlotsTest.from_tuples([(None, SlotsSibling(foo=2), None, TestMsg.THIS)])
+    assert messages == [SlotsTest(sibling=SlotsSibling(foo=2), msg=TestMsg.THIS)]
+    assert SlotsTest.from_tuples([(SlotsSibling(foo=3),)], fields=["sibling"]) == [
+        SlotsTest(sibling=SlotsSibling(foo=3))
+    ]
+
+    assert FrozenRepeatedTest.from_tuples([(["a", "b"],)]) == [FrozenRepeatedTest(names=("a", "b"))]
+
+
+def test_from_tuples_errors():
+    with pytest.raises(ValueError, match="Unknown field 'unknown'"):
+        Test.from_tuples([], fields=["unknown"])
+
+    with pytest.raises(ValueError, match="Expected 2 values, got 1"):
+        TestAllTypesProto3.from_tuples([(1,)], fields=["optional_int32", "optional_string"])
+
+    with pytest.raises(ValueError, match="Expected 1 values, got 2"):
+        Test.from_tuples([(1, 2)], fields=["msg"])
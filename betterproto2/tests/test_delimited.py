@@ -0,0 +1,190 @@
+import bisect
+import itertools
+from io import BytesIO
+
+import pytest
+
+import betterproto2.delimited
+from betterproto2 import Compression
+from betterproto2.delimited import DelimitedFile, read_block_index
+from tests.outputs.repeated.repeated import Test
+
+messages = [Test(names=[str(index)] * (index % 50)) for index in range(500)]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "messages.bin"
+    with open(path, "wb") as f:
+        Test.write_delimited(f, messages)
+    return path
+
+
+def test_random_access(path):
+    with DelimitedFile(path, Test) as file:
+        assert len(file) == 500
+        assert file[0] == messages[0]
+        assert file[123] == messages[123]
+        assert file[-1] == messages[-1]
+        assert file[10:20] == messages[10:20]
+        assert file[::100] == messages[::100]
+        assert list(file.iter_range(490)) == messages[490:]
+        assert list(file.iter_range(-3, -1)) == messages[-3:-1]
+        assert list(file) == messages
+
+        with pytest.raises(IndexError):
+            file[500]
+
+        message = file[7]
+
+    assert message == messages[7]
+
+
+def test_offsets(path):
+    data = path.read_bytes()
+
+    with DelimitedFile(path, Test) as file:
+        assert file.offset(0) == 0
+        assert data[file.offset(1) :].startswith(bytes([len(bytes(messages[1]))]) + bytes(messages[1]))
+
+
+def test_persisted_index(path, tmp_path):
+    index_path = tmp_path / "messages.idx"
+
+    with DelimitedFile(path, Test, index_path=index_path) as file:
+        offsets = [file.offset(index) for index in range(len(file))]
+    assert index_path.exists()
+
+    # The offsets are read from the index
+    with DelimitedFile(path, Test, index_path=index_path) as file:
+        file._index_messages = None  # type: ignore
+        assert [file.offset(index) for index in range(len(file))] == offsets
+        assert file[-1] == messages[-1]
+
+    # Only the new messages are indexed
+    with open(path, "ab") as f:
+        Test.write_delimited(f, [Test(names=["new"])])
+
+    with DelimitedFile(path, Test, index_path=index_path) as file:
+        assert len(file) == 501
+        assert file[-1] == Test(names=["new"])
+
+    with DelimitedFile(path, Test) as file:
+        assert len(file) == 501
+
+
+def delimited(message: Test) -> bytes:
+    stream = BytesIO()
+    message.dump(stream, delimit=True)
+    return stream.getvalue()
+
+
+def test_modified_file_is_indexed_again(path, tmp_path):
+    index_path = tmp_path / "messages.idx"
+    with DelimitedFile(path, Test, index_path=index_path) as file:
+        offset = file.offset(-2)
+
+    # The last two messages are replaced by a single one, the size of the file being the same
+    data = path.read_bytes()
+    replacement = next(
+        message
+        for length in range(len(data) - offset)
+        if len(delimited(message := Test(names=["x" * length]))) == len(data) - offset
+    )
+    path.write_bytes(data[:offset] + delimited(replacement))
+
+    with DelimitedFile(path, Test, index_path=index_path) as file:
+        assert len(file) == 499
+        assert file[-1] == replacement
+
+
+def test_parse_options(path):
+    with DelimitedFile(path, Test, serialization_cache=True) as file:
+        message = file[3]
+        assert bytes(message) is bytes(message)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    with DelimitedFile(path, Test, index_path=tmp_path / "empty.idx") as file:
+        assert len(file) == 0
+        assert list(file) == []
+
+
+def test_truncated_file(path):
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError, match="Expected message of size"):
+        DelimitedFile(path, Test)
+
+
+@pytest.mark.parametrize("compression", list(Compression))
+def test_compressed_stream(compression):
+    if compression == Compression.ZSTD:
+        pytest.importorskip("zstandard")
+
+    stream = BytesIO()
+    Test.write_delimited(stream, messages, chunk_size=1000, compression=compression)
+
+    uncompressed = BytesIO()
+    Test.write_delimited(uncompressed, messages)
+    assert len(stream.getvalue()) < len(uncompressed.getvalue()) / 2
+
+    stream.seek(0)
+    assert list(Test.iter_delimited(stream, compression=compression)) == messages
+
+
+def test_compressed_stream_seek():
+    stream = BytesIO()
+    Test.write_delimited(stream, messages, chunk_size=1000, compression=Compression.ZLIB)
+
+    stream.seek(0)
+    index = read_block_index(stream)
+    assert len(index) > 10
+    assert index[0] == (0, 0)
+
+    # Jump to the block containing the message 321
+    position, first_message = index[bisect.bisect_right(index, 321, key=lambda item: item[1]) - 1]
+    assert first_message <= 321
+
+    stream.seek(position)
+    parsed = Test.iter_delimited(stream, compression=Compression.ZLIB)
+    assert next(itertools.islice(parsed, 321 - first_message, None)) == messages[321]
+    assert list(parsed) == messages[322:]
+
+
+def test_compressed_stream_errors():
+    stream = BytesIO()
+    Test.write_delimited(stream, messages, compression=Compression.ZLIB)
+
+    with pytest.raises(ValueError, match="Expected block of size"):
+        list(Test.iter_delimited(BytesIO(stream.getvalue()[:-1]), compression=Compression.ZLIB))
+
+    with pytest.raises(ValueError, match="Unknown compression 'lzma'"):
+        Test.write_delimited(BytesIO(), messages, compression="lzma")  # type: ignore
+
+
+class _LargeBlock(bytes):
+    def __len__(self) -> int:
+        return 1 << 32
+
+
+def test_compressed_block_too_large(monkeypatch):
+    monkeypatch.setattr(betterproto2.delimited, "_get_codec", lambda compression: (_LargeBlock, bytes))
+
+    with pytest.raises(ValueError, match="use a smaller chunk_size"):
+        Test.write_delimited(BytesIO(), messages, compression=Compression.ZLIB)
+
+
+class _ShortReads(BytesIO):
+    def read(self, size=-1):
+        return super().read(min(size, 100) if size >= 0 else size)
+
+
+def test_compressed_stream_short_reads():
+    stream = BytesIO()
+    Test.write_delimited(stream, messages, chunk_size=1000, compression=Compression.ZLIB)
+
+    assert list(Test.iter_delimited(_ShortReads(stream.getvalue()), compression=Compression.ZLIB)) == messages
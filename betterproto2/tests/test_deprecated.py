@@ -60,6 +60,19 @@ def test_message_with_deprecated_field_not_set_default(requires_grpclib, message
         _ = Test(value=10).message
 
 
+def test_message_with_deprecated_field_default_checks(requires_grpclib):
+    from tests.outputs.deprecated.deprecated import Test
+
+    msg = Test(value=10)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert bool(msg)
+        assert not msg.is_set("message")
+        assert repr(msg) == "Test(value=10)"
+        assert Test.parse(bytes(msg)) == msg
+
+
 @pytest.mark.asyncio
 async def test_service_with_deprecated_method(requires_grpclib):
     from tests.mocks import MockChannel
@@ -152,6 +152,23 @@ def test_dict_casing():
     }
 
 
+def test_from_dict_key_spellings():
+    from tests.outputs.features.features import JsonCasingMsg
+
+    # Spellings resolved through the lookup table, or through `safe_snake_case`
+    table = dict(JsonCasingMsg._betterproto.field_name_by_dict_key)
+    for _ in range(2):
+        assert JsonCasingMsg.from_dict({"pascal_case": 1, "camelCase": 2, "SnakeCase": 3, "kabob_case": 4}) == (
+            JsonCasingMsg(1, 2, 3, 4)
+        )
+
+    # The keys given to `from_dict` are not added to the table
+    assert JsonCasingMsg._betterproto.field_name_by_dict_key == table
+
+    with pytest.raises(KeyError, match="Unknown field 'other_case'"):
+        JsonCasingMsg.from_dict({"otherCase": 1})
+
+
 def test_optional_flag():
     from tests.outputs.features.features import OptionalBoolMsg
 
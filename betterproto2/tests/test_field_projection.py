@@ -0,0 +1,101 @@
+from io import BytesIO
+
+import pytest
+
+import betterproto2
+from tests.outputs.conformance.protobuf_test_messages.proto3 import (
+    TestAllTypesProto3,
+    TestAllTypesProto3NestedMessage,
+)
+
+message = TestAllTypesProto3(
+    optional_int32=150,
+    optional_string="hello",
+    repeated_int64=[1, 2, 3],
+    optional_nested_message=TestAllTypesProto3NestedMessage(
+        a=1, corecursive=TestAllTypesProto3(optional_int32=2, optional_string="nested")
+    ),
+    map_string_string={"a": "b"},
+    recursive_message=TestAllTypesProto3(optional_int32=3, optional_bool=True),
+)
+data = bytes(message)
+
+
+def test_parse_selected_fields():
+    parsed = TestAllTypesProto3.parse(data, fields=["optional_string", "repeated_int64", "recursive_message"])
+
+    assert parsed == TestAllTypesProto3(
+        optional_string="hello",
+        repeated_int64=[1, 2, 3],
+        recursive_message=TestAllTypesProto3(optional_int32=3, optional_bool=True),
+    )
+
+    # The other fields are dropped
+    assert parsed._unknown_fields == b""
+
+
+def test_parse_selected_nested_fields():
+    parsed = TestAllTypesProto3.parse(
+        data, fields=["optional_int32", "optional_nested_message.corecursive.optional_string"]
+    )
+
+    assert parsed == TestAllTypesProto3(
+        optional_int32=150,
+        optional_nested_message=TestAllTypesProto3NestedMessage(
+            corecursive=TestAllTypesProto3(optional_string="nested")
+        ),
+    )
+
+
+def test_parse_selected_fields_keep_skipped():
+    parsed = TestAllTypesProto3.parse(data, fields=["optional_int32", "optional_nested_message.a"], keep_skipped=True)
+
+    assert parsed.optional_string == ""
+    assert parsed.map_string_string == {}
+    assert parsed.optional_nested_message == TestAllTypesProto3NestedMessage(a=1)
+
+    # The skipped fields are serialized back
+    assert TestAllTypesProto3.parse(bytes(parsed)) == message
+
+
+def test_parse_selected_fields_lazy():
+    parsed = TestAllTypesProto3.parse(data, fields=["recursive_message", "optional_nested_message.a"], lazy=True)
+
+    assert "recursive_message" not in parsed.__dict__
+    assert parsed.recursive_message == message.recursive_message
+    assert parsed.optional_nested_message == TestAllTypesProto3NestedMessage(a=1)
+
+
+def test_parse_selected_fields_invalid():
+    with pytest.raises(ValueError, match="unknown_field"):
+        TestAllTypesProto3.parse(data, fields=["unknown_field"])
+
+    with pytest.raises(ValueError, match="optional_int32"):
+        TestAllTypesProto3.parse(data, fields=["optional_int32.value"])
+
+    with pytest.raises(TypeError):
+        TestAllTypesProto3.parse(data, fields="optional_int32")
+
+    # The nested paths are checked even if the nested message is not in the data
+    with pytest.raises(ValueError, match="optional_nested_message.corecursive.optional_strnig"):
+        TestAllTypesProto3.parse(b"", fields=["optional_nested_message.corecursive.optional_strnig"])
+
+    with pytest.raises(ValueError, match="recursive_message.unknown_field"):
+        list(TestAllTypesProto3.iter_delimited(BytesIO(), fields=["recursive_message.unknown_field"]))
+
+
+def test_parse_selected_fields_decoders_cache():
+    cache = TestAllTypesProto3._betterproto.field_decoders_by_options
+    field_names = list(TestAllTypesProto3._betterproto.meta_by_field_name)
+    size = betterproto2._FIELD_DECODERS_CACHE_SIZE
+
+    for field_name in field_names[: size * 2]:
+        TestAllTypesProto3.parse(data, fields=[field_name])
+        # The first selection stays the most recently used
+        TestAllTypesProto3.parse(data, fields=[field_names[0]])
+
+    assert len(cache) == size
+    selected = [options.fields for options in cache]
+    assert frozenset([field_names[0]]) in selected
+    assert frozenset([field_names[1]]) not in selected
+    assert frozenset([field_names[size * 2 - 1]]) in selected
@@ -0,0 +1,103 @@
+import copy
+import dataclasses
+import io
+import pickle
+
+import pytest
+
+from tests.outputs.map_frozen.map import Test as MapTest
+from tests.outputs.nested_frozen.nested import Sibling, Test as NestedTest, TestNested
+from tests.outputs.repeated_frozen.repeated import Test as RepeatedTest
+from tests.outputs.repeated_specialized_frozen.repeated import Test as SpecializedRepeatedTest
+from tests.outputs.repeatedmessage_frozen.repeatedmessage import Sub, Test as RepeatedMessageTest
+
+
+def test_fields_cannot_be_assigned():
+    message = NestedTest(sibling=Sibling(foo=1))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.sibling = Sibling(foo=2)  # type: ignore
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.sibling.foo = 2  # type: ignore
+
+
+@pytest.mark.parametrize("cls", [RepeatedTest, SpecializedRepeatedTest])
+def test_repeated_fields_are_tuples(cls):
+    assert cls().names == ()
+    assert cls(names=["a", "b"]).names == ("a", "b")
+
+    message = cls.parse(bytes(cls(names=["a", "b"])))
+    assert message.names == ("a", "b")
+    assert cls.from_dict({"names": ["c"]}).names == ("c",)
+    assert message.to_dict() == {"names": ["a", "b"]}
+
+
+def test_repeated_messages():
+    message = RepeatedMessageTest(greetings=[Sub(greeting="hello"), Sub(greeting="world")])
+    assert isinstance(message.greetings, tuple)
+
+    parsed = RepeatedMessageTest.parse(bytes(message))
+    assert parsed.greetings == (Sub(greeting="hello"), Sub(greeting="world"))
+    assert parsed == message
+
+    # Lazily decoded repeated fields are tuples too
+    lazy = RepeatedMessageTest.parse(bytes(message), lazy=True)
+    assert lazy.greetings == (Sub(greeting="hello"), Sub(greeting="world"))
+    assert lazy.greetings is lazy.greetings
+
+
+def test_equality_and_hash():
+    message = NestedTest(nested=TestNested(count=1), sibling=Sibling(foo=2))
+    same = NestedTest(nested=TestNested(count=1), sibling=Sibling(foo=2))
+    other = NestedTest(nested=TestNested(count=1), sibling=Sibling(foo=3))
+
+    assert message == same
+    assert hash(message) == hash(same)
+    assert message != other
+    assert message != Sibling(foo=2)
+
+    assert len({message, same, other}) == 2
+    assert {message: "value"}[same] == "value"
+
+    assert hash(Sibling()) == hash(Sibling.parse(b""))
+
+
+def test_equality_and_hash_use_the_field_values():
+    message = MapTest(counts={"a": 1, "b": 2})
+    reordered = MapTest(counts={"b": 2, "a": 1})
+    assert bytes(message) != bytes(reordered)
+    assert message == reordered
+    assert hash(message) == hash(reordered)
+
+    # Unknown fields and the parsed data are not compared
+    data = bytes(Sibling(foo=1))
+    with_unknown = Sibling.parse(data + b"\x10\x01")
+    non_canonical = Sibling.parse(b"\x08\x81\x00", serialization_cache=True)
+    assert with_unknown == non_canonical == Sibling(foo=1)
+    assert hash(with_unknown) == hash(non_canonical) == hash(Sibling(foo=1))
+
+
+def test_encoded_form_is_cached():
+    message = MapTest(counts={"a": 1, "b": 2})
+
+    data = bytes(message)
+    assert bytes(message) is data
+    assert message.byte_size() == len(data)
+    assert MapTest.parse(data) == message
+
+
+def test_loading_into_a_frozen_message():
+    message = RepeatedTest(names=["a"])
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.load(io.BytesIO(bytes(RepeatedTest(names=["b"]))))
+    assert message.names == ("a",)
+
+
+def test_copy_and_pickle():
+    message = RepeatedMessageTest(greetings=[Sub(greeting="hello")])
+
+    assert copy.copy(message) == message
+    assert copy.deepcopy(message) == message
+    assert pickle.loads(pickle.dumps(message)) == message
@@ -4,7 +4,7 @@ import json
 import math
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -187,6 +187,56 @@ TEST_CASES = [
     ),
 ]
 
+# The same test cases, compiled with the `specialized_codecs` option
+TEST_CASES += [
+    replace(test_case, plugin_package=test_case.plugin_package.replace(".", "_specialized.", 1))
+    for test_case in TEST_CASES
+    if test_case.plugin_package.split(".")[0]
+    in {
+        "bool",
+        "bytes",
+        "double",
+        "enum",
+        "fixed",
+        "float",
+        "googletypes",
+        "int32",
+        "map",
+        "mapmessage",
+        "nested",
+        "nestedtwice",
+        "oneof",
+        "oneof_enum",
+        "proto3_field_presence",
+        "recursivemessage",
+        "repeated",
+        "repeated_duration_timestamp",
+        "repeatedmessage",
+        "repeatedpacked",
+        "signed",
+    }
+]
+
+
+# Some of the test cases, compiled with the `presence_tracking` option
+TEST_CASES += [
+    replace(test_case, plugin_package=test_case.plugin_package.replace(".", "_presence.", 1))
+    for test_case in TEST_CASES
+    if test_case.plugin_package.split(".")[0]
+    in {
+        "bool",
+        "enum",
+        "fixed",
+        "googletypes",
+        "map",
+        "nested",
+        "oneof",
+        "proto3_field_presence",
+        "repeatedmessage",
+        "repeatedpacked",
+    }
+]
+
 
 @pytest.mark.parametrize("test_case", TEST_CASES, ids=lambda x: x.plugin_package)
 def test_message_json(test_case: TestCase, requires_pydantic, requires_grpcio, requires_grpclib) -> None:
@@ -206,6 +256,8 @@ def test_message_json(test_case: TestCase, requires_pydantic, requires_grpcio, r
 
         assert dict_replace_nans(json.loads(message_json)) == dict_replace_nans(json.loads(json_data))
 
+        assert message.byte_size() == len(bytes(message))
+
 
 @pytest.mark.parametrize("test_case", TEST_CASES, ids=lambda x: x.plugin_package)
 def test_binary_compatibility(
@@ -244,6 +296,7 @@ def test_binary_compatibility(
         # https://developers.google.com/protocol-buffers/docs/encoding#implications
         assert bytes(plugin_instance_from_json) == reference_binary_output
         assert bytes(plugin_instance_from_binary) == reference_binary_output
+        assert plugin_instance_from_json.byte_size() == reference_instance.ByteSize()
 
         assert plugin_instance_from_json == plugin_instance_from_binary
         assert dict_replace_nans(plugin_instance_from_json.to_dict()) == dict_replace_nans(
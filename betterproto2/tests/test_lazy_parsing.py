@@ -0,0 +1,95 @@
+import pytest
+
+from tests.outputs.nested import nested
+from tests.outputs.nested_specialized import nested as nested_specialized
+from tests.outputs.repeatedmessage import repeatedmessage
+from tests.util import requires_pydantic  # noqa: F401
+
+
+@pytest.mark.parametrize("module", [nested, nested_specialized])
+def test_lazy_message_field(module):
+    msg = module.Test(nested=module.TestNested(count=150), sibling=module.Sibling(foo=1), msg=module.TestMsg.THIS)
+    data = bytes(msg)
+
+    parsed = module.Test.parse(data, lazy=True)
+
+    # Scalar fields are decoded eagerly
+    assert parsed.msg == module.TestMsg.THIS
+    assert "sibling" not in parsed.__dict__
+
+    # Unmodified fields are serialized back without being decoded
+    assert bytes(parsed) == data
+    assert parsed.byte_size() == len(data)
+    assert "sibling" not in parsed.__dict__
+
+    assert parsed.sibling == module.Sibling(foo=1)
+    assert "sibling" in parsed.__dict__
+    assert parsed.sibling2 is None
+    assert parsed == msg
+
+    parsed.sibling.foo = 2
+    parsed.nested = None
+    assert bytes(parsed) == bytes(module.Test(sibling=module.Sibling(foo=2), msg=module.TestMsg.THIS))
+
+
+def test_lazy_message_field_raw_data():
+    # The nested message has an unknown field and a length prefix that is longer than needed
+    sibling_data = b"\x08\x01" + b"\x28\x07"
+    data = b"\x12" + b"\x84\x00" + sibling_data
+
+    parsed = nested.Test.parse(data, lazy=True)
+    assert bytes(parsed) == data
+
+    assert parsed.sibling.foo == 1
+    assert bytes(parsed) == b"\x12\x04" + sibling_data
+
+
+def test_lazy_message_field_assigned():
+    data = bytes(nested.Test(sibling=nested.Sibling(foo=1)))
+
+    parsed = nested.Test.parse(data, lazy=True)
+    parsed.sibling = nested.Sibling(foo=3)
+
+    assert bytes(parsed) == bytes(nested.Test(sibling=nested.Sibling(foo=3)))
+
+
+def test_lazy_repeated_message_field():
+    msg = repeatedmessage.Test(greetings=[repeatedmessage.Sub(greeting="hello"), repeatedmessage.Sub(greeting="world")])
+    data = bytes(msg)
+
+    parsed = repeatedmessage.Test.parse(data, lazy=True)
+    assert bytes(parsed) == data
+
+    assert parsed.greetings == msg.greetings
+    parsed.greetings.append(repeatedmessage.Sub(greeting="!"))
+    assert len(repeatedmessage.Test.parse(bytes(parsed)).greetings) == 3
+
+
+def test_lazy_nested_fields():
+    from tests.outputs.recursivemessage.recursivemessage import Test
+
+    msg = Test(name="a", child=Test(name="b", child=Test(name="c")))
+    parsed = Test.parse(bytes(msg), lazy=True)
+
+    # The nested messages are parsed lazily as well
+    assert "child" not in parsed.child.__dict__
+    assert parsed == msg
+
+
+def test_lazy_unknown_attribute():
+    parsed = nested.Test.parse(bytes(nested.Test(sibling=nested.Sibling(foo=1))), lazy=True)
+
+    with pytest.raises(AttributeError):
+        parsed.unknown  # noqa: B018
+
+    # Messages created without calling `__init__`
+    with pytest.raises(AttributeError, match="foo"):
+        nested.Sibling.__new__(nested.Sibling).foo  # noqa: B018
+
+
+def test_lazy_message_field_pydantic_validation(requires_pydantic):
+    from tests.outputs.oneof_pydantic.oneof import MixedDrink, Test
+
+    parsed = Test.parse(bytes(Test(mixed_drink=MixedDrink(shots=2))), lazy=True)
+    parsed._validate()
+    assert parsed.mixed_drink == MixedDrink(shots=2)
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from betterproto2 import encode_varint
+from betterproto2.message_log import MessageLog
+from tests.outputs.nested.nested import Sibling, Test, TestMsg
+from tests.outputs.oneof.oneof import Test as OneofTest
+
+
+def test_append_and_get(tmp_path):
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        log.append(Sibling(foo=1))
+        log.extend([Sibling(foo=2), Sibling(foo=3)])
+
+        assert len(log) == 3
+        assert log[2] == Sibling(foo=2)
+        assert log.get(4) is None
+        assert 3 in log
+        assert 4 not in log
+        assert sorted(log) == [1, 2, 3]
+
+        with pytest.raises(KeyError):
+            log[4]
+
+
+def test_last_message_is_kept(tmp_path):
+    with MessageLog(tmp_path, OneofTest, key="pitier") as log:
+        log.append(OneofTest(pitier="a", just_a_regular_field=1))
+        log.append(OneofTest(pitier="b", just_a_regular_field=2))
+        log.append(OneofTest(pitier="a", just_a_regular_field=3))
+
+        assert len(log) == 2
+        assert log["a"].just_a_regular_field == 3
+        assert [message.just_a_regular_field for message in log.values()] == [2, 3]
+
+
+def test_reopen(tmp_path):
+    with MessageLog(tmp_path, OneofTest, key="pitier") as log:
+        log.extend(OneofTest(pitier=str(index % 10), just_a_regular_field=index) for index in range(100))
+
+    with MessageLog(tmp_path, OneofTest, key="pitier") as log:
+        assert len(log) == 10
+        assert log["3"].just_a_regular_field == 93
+
+        log.append(OneofTest(pitier="3", just_a_regular_field=1000))
+
+    with MessageLog(tmp_path, OneofTest, key="pitier") as log:
+        assert log["3"].just_a_regular_field == 1000
+
+
+def test_unsynced_messages_are_not_indexed(tmp_path):
+    log = MessageLog(tmp_path, Sibling, key="foo", sync_every=3)
+    log.extend([Sibling(foo=1), Sibling(foo=2), Sibling(foo=3), Sibling(foo=4)])
+
+    # Simulate a crash: the last message was not synchronized
+    log._file.flush()
+    assert len(MessageLog(tmp_path, Sibling, key="foo")) == 3
+
+    log.close()
+    assert len(MessageLog(tmp_path, Sibling, key="foo")) == 4
+
+
+def test_incomplete_index_entry(tmp_path):
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        log.extend([Sibling(foo=1), Sibling(foo=2)])
+
+    # Simulate a crash while the index was written: only the offset of the next entry is there
+    with open(tmp_path / "00000000.idx", "ab") as f:
+        f.write(encode_varint(1000))
+
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        assert sorted(log) == [1, 2]
+        log.append(Sibling(foo=3))
+
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        assert sorted(log) == [1, 2, 3]
+        assert log[3] == Sibling(foo=3)
+
+
+def test_segment_rotation_and_compaction(tmp_path):
+    with MessageLog(tmp_path, OneofTest, key="pitier", segment_size=1000) as log:
+        for index in range(1000):
+            log.append(OneofTest(pitier=str(index % 20), just_a_regular_field=index))
+
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".log")]) > 5
+        size = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+        log.compact()
+
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".log")]) == 1
+        assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) < size / 10
+        assert len(log) == 20
+        assert log["7"].just_a_regular_field == 987
+
+        log.append(OneofTest(pitier="7", just_a_regular_field=-1))
+
+    with MessageLog(tmp_path, OneofTest, key="pitier") as log:
+        assert len(log) == 20
+        assert log["7"].just_a_regular_field == -1
+        assert log["8"].just_a_regular_field == 988
+
+
+def test_other_files_are_ignored(tmp_path):
+    (tmp_path / "notes.log").write_text("")
+
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        log.append(Sibling(foo=1))
+
+    with MessageLog(tmp_path, Sibling, key="foo") as log:
+        assert sorted(log) == [1]
+
+
+def test_enum_keys(tmp_path):
+    with MessageLog(tmp_path, Test, key="msg") as log:
+        log.append(Test(msg=TestMsg.THIS))
+
+    with MessageLog(tmp_path, Test, key="msg") as log:
+        assert list(log) == [TestMsg.THIS]
+        assert type(next(iter(log))) is TestMsg
+        assert log[TestMsg.THIS] == Test(msg=TestMsg.THIS)
+
+
+def test_invalid_keys(tmp_path):
+    with pytest.raises(ValueError, match="Unknown field"):
+        MessageLog(tmp_path, Sibling, key="bar")
+
+    with pytest.raises(ValueError, match="can't be used as a key"):
+        MessageLog(tmp_path, OneofTest, key="mixed_drink")
@@ -0,0 +1,104 @@
+import pytest
+
+from tests.outputs.nested_presence import nested as nested_presence
+from tests.outputs.nested_specialized_presence import nested as nested_specialized_presence
+from tests.outputs.proto3_field_presence_presence.proto3_field_presence import InnerTest, Test as OptionalTest
+from tests.outputs.repeatedmessage_presence.repeatedmessage import Sub, Test as RepeatedTest
+
+
+@pytest.mark.parametrize("module", [nested_presence, nested_specialized_presence])
+def test_presence_bitmap(module):
+    bit_by_field = module.Test._betterproto.presence_bit_by_field
+
+    message = module.Test(sibling=module.Sibling(foo=1))
+    assert message._presence == bit_by_field["sibling"]
+
+    message.msg = module.TestMsg.THIS
+    assert message._presence == bit_by_field["sibling"] | bit_by_field["msg"]
+
+    parsed = module.Test.parse(bytes(message))
+    assert parsed._presence == message._presence
+    assert parsed == message
+
+
+@pytest.mark.parametrize("module", [nested_presence, nested_specialized_presence])
+def test_set_fields(module):
+    message = module.Test()
+    assert not message
+    assert not message.is_set("sibling")
+    assert repr(message) == "Test()"
+    assert bytes(message) == b""
+
+    message.sibling2 = module.Sibling(foo=2)
+    message.nested = module.TestNested(count=1)
+    assert message
+    assert message.is_set("sibling2")
+    assert not message.is_set("sibling")
+    assert repr(message) == "Test(nested=TestNested(count=1), sibling2=Sibling(foo=2))"
+    assert message.byte_size() == len(bytes(message))
+
+
+def test_field_reset_to_default():
+    message = OptionalTest(test1=0, test3="abc")
+    assert message.is_set("test1")
+
+    message.test1 = None
+    message.test3 = None
+    assert not message.is_set("test1")
+    assert not message
+    assert bytes(message) == b""
+
+
+@pytest.mark.parametrize("module", [nested_presence, nested_specialized_presence])
+def test_presence_is_kept_when_default_value_is_assigned(module):
+    bit = module.Test._betterproto.presence_bit_by_field["msg"]
+
+    message = module.Test(msg=module.TestMsg.THIS)
+    message.msg = module.TestMsg.NONE
+    assert message._presence == bit
+
+    # The field is still checked, and skipped because it has its default value
+    assert not message.is_set("msg")
+    assert not message
+    assert repr(message) == "Test()"
+    assert bytes(message) == b""
+    assert module.Test.parse(bytes(message))._presence == 0
+
+
+def test_optional_fields():
+    message = OptionalTest.parse(bytes(OptionalTest(test1=0, test2=False, test5=InnerTest())))
+
+    assert message.is_set("test1") and message.test1 == 0
+    assert message.is_set("test2") and message.test2 is False
+    assert message.is_set("test5")
+    assert not message.is_set("test3")
+    assert repr(message) == "Test(test1=0, test2=False, test5=InnerTest())"
+
+
+def test_containers_modified_in_place():
+    message = RepeatedTest()
+    assert not message
+
+    message.greetings.append(Sub(greeting="hello"))
+    assert message
+    assert message.is_set("greetings")
+    assert RepeatedTest.parse(bytes(message)).greetings == [Sub(greeting="hello")]
+
+
+def test_lazy_parsing():
+    data = bytes(nested_presence.Test(sibling=nested_presence.Sibling(foo=1), msg=nested_presence.TestMsg.THIS))
+
+    message = nested_presence.Test.parse(data, lazy=True)
+    assert message.is_set("sibling")
+    assert not message.is_set("nested")
+    assert bytes(message) == data
+    assert message.sibling.foo == 1
+
+
+def test_frozen_messages():
+    from tests.outputs.repeatedmessage_frozen_presence.repeatedmessage import Sub, Test
+
+    message = Test.parse(bytes(Test(greetings=[Sub(greeting="hello")])))
+    assert message.greetings == (Sub(greeting="hello"),)
+    assert message.is_set("greetings")
+    assert hash(message) == hash(Test(greetings=[Sub(greeting="hello")]))
@@ -0,0 +1,161 @@
+import array
+
+import betterproto2
+from betterproto2 import RepeatedFormat
+from tests.outputs.conformance.protobuf_test_messages.proto3 import TestAllTypesProto3, TestAllTypesProto3NestedEnum
+from tests.util import requires_numpy  # noqa: F401
+
+numerical_fields = {
+    "packed_int32": [-(1 << 31), -1, 0, 1, 300, (1 << 31) - 1],
+    "packed_int64": [-(1 << 63), -1, 0, 1, 300, (1 << 63) - 1],
+    "packed_uint32": [0, 1, 300, (1 << 32) - 1],
+    "packed_uint64": [0, 1, 300, (1 << 64) - 1],
+    "packed_sint32": [-(1 << 31), -1, 0, 1, (1 << 31) - 1],
+    "packed_sint64": [-(1 << 63), -1, 0, 1, (1 << 63) - 1],
+    "packed_fixed32": [0, 1, (1 << 32) - 1],
+    "packed_fixed64": [0, 1, (1 << 64) - 1],
+    "packed_sfixed32": [-(1 << 31), 0, (1 << 31) - 1],
+    "packed_sfixed64": [-(1 << 63), 0, (1 << 63) - 1],
+    "packed_float": [-1.5, 0.0, 2.25],
+    "packed_double": [-1.5, 0.0, 1e300],
+    "packed_bool": [True, False, True],
+    # Only a few items, to check that they are concatenated even if they are not packed
+    "unpacked_int32": [1, -2],
+    "unpacked_double": [0.5],
+}
+
+message = TestAllTypesProto3(
+    **numerical_fields,
+    packed_nested_enum=[TestAllTypesProto3NestedEnum.FOO, TestAllTypesProto3NestedEnum.BAR],
+    recursive_message=TestAllTypesProto3(packed_double=[1.0, 2.0]),
+)
+
+
+def unpacked_encoding(msg: TestAllTypesProto3, field_name: str) -> bytes:
+    # Encode each item separately, with its own tag
+    meta = msg._betterproto.meta_by_field_name[field_name]
+    tag = betterproto2.encode_varint((meta.number << 3) | betterproto2._WIRE_TYPE_BY_PROTO_TYPE[meta.proto_type])
+    encode = betterproto2._ENCODER_BY_TYPE[meta.proto_type]
+    return b"".join(tag + encode(item) for item in getattr(msg, field_name))
+
+
+def test_parse_numpy(requires_numpy):
+    import numpy
+
+    data = bytes(message)
+    parsed = TestAllTypesProto3.parse(data, repeated_format=RepeatedFormat.NUMPY)
+
+    for field_name, values in numerical_fields.items():
+        array = getattr(parsed, field_name)
+        assert isinstance(array, numpy.ndarray)
+        assert array.dtype.isnative
+        assert array.tolist() == values
+
+    # Enums and fields absent from the data are not converted
+    assert parsed.packed_nested_enum == message.packed_nested_enum
+    assert parsed.repeated_int32 == []
+
+    assert parsed.packed_sint32.dtype == numpy.int32
+    assert parsed.packed_uint64.dtype == numpy.uint64
+    assert parsed.packed_float.dtype == numpy.float32
+    assert parsed.packed_bool.dtype == numpy.bool_
+
+    # The option applies to nested messages
+    assert isinstance(parsed.recursive_message.packed_double, numpy.ndarray)
+
+    assert parsed == message
+    assert bytes(parsed) == data
+    assert parsed.byte_size() == len(data)
+    assert parsed.to_dict() == message.to_dict()
+    assert parsed.to_json() == message.to_json()
+
+
+def test_parse_numpy_unpacked(requires_numpy):
+    import numpy
+
+    msg = TestAllTypesProto3(unpacked_int32=[1, -2, 3], unpacked_double=[0.5, 1.5])
+    data = unpacked_encoding(msg, "unpacked_int32") + unpacked_encoding(msg, "unpacked_double")
+
+    parsed = TestAllTypesProto3.parse(data, repeated_format=RepeatedFormat.NUMPY)
+    assert isinstance(parsed.unpacked_int32, numpy.ndarray)
+    assert parsed.unpacked_int32.dtype == numpy.int32
+    assert parsed == msg
+
+    # Values split between several parts, in a nested message
+    nested = TestAllTypesProto3(unpacked_int32=list(range(1000)))
+    nested_data = unpacked_encoding(nested, "unpacked_int32") + bytes(TestAllTypesProto3(unpacked_int32=[5, 6]))
+    data = bytes(TestAllTypesProto3(optional_int32=1)) + b"\xda\x01" + betterproto2.encode_varint(len(nested_data))
+    data += nested_data
+
+    parsed = TestAllTypesProto3.parse(data, repeated_format=RepeatedFormat.NUMPY)
+    assert isinstance(parsed.recursive_message.unpacked_int32, numpy.ndarray)
+    assert parsed.recursive_message.unpacked_int32.tolist() == [*range(1000), 5, 6]
+
+
+def test_serialize_numpy(requires_numpy):
+    import numpy
+
+    msg = TestAllTypesProto3(
+        packed_double=numpy.array([1.0, 2.5]),
+        packed_float=numpy.array([1.0, 2.5], dtype=numpy.float64),  # converted to float32 when serialized
+        packed_sint64=numpy.array([-1, 1 << 40]),
+        packed_uint32=numpy.array([1, 2, 3], dtype=numpy.uint8),
+        packed_int32=numpy.array([], dtype=numpy.int32),
+    )
+    expected = TestAllTypesProto3(
+        packed_double=[1.0, 2.5], packed_float=[1.0, 2.5], packed_sint64=[-1, 1 << 40], packed_uint32=[1, 2, 3]
+    )
+
+    assert bytes(msg) == bytes(expected)
+    assert msg.byte_size() == len(bytes(expected))
+    assert msg == expected
+    assert bool(msg)
+    assert not msg.is_set("packed_int32")
+
+
+def test_parse_array():
+    data = bytes(message)
+    parsed = TestAllTypesProto3.parse(data, repeated_format=RepeatedFormat.ARRAY)
+
+    for field_name, values in numerical_fields.items():
+        assert isinstance(getattr(parsed, field_name), array.array)
+        assert getattr(parsed, field_name).tolist() == values
+
+    assert parsed.packed_sint32.typecode == "i"
+    assert parsed.packed_uint64.typecode == "Q"
+    assert parsed.packed_float.typecode == "f"
+    assert parsed.packed_bool.typecode == "B"
+    assert isinstance(parsed.recursive_message.packed_double, array.array)
+
+    assert parsed == message
+    assert bytes(parsed) == data
+    assert parsed.byte_size() == len(data)
+    assert parsed.to_dict() == message.to_dict()
+    assert parsed.to_json() == message.to_json()
+
+
+def test_parse_array_unpacked():
+    msg = TestAllTypesProto3(unpacked_int32=[1, -2, 3], unpacked_double=[0.5, 1.5])
+    data = unpacked_encoding(msg, "unpacked_int32") + unpacked_encoding(msg, "unpacked_double")
+
+    parsed = TestAllTypesProto3.parse(data, repeated_format=RepeatedFormat.ARRAY)
+    assert parsed.unpacked_int32 == array.array("i", [1, -2, 3])
+    assert parsed == msg
+
+
+def test_serialize_array():
+    msg = TestAllTypesProto3(
+        packed_double=array.array("d", [1.0, 2.5]),
+        packed_float=array.array("d", [1.0, 2.5]),  # converted to float32 when serialized
+        packed_sint64=array.array("q", [-1, 1 << 40]),
+        packed_uint32=array.array("B", [1, 2, 3]),
+        packed_int32=array.array("i"),
+    )
+    expected = TestAllTypesProto3(
+        packed_double=[1.0, 2.5], packed_float=[1.0, 2.5], packed_sint64=[-1, 1 << 40], packed_uint32=[1, 2, 3]
+    )
+
+    assert bytes(msg) == bytes(expected)
+    assert msg.byte_size() == len(bytes(expected))
+    assert msg == expected
+    assert not msg.is_set("packed_int32")
@@ -0,0 +1,147 @@
+import array
+
+import pytest
+
+from tests.outputs.conformance.protobuf_test_messages.proto3 import (
+    TestAllTypesProto3,
+    TestAllTypesProto3NestedMessage,
+)
+from tests.outputs.nested_specialized.nested import Sibling, Test
+
+
+def make_message() -> TestAllTypesProto3:
+    return TestAllTypesProto3(
+        optional_int32=150,
+        optional_bytes=b"abc",
+        repeated_string=["a", "b"],
+        repeated_nested_message=[TestAllTypesProto3NestedMessage(a=1)],
+        map_string_nested_message={"key": TestAllTypesProto3NestedMessage(a=2)},
+        recursive_message=TestAllTypesProto3(optional_string="nested"),
+    )
+
+
+def check_cache(message, modify):
+    message.enable_serialization_cache()
+    data = bytes(message)
+    assert bytes(message) is data
+
+    modify(message)
+    new_data = bytes(message)
+    assert new_data != data
+    assert new_data == bytes(TestAllTypesProto3.parse(new_data))
+    assert message.byte_size() == len(new_data)
+    assert bytes(message) is new_data
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda msg: setattr(msg, "optional_int32", 151),
+        lambda msg: setattr(msg, "optional_bytes", b""),
+        lambda msg: msg.repeated_string.append("c"),
+        lambda msg: msg.repeated_string.__setitem__(0, "z"),
+        lambda msg: setattr(msg.repeated_nested_message[0], "a", 3),
+        lambda msg: setattr(msg.map_string_nested_message["key"], "a", 3),
+        lambda msg: msg.map_string_nested_message.pop("key"),
+        lambda msg: setattr(msg.recursive_message, "optional_string", "modified"),
+        lambda msg: setattr(msg.recursive_message, "recursive_message", TestAllTypesProto3(optional_int32=1)),
+    ],
+)
+def test_serialization_cache_invalidation(modify):
+    check_cache(make_message(), modify)
+
+
+def test_serialization_cache_mutable_buffers():
+    message = TestAllTypesProto3(optional_bytes=bytearray(b"abc"), packed_double=array.array("d", [1.0]))
+
+    check_cache(message, lambda msg: msg.optional_bytes.append(0x64))
+    check_cache(message, lambda msg: msg.packed_double.append(2.0))
+
+
+@pytest.mark.parametrize("message_type", [TestAllTypesProto3, Test])
+def test_serialization_cache_byte_size(message_type, monkeypatch):
+    if message_type is Test:
+        message = Test(sibling=Sibling(foo=1)).enable_serialization_cache()
+    else:
+        message = make_message().enable_serialization_cache()
+
+    size = message.byte_size()
+    assert size == len(bytes(message_type.parse(bytes(message))))
+
+    # The size is computed again only when the message is modified
+    monkeypatch.setattr(message_type, "_byte_size", lambda self: pytest.fail("The size was computed again"))
+    assert message.byte_size() == size
+    monkeypatch.undo()
+
+    if message_type is Test:
+        message.sibling.foo = 300
+    else:
+        message.recursive_message.optional_string = "nested!"
+    assert message.byte_size() == size + 1
+    assert message.byte_size() == len(bytes(message))
+
+
+def test_serialization_cache_shared_nested_message():
+    nested = TestAllTypesProto3(optional_int32=1)
+    first = TestAllTypesProto3(recursive_message=nested).enable_serialization_cache()
+    second = TestAllTypesProto3(recursive_message=nested).enable_serialization_cache()
+
+    first_data = bytes(first)
+    nested.optional_int32 = 2
+    assert bytes(second) != first_data
+    assert bytes(first) == bytes(second)
+
+
+def test_serialization_cache_parse():
+    data = bytes(make_message())
+    # A field that is not encoded the way betterproto2 would encode it
+    data += b"\x08\x96\x81\x00"
+
+    message = TestAllTypesProto3.parse(data, serialization_cache=True)
+    assert bytes(message) is data
+    assert message.byte_size() == len(data)
+
+    message.optional_int32 = 1
+    assert TestAllTypesProto3.parse(bytes(message)).optional_int32 == 1
+
+
+def test_serialization_cache_parse_lazy():
+    data = bytes(make_message())
+
+    message = TestAllTypesProto3.parse(data, lazy=True, serialization_cache=True)
+    assert bytes(message) is data
+
+    # Accessing a lazy field decodes it, but doesn't modify it
+    assert message.recursive_message.optional_string == "nested"
+    assert bytes(message) == data
+
+    message.recursive_message.optional_string = "modified"
+    assert TestAllTypesProto3.parse(bytes(message)).recursive_message.optional_string == "modified"
+
+
+def test_serialization_cache_parse_selected_fields():
+    data = bytes(make_message())
+
+    message = TestAllTypesProto3.parse(data, fields=["optional_int32"], serialization_cache=True)
+    assert bytes(message) == bytes(TestAllTypesProto3(optional_int32=150))
+
+
+def test_serialization_cache_nested_message():
+    sibling = Sibling(foo=1).enable_serialization_cache()
+    message = Test(sibling=sibling)
+
+    assert bytes(message) == bytes(Test(sibling=Sibling(foo=1)))
+    assert sibling._serialized_cache.data == bytes(Sibling(foo=1))
+
+    sibling.foo = 2
+    assert bytes(message) == bytes(Test(sibling=Sibling(foo=2)))
+
+
+def test_serialization_cache_pydantic():
+    from tests.outputs.bool_pydantic.bool import Test as PydanticTest
+
+    message = PydanticTest(value=True).enable_serialization_cache()
+    assert bytes(message) is bytes(message)
+
+    message.value = False
+    assert bytes(message) == b""
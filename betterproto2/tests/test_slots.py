@@ -0,0 +1,94 @@
+import copy
+import pickle
+import sys
+
+import pytest
+
+from tests.outputs.nested.nested import Test as DictTest
+from tests.outputs.nested_slots import nested as nested_slots
+from tests.outputs.nested_slots.nested import Sibling, Test, TestNested
+from tests.outputs.nested_specialized_slots import nested as nested_specialized_slots
+from tests.util import requires_pydantic  # noqa: F401
+
+
+def test_messages_have_no_dict():
+    message = Test(nested=TestNested(count=1))
+
+    assert not hasattr(message, "__dict__")
+    assert hasattr(DictTest(), "__dict__")
+    assert sys.getsizeof(message) < sys.getsizeof(DictTest()) + sys.getsizeof(DictTest().__dict__)
+
+    with pytest.raises(AttributeError):
+        message.unknown = 1  # type: ignore
+
+
+@pytest.mark.parametrize("module", [nested_slots, nested_specialized_slots])
+def test_round_trip(module):
+    message = module.Test(nested=module.TestNested(count=1), sibling=module.Sibling(foo=2), msg=module.TestMsg.THIS)
+    data = bytes(message)
+
+    assert module.Test.parse(data) == message
+    assert module.Test.parse(data + b"\x28\x01")._unknown_fields == b"\x28\x01"
+    assert module.Test.from_dict(message.to_dict()) == message
+
+
+@pytest.mark.parametrize("module", [nested_slots, nested_specialized_slots])
+def test_lazy_parsing(module):
+    data = bytes(module.Test(nested=module.TestNested(count=1), sibling=module.Sibling(foo=2)))
+
+    message = module.Test.parse(data, lazy=True)
+    assert bytes(message) == data
+    assert message.sibling == module.Sibling(foo=2)
+
+    message.nested = module.TestNested(count=3)
+    assert module.Test.parse(bytes(message)).nested.count == 3
+
+
+def test_copy_and_pickle():
+    message = Test(nested=TestNested(count=1), sibling=Sibling(foo=2))
+
+    assert copy.copy(message) == message
+    assert copy.deepcopy(message) == message
+    assert copy.deepcopy(message).sibling is not message.sibling
+    assert pickle.loads(pickle.dumps(message)) == message
+
+
+def test_serialization_cache():
+    message = Test(sibling=Sibling(foo=1)).enable_serialization_cache()
+    assert bytes(message) is bytes(message)
+
+    message.sibling.foo = 2
+    assert bytes(message) == bytes(Test(sibling=Sibling(foo=2)))
+
+
+def test_deprecated_messages():
+    from tests.outputs.deprecated_specialized_slots.deprecated import Message, Test as DeprecatedTest
+
+    with pytest.warns(DeprecationWarning):
+        message = DeprecatedTest(message=Message(value="hello"), value=1)
+
+    with pytest.warns(DeprecationWarning):
+        assert DeprecatedTest.parse(bytes(message)) == message
+
+
+def test_frozen_messages():
+    from tests.outputs.repeatedmessage_frozen_slots.repeatedmessage import Sub, Test as FrozenTest
+
+    message = FrozenTest(greetings=[Sub(greeting="hello")])
+    assert not hasattr(message, "__dict__")
+    assert message.greetings == (Sub(greeting="hello"),)
+    assert hash(message) == hash(FrozenTest.parse(bytes(message)))
+
+
+def test_pydantic_validation(requires_pydantic):
+    import pydantic
+
+    from tests.outputs.manual_validation_pydantic_slots.manual_validation import Msg
+
+    message = Msg(x=12)
+    assert not hasattr(message, "__dict__")
+    assert Msg.parse(bytes(message)) == message
+
+    message.x = 2**50  # This is an invalid uint32 value
+    with pytest.raises(pydantic.ValidationError):
+        message._validate()
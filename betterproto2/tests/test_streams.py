@@ -1,3 +1,5 @@
+import asyncio
+import socket
 from io import BytesIO
 from pathlib import Path
 from shutil import which
@@ -8,6 +10,7 @@ import pytest
 import betterproto2
 from tests.outputs.map import map
 from tests.outputs.nested import nested
+from tests.outputs.nested_specialized import nested as nested_specialized
 from tests.outputs.oneof import oneof
 from tests.outputs.repeated import repeated
 from tests.outputs.repeatedpacked import repeatedpacked
@@ -47,6 +50,25 @@ def test_load_varint_too_long():
         betterproto2.load_varint(stream)
 
 
+def test_decode_varint_too_long():
+    with pytest.raises(ValueError):
+        betterproto2.decode_varint(b"\x80\x80\x80\x80\x80\x80\x80\x80\x80\x80\x01", 0)
+
+    # This should not raise a ValueError, as it is within 64 bits
+    assert betterproto2.decode_varint(b"\x80\x80\x80\x80\x80\x80\x80\x80\x80\x01", 0) == (1 << 63, 10)
+
+
+def test_decode_varint_cutoff():
+    with open(streams_path / "load_varint_cutoff.in", "rb") as stream:
+        data = stream.read()
+
+    with pytest.raises(EOFError):
+        betterproto2.decode_varint(data, 0)
+
+    with pytest.raises(EOFError):
+        betterproto2.decode_varint(data, 1)
+
+
 def test_load_varint_file():
     with open(streams_path / "message_dump_file_single.expected", "rb") as stream:
         assert betterproto2.load_varint(stream) == (8, b"\x08")  # Single-byte varint
@@ -163,6 +185,199 @@ def test_message_load_delimited():
         assert stream.read(1) == b""
 
 
+def test_message_write_delimited(tmp_path):
+    with open(tmp_path / "message_write_delimited.out", "wb") as stream:
+        oneof.Test.write_delimited(stream, [oneof_example, oneof_example, nested_example])
+
+    with (
+        open(tmp_path / "message_write_delimited.out", "rb") as test_stream,
+        open(streams_path / "delimited_messages.in", "rb") as exp_stream,
+    ):
+        assert test_stream.read() == exp_stream.read()
+
+
+def test_message_write_delimited_chunks():
+    class Stream(BytesIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(len(data))
+            return super().write(data)
+
+    messages = [repeated.Test(names=["a" * 10] * index) for index in range(100)]
+
+    stream = Stream()
+    repeated.Test.write_delimited(stream, messages, chunk_size=1000)
+    assert stream.getvalue() == b"".join(betterproto2.encode_varint(len(bytes(m))) + bytes(m) for m in messages)
+    assert 1 < len(stream.writes) < len(messages)
+    assert min(stream.writes[:-1]) >= 1000
+
+
+def test_message_iter_delimited():
+    with open(streams_path / "delimited_messages.in", "rb") as stream:
+        messages = list(oneof.Test.iter_delimited(stream))
+
+    assert messages == [oneof_example, oneof_example, oneof.Test.parse(bytes(nested_example))]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100, 65536])
+def test_message_iter_delimited_chunks(chunk_size):
+    class Stream(BytesIO):
+        def read(self, size=-1):
+            # Return less than requested, as raw streams can
+            return super().read(min(size, 5000))
+
+    messages = [repeated.Test(names=["a" * index] * index) for index in range(0, 300, 7)]
+    data = BytesIO()
+    repeated.Test.write_delimited(data, messages)
+
+    parsed = repeated.Test.iter_delimited(Stream(data.getvalue()), chunk_size=chunk_size)
+    assert list(parsed) == messages
+
+
+def test_message_iter_delimited_large_message(mocker):
+    class Stream(BytesIO):
+        def read(self, size=-1):
+            return super().read(min(size, 5000))
+
+    messages = [repeated.Test(names=["a"]), repeated.Test(names=["a" * 1_000_000]), repeated.Test(names=["b"])]
+    data = BytesIO()
+    repeated.Test.write_delimited(data, messages)
+
+    # The rest of the large message is read before parsing again, not added to the data read by read
+    load_delimited = mocker.spy(repeated.Test, "_load_delimited")
+    assert list(repeated.Test.iter_delimited(Stream(data.getvalue()))) == messages
+    assert load_delimited.call_count <= 3
+
+
+def test_message_iter_delimited_options():
+    data = BytesIO()
+    nested.Test.write_delimited(data, [nested_example, nested_example])
+    data.seek(0)
+
+    for message in nested.Test.iter_delimited(data, fields=["sibling"], serialization_cache=True):
+        assert message.sibling == nested_example.sibling
+        assert not message.nested
+        assert bytes(message) == bytes(nested.Test(sibling=nested_example.sibling))
+
+
+def test_message_iter_delimited_truncated():
+    data = BytesIO()
+    nested.Test.write_delimited(data, [nested_example, nested_example])
+    data = data.getvalue()
+
+    with pytest.raises(ValueError, match="Expected message of size"):
+        list(nested.Test.iter_delimited(BytesIO(data[:-1])))
+
+    with pytest.raises(EOFError):
+        list(nested.Test.iter_delimited(BytesIO(data + b"\x80")))
+
+
+def test_message_parse_truncated():
+    data = bytes(oneof_example)
+
+    with pytest.raises(ValueError):
+        oneof.Test.parse(data[:-1])
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("data", [b"\n\x02", b"\n\x32\x08\x05"])
+def test_message_parse_truncated_nested(data, lazy):
+    with pytest.raises(ValueError, match="may have been truncated"):
+        nested.Test.parse(data, lazy=lazy)
+
+    with pytest.raises(ValueError, match="may have been truncated"):
+        nested_specialized.Test.parse(data)
+
+
+def test_message_parse_buffer_types():
+    data = bytes(nested_example)
+
+    assert nested.Test.parse(bytearray(data)) == nested_example
+    assert nested.Test.parse(memoryview(data)) == nested_example
+
+
+@pytest.mark.parametrize("name_length", [0, 100, 127, 128, 20_000])
+def test_message_nested_length_prefixes(name_length):
+    from tests.outputs.recursivemessage.recursivemessage import Test
+
+    inner = Test(name="x" * name_length)
+    middle = Test(name="y", child=inner)
+    outer = Test(child=middle)
+
+    inner_data = (b"\n" + betterproto2.encode_varint(name_length) + b"x" * name_length) if name_length else b""
+    middle_data = b"\n\x01y" + b"\x12" + betterproto2.encode_varint(len(inner_data)) + inner_data
+    outer_data = b"\x12" + betterproto2.encode_varint(len(middle_data)) + middle_data
+
+    assert bytes(outer) == outer_data
+    assert outer.byte_size() == len(outer_data)
+    assert Test.parse(outer_data) == outer
+
+    stream = BytesIO()
+    outer.dump(stream, delimit=True)
+    assert stream.getvalue() == betterproto2.encode_varint(len(outer_data)) + outer_data
+
+
+def test_message_deep_nested_length_prefixes():
+    from tests.outputs.recursivemessage.recursivemessage import Intermediate, Test
+
+    # Long prefixes at every level, followed by other fields
+    message = Test(name="x" * 200)
+    for depth in range(10):
+        message = Test(name="y" * depth * 50, child=message, intermediate=Intermediate(number=depth))
+
+    def encode(message: Test) -> bytes:
+        data = b""
+        if message.name:
+            data += b"\n" + betterproto2.encode_varint(len(message.name)) + message.name.encode()
+        if message.child is not None:
+            child = encode(message.child)
+            data += b"\x12" + betterproto2.encode_varint(len(child)) + child
+        if message.intermediate is not None:
+            intermediate = bytes(message.intermediate)
+            data += b"\x1a" + betterproto2.encode_varint(len(intermediate)) + intermediate
+        return data
+
+    assert bytes(message) == encode(message)
+    assert Test.parse(bytes(message)) == message
+
+
+def test_message_packed_fields():
+    msg = repeatedpacked.Test(
+        counts=[-(1 << 31), -1, 0, 127, 128, (1 << 31) - 1],
+        signed=[-(1 << 63), -1, 0, 1, (1 << 63) - 1],
+        fixed=[-1.5, 0.0, 2.25],
+    )
+
+    def payload(tag: bytes, items: list[bytes]) -> bytes:
+        return tag + betterproto2.encode_varint(len(b"".join(items))) + b"".join(items)
+
+    data = (
+        payload(b"\n", [betterproto2.encode_varint(value) for value in msg.counts])
+        + payload(b"\x12", [betterproto2._encode_zigzag(value) for value in msg.signed])
+        + payload(b"\x1a", [betterproto2._encode_double(value) for value in msg.fixed])
+    )
+
+    assert bytes(msg) == data
+    assert repeatedpacked.Test.parse(data) == msg
+
+
+def test_message_packed_fields_invalid():
+    # The last varint of the packed field is truncated
+    with pytest.raises(ValueError):
+        repeatedpacked.Test.parse(b"\n\x02\x80\x80")
+
+    # The length of a packed double field is not a multiple of 8
+    with pytest.raises(ValueError):
+        repeatedpacked.Test.parse(b"\x1a\x03\x00\x00\x00")
+
+    # The packed field goes beyond the end of the message
+    with pytest.raises(ValueError):
+        repeatedpacked.Test.parse(b"\n\x05\x01\x02")
+
+
 def test_message_load_too_large():
     with open(streams_path / "message_dump_file_single.expected", "rb") as stream, pytest.raises(ValueError):
         oneof.Test().load(stream, len_oneof + 1)
@@ -364,3 +579,67 @@ def test_infinite_messages(compile_jar, tmp_path):
                 break
 
     assert len(messages) == num_messages
+
+
+@pytest.mark.asyncio
+async def test_message_iter_delimited_async():
+    messages = [repeated.Test(names=["a" * index] * index) for index in range(0, 300, 7)]
+    data = BytesIO()
+    repeated.Test.write_delimited(data, messages)
+
+    reader = asyncio.StreamReader()
+    for pos in range(0, len(data.getvalue()), 1000):
+        reader.feed_data(data.getvalue()[pos : pos + 1000])
+    reader.feed_eof()
+
+    parsed = [message async for message in repeated.Test.iter_delimited_async(reader, chunk_size=100)]
+    assert parsed == messages
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(data.getvalue()[:-1])
+    reader.feed_eof()
+    with pytest.raises(ValueError, match="Expected message of size"):
+        [message async for message in repeated.Test.iter_delimited_async(reader)]
+
+
+@pytest.mark.asyncio
+async def test_message_iter_delimited_async_large_message(mocker):
+    messages = [repeated.Test(names=["a"]), repeated.Test(names=["a" * 1_000_000]), repeated.Test(names=["b"])]
+    data = BytesIO()
+    repeated.Test.write_delimited(data, messages)
+
+    reader = asyncio.StreamReader()
+
+    async def feed():
+        # The data arrives in small parts
+        for pos in range(0, len(data.getvalue()), 5000):
+            reader.feed_data(data.getvalue()[pos : pos + 5000])
+            await asyncio.sleep(0)
+        reader.feed_eof()
+
+    feeding = asyncio.create_task(feed())
+    load_delimited = mocker.spy(repeated.Test, "_load_delimited")
+    assert [message async for message in repeated.Test.iter_delimited_async(reader)] == messages
+    assert load_delimited.call_count <= 4
+    await feeding
+
+
+@pytest.mark.asyncio
+async def test_message_write_delimited_async():
+    messages = [repeated.Test(names=["a" * index] * index) for index in range(0, 300, 7)]
+
+    server_socket, client_socket = socket.socketpair()
+    reader, server_writer = await asyncio.open_connection(sock=server_socket)
+    client_reader, writer = await asyncio.open_connection(sock=client_socket)
+
+    async def write():
+        await repeated.Test.write_delimited_async(writer, messages * 10, chunk_size=1000, high_water_mark=5000)
+        await writer.drain()
+        writer.close()
+
+    write_task = asyncio.create_task(write())
+    parsed = [message async for message in repeated.Test.iter_delimited_async(reader)]
+    await write_task
+
+    assert parsed == messages * 10
+    server_writer.close()
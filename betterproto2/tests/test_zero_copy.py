@@ -0,0 +1,65 @@
+import copy
+
+import pytest
+
+from tests.outputs.bytes.bytes import Test as BytesTest
+from tests.outputs.bytes_specialized.bytes import Test as SpecializedBytesTest
+from tests.outputs.conformance.protobuf_test_messages.proto3 import TestAllTypesProto3
+
+message = TestAllTypesProto3(
+    optional_bytes=b"\x00\x01\x02" * 100,
+    repeated_bytes=[b"a", b"", b"bc"],
+    map_string_bytes={"key": b"value"},
+    recursive_message=TestAllTypesProto3(optional_bytes=b"nested", optional_string="abc"),
+)
+data = bytes(message)
+
+
+@pytest.mark.parametrize("buffer", [data, bytearray(data), memoryview(data)])
+def test_parse_zero_copy(buffer):
+    parsed = TestAllTypesProto3.parse(buffer, zero_copy=True)
+
+    assert isinstance(parsed.optional_bytes, memoryview)
+    assert parsed.optional_bytes.obj is (buffer.obj if isinstance(buffer, memoryview) else buffer)
+    assert isinstance(parsed.recursive_message.optional_bytes, memoryview)
+    assert all(isinstance(value, memoryview) for value in parsed.repeated_bytes)
+
+    assert parsed == message
+    assert bytes(parsed) == data
+    assert parsed.to_dict() == message.to_dict()
+
+
+def test_parse_zero_copy_disabled():
+    parsed = TestAllTypesProto3.parse(memoryview(data))
+
+    assert type(parsed.optional_bytes) is bytes
+    assert parsed == message
+
+
+def test_zero_copy_deepcopy():
+    parsed = TestAllTypesProto3.parse(data, zero_copy=True)
+
+    copied = copy.deepcopy(parsed)
+    assert type(copied.optional_bytes) is bytes
+    assert all(type(value) is bytes for value in copied.repeated_bytes)
+    assert type(copied.map_string_bytes["key"]) is bytes
+    assert copied == message
+
+
+@pytest.mark.parametrize("cls", [BytesTest, SpecializedBytesTest])
+@pytest.mark.parametrize("value", [bytearray(b"data"), memoryview(b"xdatax")[1:-1]])
+def test_serialize_bytes_like(cls, value):
+    assert bytes(cls(data=value)) == bytes(cls(data=b"data"))
+    assert cls(data=value).byte_size() == len(bytes(cls(data=b"data")))
+
+
+def test_any_zero_copy():
+    from tests.outputs.any.any import Person
+    from tests.outputs.any.google.protobuf import Any
+
+    person = Person(first_name="John", last_name="Smith")
+
+    parsed = Any.parse(bytes(Any.pack(person)), zero_copy=True)
+
+    assert isinstance(parsed.value, memoryview)
+    assert parsed.unpack() == person
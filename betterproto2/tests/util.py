@@ -103,6 +103,14 @@ def requires_grpcio():
         pytest.skip("grpcio is not installed")
 
 
+@pytest.fixture
+def requires_numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pytest.skip("numpy is not installed")
+
+
 @pytest.fixture
 def requires_protobuf():
     try:
@@ -41,7 +41,8 @@ class Any(VanillaAny):
         except KeyError:
             raise TypeError(f"Can't unpack unregistered type: {self.type_url}")
 
-        return message_type.parse(self.value)
+        # A value parsed with the `zero_copy` option is a view of the parsed data, which is kept
+        return message_type.parse(self.value, zero_copy=isinstance(self.value, memoryview))
 
     def to_dict(self, **kwargs) -> dict[str, typing.Any]:
         # TODO allow passing a message pool to `to_dict`
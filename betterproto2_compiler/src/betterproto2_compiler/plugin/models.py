@@ -29,7 +29,7 @@ import inspect
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 
-from betterproto2 import unwrap
+from betterproto2 import encode_varint, unwrap
 
 from betterproto2_compiler import casing
 from betterproto2_compiler.compile.importing import get_type_reference, parse_source_type_name
@@ -80,6 +80,28 @@ PROTO_MESSAGE_TYPES = (
     FieldDescriptorProtoType.ENUM,  # 14
 )
 PROTO_MAP_TYPES = (FieldDescriptorProtoType.MESSAGE,)  # 11
+PROTO_VARINT_TYPES = (
+    FieldDescriptorProtoType.INT64,  # 3
+    FieldDescriptorProtoType.UINT64,  # 4
+    FieldDescriptorProtoType.INT32,  # 5
+    FieldDescriptorProtoType.BOOL,  # 8
+    FieldDescriptorProtoType.UINT32,  # 13
+    FieldDescriptorProtoType.ENUM,  # 14
+)
+PROTO_ZIGZAG_TYPES = (
+    FieldDescriptorProtoType.SINT32,  # 17
+    FieldDescriptorProtoType.SINT64,  # 18
+)
+PROTO_FIXED_32_TYPES = (
+    FieldDescriptorProtoType.FLOAT,  # 2
+    FieldDescriptorProtoType.FIXED32,  # 7
+    FieldDescriptorProtoType.SFIXED32,  # 15
+)
+PROTO_FIXED_64_TYPES = (
+    FieldDescriptorProtoType.DOUBLE,  # 1
+    FieldDescriptorProtoType.FIXED64,  # 6
+    FieldDescriptorProtoType.SFIXED64,  # 16
+)
 PROTO_PACKED_TYPES = (
     FieldDescriptorProtoType.DOUBLE,  # 1
     FieldDescriptorProtoType.FLOAT,  # 2
@@ -279,6 +301,30 @@ class MessageCompiler(ProtoContentBase):
     def has_oneof_fields(self) -> bool:
         return any(isinstance(field, OneOfFieldCompiler) for field in self.fields)
 
+    @property
+    def base_classes(self) -> list[str]:
+        """The runtime classes the generated message class inherits from, depending on the compiler options."""
+        settings = self.output_file.settings
+        if not (settings.frozen_dataclasses or settings.presence_tracking):
+            return ["betterproto2.Message"]
+
+        bases = []
+        if settings.frozen_dataclasses:
+            bases.append("betterproto2.FrozenMessage")
+        if settings.presence_tracking:
+            bases.append("betterproto2.PresenceTrackingMessage")
+        return bases
+
+    @property
+    def super_call(self) -> str:
+        """
+        The expression giving access to the methods of `betterproto2.Message` from the generated methods. The
+        dataclasses generated with `slots=True` are new classes, which the implicit form of `super()` doesn't support.
+        """
+        if self.output_file.settings.slotted_dataclasses:
+            return f"super({self.py_name}, self)"
+        return "super()"
+
     @property
     def custom_methods(self) -> list[str]:
         """
@@ -303,6 +349,14 @@ class MessageCompiler(ProtoContentBase):
         """
         return self.output_file.get_descriptor_name(self.source_file)
 
+    @property
+    def specialized_codec_fields(self) -> list["FieldCompiler"]:
+        """
+        List of the fields for which a specialized encoder and decoder are generated when the `specialized_codecs`
+        option is enabled. The other fields are handled by the generic implementation of `betterproto2.Message`.
+        """
+        return [f for f in self.fields if f.has_specialized_codec]
+
 
 def is_map(proto_field_obj: FieldDescriptorProto, parent_message: DescriptorProto) -> bool:
     """True if proto_field_obj is a map, otherwise False."""
@@ -365,6 +419,8 @@ class FieldCompiler(ProtoContentBase):
             args.append("optional=True")
         elif self.repeated:
             args.append("repeated=True")
+            if self.output_file.settings.frozen_dataclasses:
+                args.append("default_factory=tuple")
         elif self.field_type == FieldType.ENUM:
             args.append(f"default_factory=lambda: {self.py_type}(0)")
         return args
@@ -397,6 +453,65 @@ class FieldCompiler(ProtoContentBase):
         """True if the wire representation is a packed format."""
         return self.repeated and self.proto_obj.type in PROTO_PACKED_TYPES
 
+    @property
+    def has_specialized_codec(self) -> bool:
+        """True if a specialized encoder and decoder can be generated for this field."""
+        # Packed repeated fields are left to the generic implementation
+        if self.repeated and self.field_type not in (FieldType.STRING, FieldType.BYTES, FieldType.MESSAGE):
+            return False
+
+        if self.field_type == FieldType.MESSAGE:
+            return not self.is_wrapped
+
+        return True
+
+    @property
+    def wire_tag(self) -> int:
+        """Tag of the field on the wire, combining the field number and the wire type."""
+        if self.field_type in PROTO_VARINT_TYPES or self.field_type in PROTO_ZIGZAG_TYPES:
+            wire_type = 0
+        elif self.field_type in PROTO_FIXED_64_TYPES:
+            wire_type = 1
+        elif self.field_type in PROTO_FIXED_32_TYPES:
+            wire_type = 5
+        else:
+            wire_type = 2
+
+        return (self.proto_obj.number << 3) | wire_type
+
+    @property
+    def encoded_wire_tag(self) -> str:
+        """Representation of the encoded tag as a bytes literal."""
+        return repr(encode_varint(self.wire_tag))
+
+    @property
+    def codec_encoder(self) -> str:
+        """
+        Name of the runtime function encoding a single value of this field, without its tag. Messages and bytes are
+        written directly in the output buffer (see `codec_encodes_into`).
+        """
+        if self.field_type == FieldType.MESSAGE:
+            return "betterproto2._encode_message_into"
+        if self.field_type == FieldType.BYTES:
+            return "betterproto2._encode_bytes_into"
+        if self.field_type in PROTO_VARINT_TYPES:
+            return "betterproto2.encode_varint"
+        if self.field_type in PROTO_ZIGZAG_TYPES:
+            return "betterproto2._encode_zigzag"
+        return f"betterproto2._encode_{str(self.field_type).lower()}"
+
+    @property
+    def codec_encodes_into(self) -> bool:
+        """Whether `codec_encoder` writes the value in the output buffer, instead of returning the encoded value."""
+        return self.field_type in (FieldType.MESSAGE, FieldType.BYTES)
+
+    @property
+    def codec_decoder(self) -> str:
+        """Name of the runtime function decoding a single scalar value of this field."""
+        if self.field_type == FieldType.ENUM:
+            return "betterproto2._decode_int64"
+        return f"betterproto2._decode_{str(self.field_type).lower()}"
+
     @property
     def py_name(self) -> str:
         """Pythonized name."""
@@ -488,6 +603,8 @@ class FieldCompiler(ProtoContentBase):
                 py_type = f"typing.Annotated[{py_type}, {', '.join(annotations)}]"
 
         if self.repeated:
+            if self.output_file.settings.frozen_dataclasses:
+                return f"tuple[{py_type}, ...]"
             return f"list[{py_type}]"
         if self.optional:
             return f"{py_type} | None"
@@ -583,6 +700,10 @@ class MapEntryCompiler(FieldCompiler):
     def repeated(self) -> bool:
         return False  # maps cannot be repeated
 
+    @property
+    def has_specialized_codec(self) -> bool:
+        return False
+
 
 @dataclass(kw_only=True)
 class OneofCompiler(ProtoContentBase):
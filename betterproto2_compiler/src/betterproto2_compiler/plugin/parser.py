@@ -83,6 +83,10 @@ def get_settings(plugin_options: list[str]) -> Settings:
     return Settings(
         pydantic_dataclasses="pydantic_dataclasses" in plugin_options,
         google_protobuf_descriptors="google_protobuf_descriptors" in plugin_options,
+        specialized_codecs="specialized_codecs" in plugin_options,
+        frozen_dataclasses="frozen_dataclasses" in plugin_options,
+        slotted_dataclasses="slotted_dataclasses" in plugin_options,
+        presence_tracking="presence_tracking" in plugin_options,
         client_generation=client_generation,
         server_generation=server_generation,
     )
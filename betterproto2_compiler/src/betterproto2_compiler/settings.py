@@ -69,6 +69,10 @@ class ServerGeneration(StrEnum):
 class Settings:
     pydantic_dataclasses: bool
     google_protobuf_descriptors: bool
+    specialized_codecs: bool
+    frozen_dataclasses: bool
+    slotted_dataclasses: bool
+    presence_tracking: bool
 
     client_generation: ClientGeneration
     server_generation: ServerGeneration
@@ -17,6 +17,10 @@ async def generate_test(
     reference: bool = False,
     pydantic: bool = False,
     descriptors: bool = False,
+    specialized: bool = False,
+    frozen: bool = False,
+    slots: bool = False,
+    presence: bool = False,
     client_generation: str = "async_sync",
 ):
     await semaphore.acquire()
@@ -30,6 +34,14 @@ async def generate_test(
         options.append("pydantic")
     if descriptors:
         options.append("descriptors")
+    if specialized:
+        options.append("specialized")
+    if frozen:
+        options.append("frozen")
+    if slots:
+        options.append("slots")
+    if presence:
+        options.append("presence")
 
     input_dir = dir_path + "/inputs/" + name
     output_dir = dir_path + "/outputs/" + name + ("_" + "_".join(options) if options else "")
@@ -42,6 +54,10 @@ async def generate_test(
         reference=reference,
         pydantic_dataclasses=pydantic,
         google_protobuf_descriptors=descriptors,
+        specialized_codecs=specialized,
+        frozen_dataclasses=frozen,
+        slotted_dataclasses=slots,
+        presence_tracking=presence,
         client_generation=client_generation,
     )
 
@@ -69,8 +85,11 @@ async def main_async():
         generate_test("bool", semaphore, pydantic=True),
         generate_test("bool", semaphore, reference=True),
         generate_test("bool", semaphore),
+        generate_test("bool", semaphore, presence=True),
+        generate_test("bool", semaphore, specialized=True),
         generate_test("bytes", semaphore, reference=True),
         generate_test("bytes", semaphore),
+        generate_test("bytes", semaphore, specialized=True),
         generate_test("casing_inner_class", semaphore),
         generate_test("casing", semaphore, reference=True),
         generate_test("casing", semaphore),
@@ -78,20 +97,29 @@ async def main_async():
         generate_test("conformance", semaphore),
         generate_test("deprecated", semaphore, reference=True),
         generate_test("deprecated", semaphore, client_generation="async"),
+        generate_test("deprecated", semaphore, specialized=True),
+        generate_test("deprecated", semaphore, specialized=True, slots=True),
         generate_test("documentation", semaphore, client_generation="async"),
         generate_test("double", semaphore, reference=True),
         generate_test("double", semaphore),
+        generate_test("double", semaphore, specialized=True),
         generate_test("encoding_decoding", semaphore),
+        generate_test("encoding_decoding", semaphore, specialized=True),
         generate_test("enum", semaphore, reference=True),
         generate_test("enum", semaphore),
+        generate_test("enum", semaphore, presence=True),
+        generate_test("enum", semaphore, specialized=True),
         generate_test("example_service", semaphore, client_generation="async"),
         generate_test("features", semaphore),
         generate_test("field_name_identical_to_type", semaphore, reference=True),
         generate_test("field_name_identical_to_type", semaphore),
         generate_test("fixed", semaphore, reference=True),
         generate_test("fixed", semaphore),
+        generate_test("fixed", semaphore, presence=True),
+        generate_test("fixed", semaphore, specialized=True),
         generate_test("float", semaphore, reference=True),
         generate_test("float", semaphore),
+        generate_test("float", semaphore, specialized=True),
         generate_test("google_impl_behavior_equivalence", semaphore, reference=True),
         generate_test("google_impl_behavior_equivalence", semaphore),
         generate_test("google", semaphore),
@@ -104,6 +132,8 @@ async def main_async():
         generate_test("googletypes_value", semaphore),
         generate_test("googletypes", semaphore, reference=True),
         generate_test("googletypes", semaphore),
+        generate_test("googletypes", semaphore, presence=True),
+        generate_test("googletypes", semaphore, specialized=True),
         generate_test("grpclib_reflection", semaphore, descriptors=True, client_generation="async"),
         generate_test("grpclib_reflection", semaphore, client_generation="async"),
         generate_test("import_cousin_package_same_name", semaphore, descriptors=True),
@@ -111,14 +141,20 @@ async def main_async():
         generate_test("import_service_input_message", semaphore, client_generation="async"),
         generate_test("int32", semaphore, reference=True),
         generate_test("int32", semaphore),
+        generate_test("int32", semaphore, specialized=True),
         generate_test("invalid_field", semaphore, pydantic=True),
         generate_test("invalid_field", semaphore),
         generate_test("manual_validation", semaphore, pydantic=True),
+        generate_test("manual_validation", semaphore, pydantic=True, slots=True),
         generate_test("manual_validation", semaphore),
         generate_test("map", semaphore, reference=True),
         generate_test("map", semaphore),
+        generate_test("map", semaphore, frozen=True),
+        generate_test("map", semaphore, presence=True),
+        generate_test("map", semaphore, specialized=True),
         generate_test("mapmessage", semaphore, reference=True),
         generate_test("mapmessage", semaphore),
+        generate_test("mapmessage", semaphore, specialized=True),
         generate_test("message_wrapping", semaphore),
         generate_test("namespace_builtin_types", semaphore, reference=True),
         generate_test("namespace_builtin_types", semaphore),
@@ -126,40 +162,65 @@ async def main_async():
         generate_test("namespace_keywords", semaphore),
         generate_test("nested", semaphore, reference=True),
         generate_test("nested", semaphore),
+        generate_test("nested", semaphore, frozen=True),
+        generate_test("nested", semaphore, slots=True),
+        generate_test("nested", semaphore, presence=True),
+        generate_test("nested", semaphore, specialized=True),
+        generate_test("nested", semaphore, specialized=True, slots=True),
+        generate_test("nested", semaphore, specialized=True, presence=True),
+        generate_test("repeatedmessage", semaphore, frozen=True, presence=True),
         generate_test("nestedtwice", semaphore, reference=True),
         generate_test("nestedtwice", semaphore),
+        generate_test("nestedtwice", semaphore, specialized=True),
         generate_test("oneof_default_value_serialization", semaphore),
         generate_test("oneof_empty", semaphore, reference=True),
         generate_test("oneof_empty", semaphore),
         generate_test("oneof_enum", semaphore, reference=True),
         generate_test("oneof_enum", semaphore),
+        generate_test("oneof_enum", semaphore, specialized=True),
         generate_test("oneof", semaphore, pydantic=True),
         generate_test("oneof", semaphore, reference=True),
         generate_test("oneof", semaphore),
+        generate_test("oneof", semaphore, presence=True),
+        generate_test("oneof", semaphore, specialized=True),
         generate_test("pickling", semaphore),
         generate_test("proto3_field_presence_oneof", semaphore, reference=True),
         generate_test("proto3_field_presence_oneof", semaphore),
         generate_test("proto3_field_presence", semaphore, reference=True),
         generate_test("proto3_field_presence", semaphore),
+        generate_test("proto3_field_presence", semaphore, presence=True),
+        generate_test("proto3_field_presence", semaphore, specialized=True),
         generate_test("recursivemessage", semaphore, reference=True),
         generate_test("recursivemessage", semaphore),
+        generate_test("recursivemessage", semaphore, specialized=True),
         generate_test("ref", semaphore, reference=True),
         generate_test("ref", semaphore),
         generate_test("regression_387", semaphore),
         generate_test("regression_414", semaphore),
         generate_test("repeated_duration_timestamp", semaphore, reference=True),
         generate_test("repeated_duration_timestamp", semaphore),
+        generate_test("repeated_duration_timestamp", semaphore, specialized=True),
         generate_test("repeated", semaphore, reference=True),
         generate_test("repeated", semaphore),
+        generate_test("repeated", semaphore, frozen=True),
+        generate_test("repeated", semaphore, specialized=True, frozen=True),
+        generate_test("repeated", semaphore, specialized=True),
         generate_test("repeatedmessage", semaphore, reference=True),
         generate_test("repeatedmessage", semaphore),
+        generate_test("repeatedmessage", semaphore, frozen=True),
+        generate_test("repeatedmessage", semaphore, frozen=True, slots=True),
+        generate_test("repeatedmessage", semaphore, presence=True),
+        generate_test("repeatedmessage", semaphore, specialized=True),
         generate_test("repeatedpacked", semaphore, reference=True),
         generate_test("repeatedpacked", semaphore),
+        generate_test("repeatedpacked", semaphore, presence=True),
+        generate_test("repeatedpacked", semaphore, specialized=True),
         generate_test("rpc_empty_input_message", semaphore, client_generation="async"),
         generate_test("service_uppercase", semaphore, client_generation="async"),
         generate_test("service", semaphore),
         generate_test("signed", semaphore, reference=True),
         generate_test("signed", semaphore),
+        generate_test("signed", semaphore, specialized=True),
         generate_test("simple_service", semaphore),
         generate_test("stream_stream", semaphore),
         generate_test("timestamp_dict_encode", semaphore, reference=True),
@@ -12,6 +12,10 @@ async def protoc(
     reference: bool = False,
     pydantic_dataclasses: bool = False,
     google_protobuf_descriptors: bool = False,
+    specialized_codecs: bool = False,
+    frozen_dataclasses: bool = False,
+    slotted_dataclasses: bool = False,
+    presence_tracking: bool = False,
     client_generation: str = "async_sync",
 ):
     resolved_path: Path = Path(path).resolve()
@@ -37,6 +41,18 @@ async def protoc(
         if google_protobuf_descriptors:
             command.insert(3, "--python_betterproto2_opt=google_protobuf_descriptors")
 
+        if specialized_codecs:
+            command.insert(3, "--python_betterproto2_opt=specialized_codecs")
+
+        if frozen_dataclasses:
+            command.insert(3, "--python_betterproto2_opt=frozen_dataclasses")
+
+        if slotted_dataclasses:
+            command.insert(3, "--python_betterproto2_opt=slotted_dataclasses")
+
+        if presence_tracking:
+            command.insert(3, "--python_betterproto2_opt=presence_tracking")
+
     proc = await asyncio.create_subprocess_exec(
         *command,
         stdout=asyncio.subprocess.PIPE,